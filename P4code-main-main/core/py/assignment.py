@@ -0,0 +1,79 @@
+from collections import deque
+
+# Marks a left vertex with no partner, and the "infinite" BFS distance
+UNMATCHED = -1
+INFINITY = float("inf")
+
+
+def hopcroft_karp(adjacency, right_count):
+    """
+    Find a maximum matching of a bipartite graph with the Hopcroft-Karp algorithm.
+
+    Each phase runs a BFS from every free left vertex to layer the graph by shortest augmenting
+    path length, then a DFS (iterative, so large graphs cannot hit the recursion limit) that
+    augments along vertex-disjoint shortest paths. The algorithm runs in O(E * sqrt(V)).
+
+    Parameters:
+    - adjacency: For every left vertex, the list of right vertices (0..right_count - 1) it may be matched to.
+    - right_count: The number of right vertices.
+
+    Returns:
+    - A list giving, for every left vertex, its matched right vertex or UNMATCHED.
+    """
+    left_count = len(adjacency)
+    match_left = [UNMATCHED] * left_count
+    match_right = [UNMATCHED] * right_count
+
+    while True:
+        # BFS: distance of every left vertex from the free left vertices
+        distance = [INFINITY] * left_count
+        queue = deque()
+        for left in range(left_count):
+            if match_left[left] == UNMATCHED:
+                distance[left] = 0
+                queue.append(left)
+        found_free_right = False
+        while queue:
+            left = queue.popleft()
+            for right in adjacency[left]:
+                partner = match_right[right]
+                if partner == UNMATCHED:
+                    found_free_right = True
+                elif distance[partner] == INFINITY:
+                    distance[partner] = distance[left] + 1
+                    queue.append(partner)
+        if not found_free_right:
+            return match_left
+
+        # DFS: augment along vertex-disjoint shortest paths
+        next_edge = [0] * left_count
+        for root in range(left_count):
+            if match_left[root] != UNMATCHED:
+                continue
+            path = [root]
+            while path:
+                left = path[-1]
+                edges = adjacency[left]
+                advanced = False
+                while next_edge[left] < len(edges):
+                    right = edges[next_edge[left]]
+                    next_edge[left] += 1
+                    partner = match_right[right]
+                    if partner == UNMATCHED:
+                        # Augmenting path found: flip every edge along it
+                        for position in range(len(path) - 1, -1, -1):
+                            left_on_path = path[position]
+                            right_on_path = adjacency[left_on_path][next_edge[left_on_path] - 1]
+                            match_left[left_on_path] = right_on_path
+                            match_right[right_on_path] = left_on_path
+                        path = []
+                        advanced = True
+                        break
+                    if distance[partner] == distance[left] + 1:
+                        path.append(partner)
+                        advanced = True
+                        break
+                if not advanced:
+                    # Dead end: drop the vertex from this phase
+                    distance[left] = INFINITY
+                    path.pop()
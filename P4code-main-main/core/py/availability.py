@@ -0,0 +1,65 @@
+import numpy as np
+from core.py.occupancy import day_window_bits
+
+
+class TeamAvailability:
+    """
+    Team availability windows (d1Start..d7End of team.csv) loaded once as a matrix.
+
+    masks[team, day - 1] holds the half-hour slots of that day the team can play in, as a bitmask,
+    so the slots a pair can use are found with a few vectorized AND operations over the catalogue.
+    """
+    def __init__(self, team_df):
+        """
+        Load the availability matrix.
+
+        Parameters:
+        - team_df (DataFrame): Team data with name and d{day}Start/d{day}End columns.
+        """
+        self.team_index = {}
+        for position, name in enumerate(team_df["name"].tolist()):
+            self.team_index.setdefault(name, position)
+
+        starts = team_df[[f"d{day}Start" for day in range(1, 8)]].to_numpy()
+        ends = team_df[[f"d{day}End" for day in range(1, 8)]].to_numpy()
+        self.masks = day_window_bits(starts, ends)
+
+    def pair_masks(self, team1, team2):
+        """
+        Return the slots of each day (1-7) in which both teams are available.
+
+        Parameters:
+        - team1, team2 (str): Team names.
+
+        Returns:
+        - A uint64 array of 7 day masks.
+        """
+        return self.masks[self.team_index[team1]] & self.masks[self.team_index[team2]]
+
+    def feasible_mask(self, team1, team2, catalogue):
+        """
+        Flag the catalogue slots that fall inside both teams' availability windows.
+
+        Parameters:
+        - team1, team2 (str): Team names.
+        - catalogue (SlotCatalogue): The slot catalogue of the run.
+
+        Returns:
+        - A boolean array with one entry per catalogue row.
+        """
+        allowed = self.pair_masks(team1, team2)[catalogue.key_days - 1]
+        fits = (catalogue.key_bits & ~allowed) == 0
+        return fits[catalogue.slot_keys]
+
+    def feasible_rows(self, team1, team2, catalogue):
+        """
+        Find the catalogue slots that fall inside both teams' availability windows.
+
+        Parameters:
+        - team1, team2 (str): Team names.
+        - catalogue (SlotCatalogue): The slot catalogue of the run.
+
+        Returns:
+        - An increasing array of catalogue rows the pair can play in.
+        """
+        return np.flatnonzero(self.feasible_mask(team1, team2, catalogue))
@@ -0,0 +1,260 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from core.py.profiler import Profiler
+from core.py.scheduler import Scheduler
+
+CASES = ["case1", "case2", "case3", "case4", "case5", "case6", "case7", "case8", "generated"]
+
+# Default place of the benchmark history (machine-specific, not tracked)
+HISTORY_PATH = "./data/benchmark_history.json"
+
+# A case regresses when its wall time grows by more than TIME_THRESHOLD (relative) and by more
+# than TIME_NOISE seconds, or when its fill rate drops by more than FILL_THRESHOLD.
+TIME_THRESHOLD = 0.25
+TIME_NOISE = 0.05
+FILL_THRESHOLD = 0.0
+
+# Number of recent runs whose median is the baseline, when no run is pinned
+BASELINE_RUNS = 5
+
+
+def measure_case(case, engine="tree", strategy="greedy"):
+    """
+    Schedule a case in the current process and measure the run.
+
+    The probe counts come from a Profiler. The schedule is written to a temporary directory, so
+    benchmarking never changes the files of the case. The peak RSS is the peak of the whole
+    process, so it is only meaningful in a fresh process (see benchmark_case).
+
+    Parameters:
+    - case (str): The case identifier.
+    - engine (str): The occupancy engine, a key of Scheduler.ENGINES.
+    - strategy (str): The slot assignment strategy, one of Scheduler.STRATEGIES.
+
+    Returns:
+    - dict: wall_time (seconds), peak_rss_kb, slots_tried, probes (field and team overlap checks),
+      games, unscheduled and fill_rate.
+
+    Raises:
+    - RuntimeError: If the scheduler could not load the case.
+    """
+    profiler = Profiler()
+    finished = {}
+    # The scheduler reports every unscheduled matchup on stdout; keep the measurement quiet
+    with tempfile.TemporaryDirectory() as output_dir, contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        status = Scheduler.run(case, engine=engine, strategy=strategy, profiler=profiler, output_dir=output_dir,
+                               progress=lambda event: finished.update(event) if event["event"] == "finished" else None)
+        wall_time = time.perf_counter() - started
+    if status != 0:
+        raise RuntimeError(f"Could not schedule {case}")
+
+    counters = profiler.report()["counters"]
+    attempted = finished["games"] + finished["unscheduled"]
+    return {
+        "wall_time": round(wall_time, 4),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "slots_tried": counters["slots_tried"],
+        "probes": counters["field_probes"] + counters["team_probes"],
+        "games": finished["games"],
+        "unscheduled": finished["unscheduled"],
+        "fill_rate": round(finished["games"] / attempted, 4) if attempted else 1.0,
+    }
+
+
+def benchmark_case(case, engine="tree", strategy="greedy", repeat=1):
+    """
+    Measure a case in fresh subprocesses, so every run starts cold and has its own peak RSS.
+
+    Parameters:
+    - case (str): The case identifier.
+    - engine, strategy (str): As for measure_case.
+    - repeat (int): Number of runs; the fastest one is kept (the other measures do not vary).
+
+    Returns:
+    - dict: The measures of the fastest run (see measure_case).
+
+    Raises:
+    - RuntimeError: If a run fails.
+    """
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-m", "core.py.benchmark", "--measure", case, "--engine", engine, "--strategy", strategy],
+            capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Benchmark of {case} failed:\n{completed.stderr}")
+        runs.append(json.loads(completed.stdout.splitlines()[-1]))
+    return min(runs, key=lambda run: run["wall_time"])
+
+
+def git_commit():
+    """Return the short hash of the checked out commit, or None outside a git repository."""
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def load_history(path):
+    """Return the benchmark runs recorded in a history file (none if it does not exist)."""
+    if not os.path.exists(path):
+        return []
+    with open(path) as history_file:
+        return json.load(history_file)
+
+
+def save_history(history, path):
+    """Write the benchmark runs to a history file."""
+    with open(path, "w") as history_file:
+        json.dump(history, history_file, indent=2)
+
+
+def find_baseline(history, engine, strategy, runs=BASELINE_RUNS):
+    """
+    Return the baseline to compare a new run to.
+
+    The latest pinned run made with the same engine and strategy is the baseline when there is
+    one. Otherwise the baseline is, case by case, the median of the last runs made with them, so
+    one noisy run neither hides nor triggers a regression.
+
+    Parameters:
+    - history (list): The recorded runs, oldest first.
+    - engine, strategy (str): As for measure_case.
+    - runs (int): Number of recent runs the median is taken over.
+
+    Returns:
+    - dict: A history entry (with "results" per case), or None if no run matches.
+    """
+    matching = [entry for entry in history if entry["engine"] == engine and entry["strategy"] == strategy]
+    pinned = [entry for entry in matching if entry.get("pinned")]
+    if pinned:
+        return pinned[-1]
+    if not matching:
+        return None
+
+    recent = matching[-runs:]
+    results = {}
+    for case in {case for entry in recent for case in entry["results"]}:
+        measures = [entry["results"][case] for entry in recent if case in entry["results"]]
+        results[case] = {name: statistics.median(measure[name] for measure in measures)
+                         for name in ("wall_time", "fill_rate")}
+    return {"engine": engine, "strategy": strategy, "runs": len(recent), "results": results}
+
+
+def find_regressions(results, baseline, time_threshold=TIME_THRESHOLD, fill_threshold=FILL_THRESHOLD):
+    """
+    Compare the results of a run to a baseline run.
+
+    Parameters:
+    - results (dict): Case -> measures of the new run.
+    - baseline (dict): A history entry, or None (nothing to compare to).
+    - time_threshold (float): Tolerated relative growth of the wall time.
+    - fill_threshold (float): Tolerated drop of the fill rate.
+
+    Returns:
+    - list: One message per regression.
+    """
+    if baseline is None:
+        return []
+    regressions = []
+    for case, measures in results.items():
+        previous = baseline["results"].get(case)
+        if previous is None:
+            continue
+        slower = measures["wall_time"] - previous["wall_time"]
+        if measures["wall_time"] > previous["wall_time"] * (1 + time_threshold) and slower > TIME_NOISE:
+            regressions.append(f"{case}: wall time {previous['wall_time']:.3f}s -> {measures['wall_time']:.3f}s")
+        if measures["fill_rate"] < previous["fill_rate"] - fill_threshold:
+            regressions.append(f"{case}: fill rate {previous['fill_rate']:.2%} -> {measures['fill_rate']:.2%}")
+    return regressions
+
+
+def run_benchmarks(cases=None, engine="tree", strategy="greedy", repeat=1, history_path=HISTORY_PATH,
+                   time_threshold=TIME_THRESHOLD, fill_threshold=FILL_THRESHOLD, record=True, accept=False,
+                   pin=False):
+    """
+    Benchmark every case, compare the run to the baseline and append it to the history.
+
+    A run with regressions is only recorded when accepted, so a slow run does not become part of
+    the baseline the next runs are compared to.
+
+    Parameters:
+    - cases (list): Cases to benchmark (default: every case).
+    - engine, strategy (str): As for measure_case.
+    - repeat (int): Runs per case (see benchmark_case).
+    - history_path (str): The JSON history file.
+    - time_threshold, fill_threshold (float): See find_regressions.
+    - record (bool): Append the run to the history (if it has no regressions, or is accepted).
+    - accept (bool): Record the run even if it has regressions.
+    - pin (bool): Record the run as the pinned baseline of its engine and strategy (implies accept).
+
+    Returns:
+    - tuple: (entry, regressions): the new history entry and the regression messages.
+    """
+    results = {}
+    for case in cases or CASES:
+        results[case] = benchmark_case(case, engine, strategy, repeat)
+        measures = results[case]
+        print(f"{case:>10}  {measures['wall_time']:8.3f}s  {measures['peak_rss_kb'] / 1024:7.1f} MB  "
+              f"{measures['probes']:>9} probes  {measures['games']:>5} games  {measures['fill_rate']:7.2%} filled")
+
+    history = load_history(history_path)
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "version": Scheduler.VERSION,
+        "engine": engine,
+        "strategy": strategy,
+        "results": results,
+    }
+    if pin:
+        entry["pinned"] = True
+    regressions = find_regressions(results, find_baseline(history, engine, strategy), time_threshold, fill_threshold)
+    if record and (not regressions or accept or pin):
+        save_history(history + [entry], history_path)
+    return entry, regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler on every case and track regressions.")
+    parser.add_argument("cases", nargs="*", help="Cases to benchmark (default: every case)")
+    parser.add_argument("--engine", choices=sorted(Scheduler.ENGINES), default="tree", help="Occupancy engine")
+    parser.add_argument("--strategy", choices=Scheduler.STRATEGIES, default="greedy", help="Slot assignment strategy")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is recorded")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON file the runs are recorded in")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD,
+                        help="Tolerated relative growth of a case's wall time")
+    parser.add_argument("--fill-threshold", type=float, default=FILL_THRESHOLD,
+                        help="Tolerated drop of a case's fill rate")
+    parser.add_argument("--no-record", action="store_true", help="Compare without appending the run to the history")
+    parser.add_argument("--accept", action="store_true", help="Record the run even if it has regressions")
+    parser.add_argument("--pin", action="store_true", help="Record the run as the baseline of later runs")
+    parser.add_argument("--measure", metavar="CASE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        # Child process of benchmark_case: print the measures as the last line
+        print(json.dumps(measure_case(args.measure, args.engine, args.strategy)))
+        sys.exit(0)
+
+    _, regressions = run_benchmarks(args.cases, args.engine, args.strategy, args.repeat, args.history,
+                                     args.time_threshold, args.fill_threshold, not args.no_record, args.accept, args.pin)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    if regressions and not (args.accept or args.pin):
+        print("The run was not recorded; pass --accept to record it anyway")
+        sys.exit(1)
+    sys.exit(0)
@@ -0,0 +1,178 @@
+import contextlib
+import os
+import struct
+import uuid
+import zipfile
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+# Suffix of the two arrays a dictionary-encoded string column is stored as in an .npz file
+CODES_SUFFIX = ".codes"
+VALUES_SUFFIX = ".values"
+
+# Fixed part of a zip local file header: signature, versions, flags, sizes, name and extra lengths
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+
+
+@contextlib.contextmanager
+def atomic_path(path):
+    """
+    Yield a temporary path next to path, then move it onto path once written.
+
+    os.replace swaps the file in one step, so a reader that has the previous file open or
+    memory-mapped keeps reading the previous contents instead of a file truncated under it.
+    The temporary file keeps the extension of path, and is removed if writing fails.
+    """
+    directory, name = os.path.split(path)
+    stem, extension = os.path.splitext(name)
+    temporary = os.path.join(directory, f".{stem}.{os.getpid()}.{uuid.uuid4().hex}{extension}")
+    try:
+        yield temporary
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def columnar_path(csv_path):
+    """
+    Return the path of the columnar copy of a schedule CSV: .parquet with pyarrow, .npz without.
+    """
+    return os.path.splitext(csv_path)[0] + (".parquet" if HAS_ARROW else ".npz")
+
+
+def save_columnar(schedule_df, path):
+    """
+    Save a schedule in a columnar binary format.
+
+    A .parquet path is written with pyarrow. An .npz path is written uncompressed (so it can be
+    memory-mapped back), with every string column dictionary-encoded as an int32 codes array
+    plus the array of its distinct values (UTF-8 encoded). Either way the file is replaced
+    atomically (see atomic_path), as readers may have the previous one memory-mapped.
+
+    Parameters:
+    - schedule_df (DataFrame): The schedule.
+    - path (str): Destination, ending in .parquet or .npz.
+    """
+    if path.endswith(".parquet"):
+        with atomic_path(path) as temporary:
+            schedule_df.to_parquet(temporary, index=False)
+        return
+
+    arrays = {}
+    for column in schedule_df.columns:
+        values = schedule_df[column]
+        if not pd.api.types.is_numeric_dtype(values):
+            codes, uniques = pd.factorize(values)
+            arrays[column + CODES_SUFFIX] = codes.astype(np.int32)
+            # UTF-8 bytes: a quarter of the size of NumPy's fixed-width UTF-32 strings
+            arrays[column + VALUES_SUFFIX] = np.array([str(value).encode() for value in uniques], dtype=bytes)
+        else:
+            arrays[column] = values.to_numpy()
+    with atomic_path(path) as temporary:
+        with open(temporary, "wb") as columnar_file:
+            np.savez(columnar_file, **arrays)
+
+
+def load_npz_mmap(path):
+    """
+    Memory-map every array of an uncompressed .npz file.
+
+    np.load cannot memory-map arrays inside an .npz, but np.savez stores them uncompressed, so each
+    member's .npy data is a contiguous byte range of the file: its offset is found from the zip
+    local header and the .npy header, and the array is mapped in place without being read.
+
+    Parameters:
+    - path (str): The .npz file.
+
+    Returns:
+    - dict: Array name -> read-only array (memory-mapped; empty arrays are regular arrays).
+
+    Raises:
+    - ValueError: If a member is compressed or holds Python objects.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as raw:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} in {path} is compressed and cannot be memory-mapped")
+            raw.seek(info.header_offset)
+            header = LOCAL_HEADER.unpack(raw.read(LOCAL_HEADER.size))
+            name_length, extra_length = header[-2], header[-1]
+            raw.seek(info.header_offset + LOCAL_HEADER.size + name_length + extra_length)
+
+            version = np.lib.format.read_magic(raw)
+            read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+            shape, fortran_order, dtype = read_header(raw)
+            name = info.filename[:-len(".npy")] if info.filename.endswith(".npy") else info.filename
+            if dtype.hasobject:
+                raise ValueError(f"{info.filename} in {path} holds Python objects and cannot be memory-mapped")
+            if not np.prod(shape):
+                # mmap cannot map zero bytes
+                arrays[name] = np.empty(shape, dtype)
+                continue
+            arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=raw.tell(), shape=shape,
+                                     order="F" if fortran_order else "C")
+    return arrays
+
+
+def load_columnar(path):
+    """
+    Load a schedule saved by save_columnar, without copying the column data where possible.
+
+    Parquet files are read with memory mapping. For .npz files the numeric columns and the codes
+    of string columns are memory-mapped; string columns come back as pandas Categoricals built
+    from those codes.
+
+    Parameters:
+    - path (str): A .parquet or .npz file.
+
+    Returns:
+    - A DataFrame with the columns in their original order.
+    """
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, memory_map=True)
+
+    arrays = load_npz_mmap(path)
+    columns = {}
+    for name, array in arrays.items():
+        if name.endswith(VALUES_SUFFIX):
+            continue
+        if name.endswith(CODES_SUFFIX):
+            column = name[:-len(CODES_SUFFIX)]
+            categories = pd.Index([value.decode() for value in arrays[column + VALUES_SUFFIX].tolist()])
+            columns[column] = pd.Categorical.from_codes(array, categories=categories)
+        else:
+            columns[name] = array
+    return pd.DataFrame(columns, copy=False)
+
+
+def read_schedule(csv_path):
+    """
+    Read a schedule, from its columnar copy when that copy is at least as recent as the CSV.
+
+    Other schedulers (Java, C++) only write the CSV, so an older columnar file is ignored. An empty
+    schedule is always read from the CSV, so it raises EmptyDataError whichever copy exists.
+
+    Parameters:
+    - csv_path (str): Path of the schedule CSV.
+
+    Returns:
+    - A DataFrame.
+
+    Raises:
+    - FileNotFoundError: If the CSV does not exist.
+    - pandas.errors.EmptyDataError: If the schedule is empty.
+    """
+    binary_path = columnar_path(csv_path)
+    if os.path.exists(binary_path) and os.path.getmtime(binary_path) >= os.path.getmtime(csv_path):
+        schedule_df = load_columnar(binary_path)
+        if len(schedule_df):
+            return schedule_df
+    return pd.read_csv(csv_path)
@@ -1,9 +1,12 @@
+import bisect
+
+
 class Interval:
     """
     Represents a time interval with a start time, end time, day, and an optional game.
     This class helps to store and manage intervals, and check for overlaps with other intervals.
     """
-    def __init__(self, start, end, day, week, game=None):
+    def __init__(self, start, end, day, week, game=None, season=None):
         """
         Initialize an interval.
 
@@ -13,6 +16,7 @@ class Interval:
         - day: The day the interval occurs.
         - week: The week number of the year (1-52)
         - game: Optional parameter representing the game during the interval.
+        - season: Optional season year the interval belongs to.
 
         Raises:
         - ValueError: If the start time is greater than the end time.
@@ -24,6 +28,7 @@ class Interval:
         self.day = day
         self.game = game
         self.week = week
+        self.season = season
 
     def __repr__(self):
         """
@@ -47,8 +52,8 @@ class Interval:
         - True if the intervals overlap, False otherwise.
         """
         
-        # The intervals overlap if they occur on the same day and week, and their time ranges intersect.
-        return (self.day == other.day and self.week == other.week and
+        # The intervals overlap if they occur on the same day, week and season, and their time ranges intersect.
+        return (self.day == other.day and self.week == other.week and self.season == other.season and
                 self.start < other.end and other.start < self.end)
 
 
@@ -165,6 +170,35 @@ class IntervalTree:
 
         return results
 
+    def any_overlap(self, interval):
+        """
+        Check whether any interval in the tree overlaps with the given interval.
+
+        Unlike overlap, this walks the tree iteratively with an explicit stack, builds no
+        result lists and returns as soon as the first conflict is found.
+
+        Parameters:
+        - interval: The interval to check for overlaps.
+
+        Returns:
+        - True if at least one stored interval overlaps, False otherwise.
+        """
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+
+            for stored_interval in node.intervals:
+                if stored_interval.overlaps(interval):
+                    return True
+
+            # Same pruning rules as _overlap.
+            if node.left and node.left.max_end >= interval.start:
+                stack.append(node.left)
+            if node.right and node.intervals[0].start <= interval.end:
+                stack.append(node.right)
+
+        return False
+
     def print_tree(self):
         """Print the structure of the interval tree for debugging or visualization."""
         self._print_tree(self.root, 0)
@@ -212,3 +246,379 @@ class IntervalTree:
 
         # Traverse the right subtree
         self._flatten(node.right, result)
+
+
+class BalancedIntervalNode(IntervalNode):
+    """
+    A node of the balanced interval tree. In addition to the IntervalNode fields it stores:
+    - height: The height of the subtree rooted at this node (a leaf has height 1).
+    """
+    def __init__(self, interval):
+        """
+        Initialize a balanced interval node.
+
+        Parameters:
+        - interval: The interval that the node will initially hold.
+        """
+        super().__init__(interval)
+        self.height = 1
+
+
+class BalancedIntervalTree(IntervalTree):
+    """
+    A self-balancing (AVL) variant of IntervalTree.
+
+    Nodes are ordered by start time exactly like IntervalTree, but the tree is rebalanced with
+    rotations after every insertion and removal, so its height stays O(log n) even when intervals
+    arrive in increasing start order. max_end is recomputed for every node touched by a rotation,
+    which keeps the overlap pruning of IntervalTree valid. Intervals can also be removed, which
+    lets a rescheduling pass take games off the calendar.
+    """
+    def insert(self, interval):
+        """
+        Insert an interval into the tree and rebalance.
+
+        Parameters:
+        - interval: The interval to insert.
+        """
+        self.root = self._insert(self.root, interval)
+
+    def _insert(self, node, interval):
+        """
+        Recursive helper function to insert an interval into a subtree.
+
+        Parameters:
+        - node: The root of the subtree.
+        - interval: The interval to insert.
+
+        Returns:
+        - The new root of the (rebalanced) subtree.
+        """
+        if node is None:
+            return BalancedIntervalNode(interval)
+
+        if interval.start < node.intervals[0].start:
+            node.left = self._insert(node.left, interval)
+        elif interval.start > node.intervals[0].start:
+            node.right = self._insert(node.right, interval)
+        else:
+            # If start times are equal, add the interval to the list of intervals in the node.
+            node.intervals.append(interval)
+
+        return self._rebalance(node)
+
+    def remove(self, interval):
+        """
+        Remove an interval from the tree and rebalance.
+
+        The interval is matched by identity, so the exact object that was inserted must be passed.
+
+        Parameters:
+        - interval: The interval to remove.
+
+        Raises:
+        - ValueError: If the interval is not in the tree.
+        """
+        self.root = self._remove(self.root, interval)
+
+    def _remove(self, node, interval):
+        """
+        Recursive helper function to remove an interval from a subtree.
+
+        Parameters:
+        - node: The root of the subtree.
+        - interval: The interval to remove.
+
+        Returns:
+        - The new root of the (rebalanced) subtree.
+        """
+        if node is None:
+            raise ValueError(f"{interval} is not in the tree")
+
+        if interval.start < node.intervals[0].start:
+            node.left = self._remove(node.left, interval)
+        elif interval.start > node.intervals[0].start:
+            node.right = self._remove(node.right, interval)
+        else:
+            for position, stored_interval in enumerate(node.intervals):
+                if stored_interval is interval:
+                    del node.intervals[position]
+                    break
+            else:
+                raise ValueError(f"{interval} is not in the tree")
+
+            if not node.intervals:
+                # The node is now empty, unlink it like a regular BST deletion.
+                if node.left is None:
+                    return node.right
+                if node.right is None:
+                    return node.left
+                # Replace the node's contents with its in-order successor, then drop the successor.
+                successor = node.right
+                while successor.left is not None:
+                    successor = successor.left
+                node.intervals = successor.intervals
+                node.right = self._remove_min(node.right)
+
+        return self._rebalance(node)
+
+    def _remove_min(self, node):
+        """
+        Unlink the leftmost node of a subtree.
+
+        Parameters:
+        - node: The root of the subtree.
+
+        Returns:
+        - The new root of the (rebalanced) subtree.
+        """
+        if node.left is None:
+            return node.right
+        node.left = self._remove_min(node.left)
+        return self._rebalance(node)
+
+    @staticmethod
+    def _height(node):
+        """Return the height of a subtree (0 for an empty one)."""
+        return node.height if node is not None else 0
+
+    @classmethod
+    def _update(cls, node):
+        """
+        Recompute the height and max_end of a node from its intervals and children.
+
+        Parameters:
+        - node: The node to update.
+        """
+        node.height = 1 + max(cls._height(node.left), cls._height(node.right))
+        max_end = max(stored_interval.end for stored_interval in node.intervals)
+        if node.left is not None and node.left.max_end > max_end:
+            max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > max_end:
+            max_end = node.right.max_end
+        node.max_end = max_end
+
+    @classmethod
+    def _rotate_left(cls, node):
+        """Rotate a subtree left and return its new root."""
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        cls._update(node)
+        cls._update(pivot)
+        return pivot
+
+    @classmethod
+    def _rotate_right(cls, node):
+        """Rotate a subtree right and return its new root."""
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        cls._update(node)
+        cls._update(pivot)
+        return pivot
+
+    @classmethod
+    def _rebalance(cls, node):
+        """
+        Update a node and restore the AVL balance invariant at it.
+
+        Parameters:
+        - node: The node to rebalance.
+
+        Returns:
+        - The new root of the subtree.
+        """
+        cls._update(node)
+        balance = cls._height(node.left) - cls._height(node.right)
+
+        if balance > 1:
+            # Left-heavy; a left-right case needs a first rotation on the child.
+            if cls._height(node.left.left) < cls._height(node.left.right):
+                node.left = cls._rotate_left(node.left)
+            return cls._rotate_right(node)
+
+        if balance < -1:
+            # Right-heavy; a right-left case needs a first rotation on the child.
+            if cls._height(node.right.right) < cls._height(node.right.left):
+                node.right = cls._rotate_right(node.right)
+            return cls._rotate_left(node)
+
+        return node
+
+
+class DayBucket:
+    """
+    The intervals of a single calendar day, kept sorted by start time.
+
+    Each bucket stores:
+    - starts: The sorted start times, used for binary search.
+    - intervals: The intervals, in the same order as starts.
+    - max_length: The length of the longest interval in the bucket (used to bound searches).
+    """
+    def __init__(self):
+        """Initialize an empty day bucket."""
+        self.starts = []
+        self.intervals = []
+        self.max_length = 0
+
+    def insert(self, interval):
+        """
+        Insert an interval, keeping the bucket sorted by start time.
+
+        Parameters:
+        - interval: The interval to insert.
+        """
+        position = bisect.bisect_right(self.starts, interval.start)
+        self.starts.insert(position, interval.start)
+        self.intervals.insert(position, interval)
+        self.max_length = max(self.max_length, interval.end - interval.start)
+
+    def remove(self, interval):
+        """
+        Remove an interval from the bucket, matching it by identity.
+
+        max_length is left as is: it stays a valid upper bound for the searches.
+
+        Parameters:
+        - interval: The interval to remove.
+
+        Raises:
+        - ValueError: If the interval is not in the bucket.
+        """
+        low = bisect.bisect_left(self.starts, interval.start)
+        high = bisect.bisect_right(self.starts, interval.start)
+        for position in range(low, high):
+            if self.intervals[position] is interval:
+                del self.starts[position]
+                del self.intervals[position]
+                return
+        raise ValueError(f"{interval} is not in the bucket")
+
+    def overlap(self, interval):
+        """
+        Find all intervals in the bucket that overlap with the given interval.
+
+        Only intervals starting in [interval.start - max_length, interval.end) can overlap,
+        so the scan is limited to that window of the sorted list.
+
+        Parameters:
+        - interval: The interval to check for overlaps.
+
+        Returns:
+        - A list of overlapping intervals.
+        """
+        low = bisect.bisect_left(self.starts, interval.start - self.max_length)
+        high = bisect.bisect_left(self.starts, interval.end)
+        return [stored_interval for stored_interval in self.intervals[low:high]
+                if stored_interval.overlaps(interval)]
+
+    def any_overlap(self, interval):
+        """
+        Check whether any interval in the bucket overlaps with the given interval.
+
+        Parameters:
+        - interval: The interval to check for overlaps.
+
+        Returns:
+        - True on the first overlapping interval found, False otherwise.
+        """
+        low = bisect.bisect_left(self.starts, interval.start - self.max_length)
+        high = bisect.bisect_left(self.starts, interval.end)
+        intervals = self.intervals
+        for position in range(low, high):
+            if intervals[position].overlaps(interval):
+                return True
+        return False
+
+
+class CalendarIntervalIndex:
+    """
+    An interval index partitioned by calendar day.
+
+    Intervals are bucketed by (season, week, day), and each bucket keeps its intervals sorted by
+    start time. Since intervals on different days can never overlap, an overlap query only has to
+    look at the bucket of the queried day instead of every interval in the season.
+
+    The index exposes the same insert/overlap/flatten API as IntervalTree.
+    """
+    def __init__(self):
+        """Initialize an empty calendar index."""
+        self.buckets = {}
+
+    @staticmethod
+    def _key(interval):
+        """Return the (season, week, day) bucket key of an interval."""
+        return (interval.season, interval.week, interval.day)
+
+    def insert(self, interval):
+        """
+        Insert an interval into the bucket of its day.
+
+        Parameters:
+        - interval: The interval to insert.
+        """
+        key = self._key(interval)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = DayBucket()
+        bucket.insert(interval)
+
+    def remove(self, interval):
+        """
+        Remove an interval from the bucket of its day, matching it by identity.
+
+        Parameters:
+        - interval: The interval to remove.
+
+        Raises:
+        - ValueError: If the interval is not in the index.
+        """
+        key = self._key(interval)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            raise ValueError(f"{interval} is not in the index")
+        bucket.remove(interval)
+        if not bucket.intervals:
+            del self.buckets[key]
+
+    def overlap(self, interval):
+        """
+        Find all intervals that overlap with the given interval.
+
+        Parameters:
+        - interval: The interval to check for overlaps.
+
+        Returns:
+        - A list of overlapping intervals.
+        """
+        bucket = self.buckets.get(self._key(interval))
+        if bucket is None:
+            return []
+        return bucket.overlap(interval)
+
+    def any_overlap(self, interval):
+        """
+        Check whether any stored interval overlaps with the given interval.
+
+        Parameters:
+        - interval: The interval to check for overlaps.
+
+        Returns:
+        - True if at least one stored interval overlaps, False otherwise.
+        """
+        bucket = self.buckets.get(self._key(interval))
+        return bucket is not None and bucket.any_overlap(interval)
+
+    def flatten(self):
+        """
+        Flatten the index into a list of all intervals.
+
+        Returns:
+        - A list of intervals, in calendar order and by start time within a day.
+        """
+        flattened_intervals = []
+        # Seasons may be None, so sort on a key that never compares None with an int.
+        for key in sorted(self.buckets, key=lambda k: (k[0] is not None, k[0] or 0, k[1], k[2])):
+            flattened_intervals.extend(self.buckets[key].intervals)
+        return flattened_intervals
@@ -0,0 +1,197 @@
+import os
+import numpy as np
+import pandas as pd
+
+DAY_COLUMNS = [f"d{day}{bound}" for day in range(1, 8) for bound in ("Start", "End")]
+
+# Expected columns of every input file: column -> dtype once loaded. Columns missing from the
+# file are left out, except the required ones which make the whole file unusable.
+TEAM_SCHEMA = {
+    "teamId": "int32", "name": "category", "leagueId": "int32", "sportId": "int32", "leagueTypeId": "int32",
+    "players": "int32", "region": "category", **{column: "float32" for column in DAY_COLUMNS},
+}
+VENUE_SCHEMA = {
+    "venueId": "int32", "region": "category", "name": "category", "field": "int32",
+    **{column: "float32" for column in DAY_COLUMNS},
+    "seasonStart": "int32", "seasonEnd": "int32", "seasonYear": "int32",
+}
+LEAGUE_SCHEMA = {
+    "leagueId": "int32", "sportId": "int32", "leagueTypeId": "int32", "leagueName": "category", "sport": "int32",
+    "leagueSize": "int32", "seasonStart": "int32", "seasonEnd": "int32", "numberOfGames": "float32", "seasonYear": "int32",
+}
+REQUIRED_COLUMNS = {
+    "team.csv": ["name", "leagueId"] + DAY_COLUMNS,
+    "venue.csv": ["venueId", "name", "field", "seasonStart", "seasonEnd", "seasonYear"] + DAY_COLUMNS,
+    "league.csv": ["leagueId", "leagueName"],
+}
+# Optional columns that may be empty (a missing numberOfGames means "every matchup")
+NULLABLE_COLUMNS = {"numberOfGames", "teamId", "sportId", "leagueTypeId", "players", "region", "sport", "leagueSize"}
+
+# Older league files name the season year "season"
+COLUMN_ALIASES = {"league.csv": {"season": "seasonYear"}}
+
+
+class QuarantineReport:
+    """
+    The input rows set aside by the loader, with the reason for each.
+
+    Entries are dicts with the file, the row number in the file (1 being the first data row),
+    the offending column and value, and the reason.
+    """
+    def __init__(self):
+        self.entries = []
+
+    def add(self, file, row, column, value, reason):
+        self.entries.append({"file": file, "row": int(row), "column": column, "value": value, "reason": reason})
+
+    def __len__(self):
+        return len(self.entries)
+
+    def to_frame(self):
+        """Return the entries as a DataFrame."""
+        return pd.DataFrame(self.entries, columns=["file", "row", "column", "value", "reason"])
+
+    def save(self, path):
+        """
+        Write the report as CSV, or remove a stale report when there is nothing to report.
+        """
+        if self.entries:
+            self.to_frame().to_csv(path, index=False)
+        elif os.path.exists(path):
+            os.remove(path)
+
+
+class CaseInputs:
+    """
+    The clean, typed input tables of a case and the report of the rows left out.
+    """
+    def __init__(self, team_df, venue_df, league_df, report):
+        self.team_df = team_df
+        self.venue_df = venue_df
+        self.league_df = league_df
+        self.report = report
+
+
+def read_table(path, file, schema, report):
+    """
+    Read an input CSV and coerce it to its schema, flagging the rows that cannot be coerced.
+
+    Every cell is read as text first, so one bad value cannot make pandas guess the wrong dtype for
+    a whole column. Numeric columns are parsed with errors="coerce": a non-empty value that does not
+    parse, or an empty required value, marks its row as bad.
+
+    Parameters:
+    - path (str): The CSV file.
+    - file (str): Its name in the report (team.csv, venue.csv or league.csv).
+    - schema (dict): Column -> dtype of the file.
+    - report (QuarantineReport): Receives the bad rows.
+
+    Returns:
+    - tuple: (table, bad) where bad is a boolean Series of the rows to quarantine.
+
+    Raises:
+    - FileNotFoundError: If the file does not exist.
+    - ValueError: If a required column is missing.
+    """
+    raw = pd.read_csv(path, dtype=str, keep_default_na=False, skipinitialspace=True)
+    raw = raw.rename(columns=lambda column: column.strip()).rename(columns=COLUMN_ALIASES.get(file, {}))
+    missing = [column for column in REQUIRED_COLUMNS[file] if column not in raw.columns]
+    if missing:
+        raise ValueError(f"{path} is missing the columns {', '.join(missing)}")
+
+    table = pd.DataFrame(index=raw.index)
+    bad = pd.Series(False, index=raw.index)
+    for column in raw.columns:
+        text = raw[column].str.strip()
+        dtype = schema.get(column)
+        empty = text == ""
+        if dtype is None or dtype == "category":
+            table[column] = text.astype("category") if dtype == "category" else text
+            invalid = empty & (column in REQUIRED_COLUMNS[file])
+            reason = "missing value"
+        else:
+            values = pd.to_numeric(text, errors="coerce")
+            invalid = values.isna() & ~(empty & (column in NULLABLE_COLUMNS))
+            reason = "not a number"
+            if dtype.startswith("int"):
+                fractional = values.notna() & (values % 1 != 0)
+                invalid |= fractional
+                values = values.where(~invalid)
+            table[column] = values.astype("float32") if dtype == "float32" or values.isna().any() else values.astype(dtype)
+        for row in np.flatnonzero(invalid.to_numpy()):
+            report.add(file, row + 1, column, raw[column].iloc[row], reason)
+        bad |= invalid
+    return table, bad
+
+
+def flag_rows(table, mask, file, column, reason, report, bad):
+    """Quarantine the rows of a mask (not already quarantined), reporting the value of a column."""
+    new = mask & ~bad
+    for row in np.flatnonzero(new.to_numpy()):
+        report.add(file, row + 1, column, table[column].iloc[row], reason)
+    return bad | new
+
+
+def check_windows(table, file, report, bad):
+    """Quarantine rows with a day window outside 0-24 or ending before it starts."""
+    for day in range(1, 8):
+        start, end = table[f"d{day}Start"], table[f"d{day}End"]
+        bad = flag_rows(table, (start < 0) | (start > 24), file, f"d{day}Start", "time outside 0-24", report, bad)
+        bad = flag_rows(table, (end < 0) | (end > 24), file, f"d{day}End", "time outside 0-24", report, bad)
+        bad = flag_rows(table, start > end, file, f"d{day}End", "window ends before it starts", report, bad)
+    return bad
+
+
+def load_case(case, data_dir="./data"):
+    """
+    Load and validate the team, venue and league files of a case.
+
+    Tables are parsed with explicit dtypes (categoricals for names and regions, float32 times,
+    int32 ids and weeks) and every range is checked once, up front. Rows that fail a check are
+    dropped from the tables and listed in the report, so the scheduler only ever sees clean rows:
+    - team.csv: a name and a known league, unique names, day windows within 0-24 and not inverted.
+    - venue.csv: ids, field and season year, day windows as for teams, a season within weeks 1-52.
+    - league.csv: a unique id and a name; 'season' is read as 'seasonYear'.
+
+    Parameters:
+    - case (str): The case identifier.
+    - data_dir (str): Directory holding the case directories.
+
+    Returns:
+    - A CaseInputs.
+
+    Raises:
+    - FileNotFoundError: If an input file is missing.
+    - ValueError: If an input file lacks a required column.
+    """
+    report = QuarantineReport()
+    directory = f"{data_dir}/{case}"
+
+    league_df, bad = read_table(f"{directory}/league.csv", "league.csv", LEAGUE_SCHEMA, report)
+    bad = flag_rows(league_df, league_df["leagueId"].where(~bad).duplicated(), "league.csv", "leagueId", "duplicate league", report, bad)
+    league_df = league_df[~bad].reset_index(drop=True)
+
+    team_df, bad = read_table(f"{directory}/team.csv", "team.csv", TEAM_SCHEMA, report)
+    bad = check_windows(team_df, "team.csv", report, bad)
+    bad = flag_rows(team_df, ~team_df["leagueId"].isin(league_df["leagueId"]), "team.csv", "leagueId", "unknown league", report, bad)
+    bad = flag_rows(team_df, team_df["name"].where(~bad).duplicated(), "team.csv", "name", "duplicate team", report, bad)
+    team_df = team_df[~bad].reset_index(drop=True)
+    team_df["name"] = team_df["name"].cat.remove_unused_categories()
+
+    venue_df, bad = read_table(f"{directory}/venue.csv", "venue.csv", VENUE_SCHEMA, report)
+    bad = check_windows(venue_df, "venue.csv", report, bad)
+    bad = flag_rows(venue_df, (venue_df["seasonStart"] < 1) | (venue_df["seasonStart"] > 52), "venue.csv", "seasonStart",
+                    "week outside 1-52", report, bad)
+    bad = flag_rows(venue_df, (venue_df["seasonEnd"] < 1) | (venue_df["seasonEnd"] > 52), "venue.csv", "seasonEnd",
+                    "week outside 1-52", report, bad)
+    bad = flag_rows(venue_df, venue_df["seasonStart"] > venue_df["seasonEnd"], "venue.csv", "seasonEnd",
+                    "season ends before it starts", report, bad)
+    venue_df = venue_df[~bad].reset_index(drop=True)
+
+    # Columns that had bad values are clean now and can take their integer dtype
+    for table, schema in ((league_df, LEAGUE_SCHEMA), (team_df, TEAM_SCHEMA), (venue_df, VENUE_SCHEMA)):
+        for column, dtype in schema.items():
+            if column in table and dtype.startswith("int") and not table[column].isna().any():
+                table[column] = table[column].astype(dtype)
+
+    return CaseInputs(team_df, venue_df, league_df, report)
@@ -0,0 +1,221 @@
+import math
+import random
+import time
+import numpy as np
+from core.py.occupancy import SLOTS_PER_HOUR
+
+
+class LocalSearchSolver:
+    """
+    Time-bounded simulated annealing over the slot assignments of a whole case.
+
+    Every matchup is a variable whose value is a catalogue row (or None when unassigned). The
+    solver keeps incremental conflict counts so the cost change of a move is computed from the
+    few counters it touches, never by re-checking the schedule:
+    - field usage per (field, season, week, day, half-hour slot): any count above 1 is a double booking.
+    - team usage per (team, season, week, day): any count above 1 breaks the once-per-day rule
+      (and so also covers team overlaps).
+
+    The cost is unassigned matchups + conflicts. A move reassigns one matchup to a random slot of
+    its domain (the catalogue rows that fit both teams' availability) or unassigns it. Moves that
+    do not raise the cost are always taken, worse ones with probability exp(-delta / temperature),
+    with the temperature cooling over the time budget. Putting a game on a taken slot costs
+    nothing (one conflict for one fewer unassigned game), so the search can push a game out and
+    re-place it elsewhere. The best conflict-free assignment seen is returned.
+    """
+    def __init__(self, matchups, catalogue, availability=None, seed=0):
+        """
+        Set up the solver.
+
+        Parameters:
+        - matchups (list): (team1, team2, league_name, row) for every matchup, row being its
+          current catalogue row (a conflict-free starting point) or None.
+        - catalogue (SlotCatalogue): The slot catalogue of the run.
+        - availability (TeamAvailability): Optional team availability windows defining the domains.
+        - seed (int): Seed of the random number generator, for reproducible runs.
+        """
+        self.matchups = matchups
+        self.catalogue = catalogue
+        self.availability = availability
+        self.random = random.Random(seed)
+        self.assignment = [row for _, _, _, row in matchups]
+        self.domains = {}
+        # Unassigned matchups with a non-empty domain, as a list with an index for O(1) updates
+        self.open_positions = []
+        self.open_index = {}
+
+        self.field_usage = {}
+        self.team_usage = {}
+        self.conflicts = 0
+        self.unassigned = 0
+        for position, row in enumerate(self.assignment):
+            if row is None:
+                self.unassigned += 1
+            else:
+                self.conflicts += self._place(position, row, 1)
+
+    def domain(self, position):
+        """
+        Return the catalogue rows a matchup may be assigned to (computed once per matchup).
+
+        Parameters:
+        - position (int): Index of the matchup.
+
+        Returns:
+        - An array of catalogue rows.
+        """
+        rows = self.domains.get(position)
+        if rows is None:
+            team1, team2, _, _ = self.matchups[position]
+            if self.availability is not None:
+                rows = self.availability.feasible_rows(team1, team2, self.catalogue)
+            else:
+                rows = np.arange(len(self.catalogue))
+            self.domains[position] = rows
+        return rows
+
+    def _keys(self, position, row):
+        """
+        Return the field and team counter keys a matchup occupies when assigned to a row.
+        """
+        catalogue = self.catalogue
+        venue = int(catalogue.venues[row])
+        season = catalogue.venue_seasons[venue]
+        week, day = int(catalogue.weeks[row]), int(catalogue.days[row])
+        resource = catalogue.venue_resources[venue]
+        # A game claims every half-hour slot it touches, as in day_window_bits(inwards=False)
+        first = math.floor(catalogue.starts[row] * SLOTS_PER_HOUR)
+        last = math.ceil(catalogue.ends[row] * SLOTS_PER_HOUR)
+        field_keys = [(resource, season, week, day, half_hour) for half_hour in range(first, last)]
+        team1, team2, _, _ = self.matchups[position]
+        team_keys = [(team1, season, week, day), (team2, season, week, day)]
+        return field_keys, team_keys
+
+    def _place(self, position, row, step):
+        """
+        Add (step=1) or remove (step=-1) a matchup's usage of a row.
+
+        Returns:
+        - The resulting change in the number of conflicts.
+        """
+        delta = 0
+        field_keys, team_keys = self._keys(position, row)
+        for usage, keys in ((self.field_usage, field_keys), (self.team_usage, team_keys)):
+            for key in keys:
+                count = usage.get(key, 0)
+                if step > 0:
+                    delta += 1 if count >= 1 else 0
+                    usage[key] = count + 1
+                else:
+                    delta -= 1 if count >= 2 else 0
+                    if count == 1:
+                        del usage[key]
+                    else:
+                        usage[key] = count - 1
+        return delta
+
+    def _move(self, position, row):
+        """
+        Reassign a matchup to a row (or None) and return the change in cost.
+        """
+        old_row = self.assignment[position]
+        delta = 0
+        if old_row is not None:
+            delta += self._place(position, old_row, -1)
+        if row is not None:
+            delta += self._place(position, row, 1)
+        self.conflicts += delta
+        unassigned_delta = (row is None) - (old_row is None)
+        self.unassigned += unassigned_delta
+        self.assignment[position] = row
+        if unassigned_delta > 0:
+            self._open(position)
+        elif unassigned_delta < 0:
+            self._close(position)
+        return delta + unassigned_delta
+
+    def _open(self, position):
+        """Add an unassigned matchup to the open positions, if it has a slot it could take."""
+        if position not in self.open_index and len(self.domain(position)):
+            self.open_index[position] = len(self.open_positions)
+            self.open_positions.append(position)
+
+    def _close(self, position):
+        """Remove an assigned matchup from the open positions (swapping the last one into its place)."""
+        index = self.open_index.pop(position, None)
+        if index is None:
+            return
+        last = self.open_positions.pop()
+        if last != position:
+            self.open_positions[index] = last
+            self.open_index[last] = index
+
+    def _is_conflicting(self, position):
+        """Check whether an assigned matchup shares a field slot or a team day with another one."""
+        row = self.assignment[position]
+        if row is None:
+            return False
+        field_keys, team_keys = self._keys(position, row)
+        return (any(self.field_usage[key] > 1 for key in field_keys)
+                or any(self.team_usage[key] > 1 for key in team_keys))
+
+    def solve(self, time_budget, initial_temperature=2.0, final_temperature=0.05):
+        """
+        Run the search until the time budget is spent.
+
+        Parameters:
+        - time_budget (float): Wall time in seconds.
+        - initial_temperature, final_temperature (float): The annealing temperature schedule.
+
+        Returns:
+        - A list with the best conflict-free catalogue row (or None) of every matchup.
+        """
+        best = list(self.assignment) if self.conflicts == 0 else [None] * len(self.assignment)
+        best_unassigned = self.unassigned if self.conflicts == 0 else len(self.assignment)
+
+        # Only matchups with at least one possible slot can be improved
+        movable = [position for position in range(len(self.matchups)) if len(self.domain(position))]
+        for position in movable:
+            if self.assignment[position] is None:
+                self._open(position)
+        # Without conflicts and with no open matchup left, nothing can improve on the current assignment
+        if not movable or time_budget <= 0 or (self.conflicts == 0 and not self.open_positions):
+            return best
+
+        started = time.perf_counter()
+        temperature = initial_temperature
+        iteration = 0
+        while True:
+            iteration += 1
+            if iteration % 256 == 0:
+                elapsed = time.perf_counter() - started
+                if elapsed >= time_budget:
+                    break
+                # Geometric cooling from the initial to the final temperature over the budget
+                temperature = initial_temperature * (final_temperature / initial_temperature) ** (elapsed / time_budget)
+
+            # Focus on unassigned matchups, with some moves spent on the rest of the schedule
+            position = self.random.choice(movable)
+            if self.assignment[position] is not None and not self._is_conflicting(position) \
+                    and self.random.random() < 0.7:
+                if self.open_positions:
+                    position = self.random.choice(self.open_positions)
+
+            domain = self.domain(position)
+            row = None if self.random.random() < 0.02 else int(domain[self.random.randrange(len(domain))])
+            old_row = self.assignment[position]
+            if row == old_row:
+                continue
+
+            delta = self._move(position, row)
+            if delta > 0 and self.random.random() >= math.exp(-delta / temperature):
+                self._move(position, old_row)
+                continue
+
+            if self.conflicts == 0 and self.unassigned < best_unassigned:
+                best = list(self.assignment)
+                best_unassigned = self.unassigned
+                if not self.open_positions:
+                    break
+
+        return best
@@ -0,0 +1,187 @@
+import numpy as np
+
+# Times are on a 30-minute grid between 0 and 23.5 (see README and synthetic.generate_availability),
+# and weeks run from 1 to 52, so a season of one resource fits in 52 * 7 * 48 bits.
+SLOTS_PER_HOUR = 2
+SLOTS_PER_DAY = 24 * SLOTS_PER_HOUR
+DAYS_PER_WEEK = 7
+WEEKS_PER_SEASON = 52
+
+
+def slot_index(time):
+    """
+    Convert a time of day to its half-hour slot index.
+
+    Parameters:
+    - time: A time in hours (e.g. 9, 13.5), on the 30-minute grid.
+
+    Returns:
+    - The slot index, between 0 and SLOTS_PER_DAY.
+
+    Raises:
+    - ValueError: If the time is not on the 30-minute grid or outside the day.
+    """
+    slot = time * SLOTS_PER_HOUR
+    if slot != int(slot) or not 0 <= slot <= SLOTS_PER_DAY:
+        raise ValueError(f"Time {time} is not on the 30-minute grid of a day")
+    return int(slot)
+
+
+def day_offset(week, day):
+    """
+    Return the bit offset of the first slot of a (week, day) in a season bitset.
+
+    Raises:
+    - ValueError: If the week or day is out of range.
+    """
+    if not 1 <= week <= WEEKS_PER_SEASON or not 1 <= day <= DAYS_PER_WEEK:
+        raise ValueError(f"Week {week} / day {day} is outside the season calendar")
+    return ((int(week) - 1) * DAYS_PER_WEEK + int(day) - 1) * SLOTS_PER_DAY
+
+
+def window_mask(interval):
+    """
+    Build the season bitmask covered by an interval.
+
+    Parameters:
+    - interval: The interval (start, end, day, week) to convert.
+
+    Returns:
+    - An int with one bit set for every half-hour slot the interval covers.
+    """
+    first = slot_index(interval.start)
+    last = slot_index(interval.end)
+    return ((1 << (last - first)) - 1) << (day_offset(interval.week, interval.day) + first)
+
+
+def window_free(interval, *bitmaps):
+    """
+    Check that an interval is free on several resources at once.
+
+    The occupancy of all resources is OR-ed together and tested against the interval mask,
+    so a field and two teams are checked with a couple of bitwise operations.
+
+    Parameters:
+    - interval: The interval to check.
+    - bitmaps: The SlotBitmap of every resource involved.
+
+    Returns:
+    - True if none of the resources is busy during the interval, False otherwise.
+    """
+    occupied = 0
+    for bitmap in bitmaps:
+        occupied |= bitmap.bits.get(interval.season, 0)
+    return not occupied & window_mask(interval)
+
+
+class SlotBitmap:
+    """
+    Occupancy of a single resource (a field or a team) stored as one bitset per season.
+
+    Bit ((week - 1) * 7 + (day - 1)) * 48 + slot is set when the resource is busy during that
+    half-hour slot, so an overlap check is a single AND between the bitset and the interval mask.
+
+    The bitmap exposes the same insert/overlap/any_overlap/flatten/remove API as
+    CalendarIntervalIndex and can be used in its place by the Scheduler.
+    """
+    def __init__(self):
+        """Initialize an empty bitmap."""
+        self.bits = {}
+        self.intervals = []
+
+    def insert(self, interval):
+        """
+        Mark the slots of an interval as busy.
+
+        Parameters:
+        - interval: The interval to insert.
+
+        Raises:
+        - ValueError: If the interval does not fit the half-hour season grid.
+        """
+        mask = window_mask(interval)
+        self.bits[interval.season] = self.bits.get(interval.season, 0) | mask
+        self.intervals.append(interval)
+
+    def remove(self, interval):
+        """
+        Remove an interval, matching it by identity, and free its slots.
+
+        Slots still covered by another stored interval of the same day stay busy.
+
+        Parameters:
+        - interval: The interval to remove.
+
+        Raises:
+        - ValueError: If the interval is not in the bitmap.
+        """
+        for position, stored_interval in enumerate(self.intervals):
+            if stored_interval is interval:
+                del self.intervals[position]
+                break
+        else:
+            raise ValueError(f"{interval} is not in the bitmap")
+
+        bits = self.bits[interval.season] & ~window_mask(interval)
+        for stored_interval in self.intervals:
+            if (stored_interval.season == interval.season and stored_interval.week == interval.week
+                    and stored_interval.day == interval.day):
+                bits |= window_mask(stored_interval)
+        self.bits[interval.season] = bits
+
+    def any_overlap(self, interval):
+        """
+        Check whether the resource is busy at any point of the given interval.
+
+        Parameters:
+        - interval: The interval to check.
+
+        Returns:
+        - True if at least one slot of the interval is busy, False otherwise.
+        """
+        return bool(self.bits.get(interval.season, 0) & window_mask(interval))
+
+    def overlap(self, interval):
+        """
+        Find all stored intervals that overlap with the given interval.
+
+        Parameters:
+        - interval: The interval to check for overlaps.
+
+        Returns:
+        - A list of overlapping intervals.
+        """
+        if not self.any_overlap(interval):
+            return []
+        return [stored_interval for stored_interval in self.intervals if stored_interval.overlaps(interval)]
+
+    def flatten(self):
+        """
+        Return all stored intervals.
+
+        Returns:
+        - A list of intervals, in calendar order and by start time within a day.
+        """
+        return sorted(self.intervals, key=lambda i: (i.season is not None, i.season or 0, i.week, i.day, i.start))
+
+
+def day_window_bits(starts, ends, inwards=True):
+    """
+    Build the day bitmask (one bit per half-hour slot of a day) of many windows at once.
+
+    Window bounds that are not on the 30-minute grid are rounded inwards by default, so an
+    availability mask never claims more time than the window covers. Pass inwards=False for
+    the windows of games, which must claim every slot they touch. Inverted or empty windows give 0.
+
+    Parameters:
+    - starts, ends: Arrays of window start and end times, in hours.
+    - inwards (bool): Round off-grid bounds towards the inside (True) or the outside (False) of the window.
+
+    Returns:
+    - A uint64 array with the mask of every window.
+    """
+    round_start, round_end = (np.ceil, np.floor) if inwards else (np.floor, np.ceil)
+    first = np.clip(round_start(np.asarray(starts, dtype=np.float64) * SLOTS_PER_HOUR), 0, SLOTS_PER_DAY)
+    last = np.clip(round_end(np.asarray(ends, dtype=np.float64) * SLOTS_PER_HOUR), 0, SLOTS_PER_DAY)
+    width = np.maximum(last - first, 0).astype(np.uint64)
+    return ((np.uint64(1) << width) - np.uint64(1)) << first.astype(np.uint64)
@@ -0,0 +1,128 @@
+import contextlib
+import time
+from collections import Counter
+
+# Outcomes of Scheduler.try_schedule_game, in the order its checks run
+OUTCOMES = ("daily_limit", "field_busy", "team_busy", "scheduled")
+
+
+def node_height(node):
+    """Return the height of an interval tree node (0 for an empty subtree)."""
+    height = 0
+    level = [node] if node is not None else []
+    while level:
+        height += 1
+        level = [child for parent in level for child in (parent.left, parent.right) if child is not None]
+    return height
+
+
+def index_depth(index):
+    """
+    Return how deep an overlap probe into an occupancy index may have to search.
+
+    - CalendarIntervalIndex: the size of its largest day bucket (the longest scan of a probe).
+    - IntervalTree and its balanced variant: the height of the tree.
+    - SlotBitmap: 0, a probe is a constant number of bitwise operations.
+    """
+    if hasattr(index, "buckets"):
+        return max((len(bucket.intervals) for bucket in index.buckets.values()), default=0)
+    if hasattr(index, "root"):
+        return node_height(index.root)
+    return 0
+
+
+def occupancy_stats(indexes):
+    """
+    Summarize a collection of occupancy indexes.
+
+    Parameters:
+    - indexes: The occupancy indexes (of fields or of teams).
+
+    Returns:
+    - dict: The number of indexes, the intervals they hold and their maximum and mean depth (see index_depth).
+    """
+    indexes = list(indexes)
+    depths = [index_depth(index) for index in indexes]
+    return {
+        "indexes": len(indexes),
+        "intervals": sum(len(index.flatten()) for index in indexes),
+        "max_depth": max(depths, default=0),
+        "mean_depth": round(sum(depths) / len(depths), 3) if depths else 0,
+    }
+
+
+class Profiler:
+    """
+    Opt-in instrumentation of a Scheduler.run call: per-phase timers, hot-path counters and
+    occupancy index depths.
+
+    Pass an instance to Scheduler.run and read report() once the run returns. The counters cover
+    the slot scan of this process (with several workers, the leagues scheduled in worker processes
+    are only seen through the merge):
+    - slots_tried: Slots tested by try_schedule_game.
+    - field_probes: Overlap probes into a field's occupancy index.
+    - team_probes: Overlap checks of the two teams of a game.
+    - rejected_daily_limit, rejected_field_busy, rejected_team_busy: Slots rejected, by reason.
+    - scheduled: Games booked.
+    """
+    def __init__(self):
+        self.counters = Counter()
+        self.phases = {}
+        self.occupancy = {}
+
+    def count(self, name, amount=1):
+        """Add to a counter."""
+        self.counters[name] += amount
+
+    def attempt(self, outcome):
+        """
+        Record one try_schedule_game call and the probes it made.
+
+        Parameters:
+        - outcome (str): One of OUTCOMES.
+        """
+        counters = self.counters
+        counters["slots_tried"] += 1
+        if outcome != "daily_limit":
+            counters["field_probes"] += 1
+            if outcome != "field_busy":
+                counters["team_probes"] += 1
+        counters["scheduled" if outcome == "scheduled" else f"rejected_{outcome}"] += 1
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a phase of the run; a phase entered several times accumulates its time."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def record_occupancy(self, field_interval_map, team_interval_map):
+        """Record the occupancy statistics of the field and team indexes of the run."""
+        self.occupancy = {
+            "fields": occupancy_stats(field_interval_map.values()),
+            "teams": occupancy_stats(team_interval_map.values()),
+        }
+
+    def report(self):
+        """
+        Return the measurements as JSON-serializable data.
+
+        Returns:
+        - dict: "phases" (seconds per phase, in run order), "total" (seconds), "counters" and "occupancy".
+        """
+        counters = {name: 0 for name in ("slots_tried", "field_probes", "team_probes", "scheduled")}
+        counters.update({f"rejected_{outcome}": 0 for outcome in OUTCOMES[:-1]})
+        counters.update(self.counters)
+        return {
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "total": round(sum(self.phases.values()), 6),
+            "counters": counters,
+            "occupancy": self.occupancy,
+        }
+
+
+def phase(profiler, name):
+    """Return profiler.phase(name), or a context that does nothing when profiler is None."""
+    return profiler.phase(name) if profiler is not None else contextlib.nullcontext()
@@ -0,0 +1,34 @@
+def round_robin_rounds(teams):
+    """
+    Pair teams into balanced rounds with the circle method.
+
+    The first team stays fixed while the others rotate one position per round, so every team
+    meets every other team exactly once and plays at most once per round. With an odd number
+    of teams, one team sits out (has a bye) each round.
+
+    Parameters:
+    - teams: The team names of a league.
+
+    Returns:
+    - A list of rounds, each a list of (team1, team2) matchups.
+    """
+    teams = list(teams)
+    if len(teams) % 2:
+        teams.append(None)  # The bye
+    count = len(teams)
+
+    rounds = []
+    for round_number in range(count - 1):
+        matchups = []
+        for position in range(count // 2):
+            team1, team2 = teams[position], teams[count - 1 - position]
+            if team1 is None or team2 is None:
+                continue
+            # Alternate the fixed team between team1 and team2 so it is not always listed first
+            if position == 0 and round_number % 2:
+                team1, team2 = team2, team1
+            matchups.append((team1, team2))
+        rounds.append(matchups)
+        # Rotate every team but the first one position clockwise
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds
@@ -0,0 +1,371 @@
+import json
+import pandas as pd
+from collections import defaultdict
+from core.py.availability import TeamAvailability
+from core.py.columnar import atomic_path
+from core.py.interval_tree import Interval
+from core.py.loader import load_case
+from core.py.scheduler import Scheduler
+from core.py.slot_catalogue import SlotCatalogue
+
+
+class ScheduleState:
+    """
+    A schedule kept in memory together with the occupancy indexes that produced it.
+
+    Scheduler.run rebuilds everything from the CSV files on each call. A ScheduleState keeps the
+    slot catalogue, the team availability matrix and the field and team occupancy indexes alive
+    between changes, so a change only touches the games it affects: a blocked field window
+    displaces the games inside it and re-places just those, a late team only schedules its own
+    matchups. The state can be saved to disk as JSON and loaded back by the API.
+
+    Attributes:
+    - case (str): The case the state was built from.
+    - games (list): The scheduled games, in the format of Scheduler.try_schedule_game.
+    - bookings (list): (resource, interval) of every game, parallel to games; resource is the
+      (venueId, field) of the game's field and the same interval is stored in the field and team indexes.
+    - unscheduled (list): (team1, team2, league_name) of the matchups that have no slot.
+    - blocks (list): (resource, interval) of every window made unavailable with block_window.
+    """
+    def __init__(self, case, team_df, venue_df, league_df, engine="tree", team_availability=True):
+        """
+        Set up an empty state (no games) for a case.
+
+        Parameters:
+        - case (str): The case identifier.
+        - team_df, venue_df, league_df (DataFrame): The input data of the case.
+        - engine (str): The occupancy engine, a key of Scheduler.ENGINES.
+        - team_availability (bool): Only place games inside both teams' availability windows.
+        """
+        if engine not in Scheduler.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {sorted(Scheduler.ENGINES)}")
+        self.case = case
+        self.team_df = team_df
+        self.venue_df = venue_df
+        self.league_df = league_df
+        self.engine = engine
+        # Some cases do not enforce team windows (see Scheduler.AVAILABILITY_EXEMPT_CASES)
+        self.team_availability = team_availability and case not in Scheduler.AVAILABILITY_EXEMPT_CASES
+
+        self.catalogue = SlotCatalogue(venue_df, Scheduler.GAME_DURATION)
+        self.availability = TeamAvailability(team_df) if self.team_availability else None
+
+        index_class = Scheduler.ENGINES[engine]
+        self.field_interval_map = defaultdict(index_class)
+        self.team_interval_map = defaultdict(index_class)
+        self.team_daily_count = {}
+        self.games = []
+        self.bookings = []
+        self.unscheduled = []
+        self.blocks = []
+
+    @classmethod
+    def from_case(cls, case, engine="tree", team_availability=True, pairing="round_robin"):
+        """
+        Build the state of a case by scheduling it from scratch, as Scheduler.run does (greedy strategy).
+
+        Parameters:
+        - case (str): The case identifier (data is read from ./data/{case}).
+        - engine, team_availability: See __init__.
+        - pairing (str): "round_robin" or "combinations" (see Scheduler.run).
+
+        Returns:
+        - The new ScheduleState.
+
+        Raises:
+        - FileNotFoundError: If an input file of the case is missing.
+        - ValueError: If an input file lacks a required column.
+        """
+        inputs = load_case(case)
+        state = cls(case, inputs.team_df, inputs.venue_df, inputs.league_df, engine, team_availability)
+        for league_name, matchups in Scheduler.league_matchups(case, inputs.team_df, inputs.league_df, pairing):
+            state.place_matchups([(team1, team2, league_name, round_number)
+                                  for team1, team2, round_number in matchups])
+        return state
+
+    def place_matchups(self, matchups):
+        """
+        Place matchups in the first free slots, as the greedy strategy does.
+
+        Parameters:
+        - matchups (list): (team1, team2, league_name) or (team1, team2, league_name, round_number) tuples.
+
+        Returns:
+        - list: The game of every matchup that was placed.
+        """
+        placed = []
+        for team1, team2, league_name, *round_number in matchups:
+            slot = Scheduler.schedule_team_pair(
+                team1, team2, league_name, self.catalogue, self.field_interval_map, self.team_interval_map,
+                self.team_daily_count, self.games, self.availability, None, *round_number
+            )
+            if slot is None:
+                self.unscheduled.append((team1, team2, league_name))
+                continue
+            placed.append(self._record_booking(slot))
+        return placed
+
+    def _record_booking(self, slot):
+        """
+        Record the booking of the game try_schedule_game just appended for a slot.
+
+        Returns:
+        - The game.
+        """
+        week, day, start, end, venue, _ = slot
+        resource = self.catalogue.venue_resources[venue]
+        probe = Interval(start=start, end=end, day=day, week=week, season=self.catalogue.venue_seasons[venue])
+        # The field was free before the game, so its only overlapping interval is the game's own
+        interval = self.field_interval_map[resource].overlap(probe)[0]
+        self.bookings.append((resource, interval))
+        return self.games[-1]
+
+    def _unbook(self, position):
+        """
+        Remove the game at a position of the games list and free its field and teams.
+
+        Returns:
+        - The removed game.
+        """
+        game = self.games.pop(position)
+        resource, interval = self.bookings.pop(position)
+        self.field_interval_map[resource].remove(interval)
+        for team in (game["team1Name"], game["team2Name"]):
+            self.team_interval_map[team].remove(interval)
+            key = (team, game["season"], game["week"], game["day"])
+            self.team_daily_count[key] -= 1
+            if not self.team_daily_count[key]:
+                del self.team_daily_count[key]
+        return game
+
+    def remove_game(self, team1, team2, season, week, day):
+        """
+        Remove a game from the schedule. Its matchup is dropped, not re-placed.
+
+        A team plays at most once per day, so the teams and the day identify the game.
+
+        Parameters:
+        - team1, team2 (str): The teams of the game, in any order.
+        - season, week, day (int): When the game is played.
+
+        Returns:
+        - The removed game.
+
+        Raises:
+        - KeyError: If there is no such game.
+        """
+        teams = {team1, team2}
+        for position, game in enumerate(self.games):
+            if ({game["team1Name"], game["team2Name"]} == teams and game["season"] == season
+                    and game["week"] == week and game["day"] == day):
+                return self._unbook(position)
+        raise KeyError(f"No game between {team1} and {team2} in season {season}, week {week}, day {day}")
+
+    def block_window(self, resource, season, week, day, start, end):
+        """
+        Make a field or a team unavailable during a time window, and re-place the displaced games.
+
+        Games of the resource that overlap the window are removed, the window is stored in the
+        resource's occupancy index so no game can use it again, and the displaced matchups are
+        placed in the first free slots that remain.
+
+        Parameters:
+        - resource: A (venueId, field) tuple for a field, or a team name.
+        - season, week, day (int): The day of the window.
+        - start, end: The window, in hours.
+
+        Returns:
+        - tuple: (displaced, replaced): the removed games, and the games they were re-placed as.
+            Displaced matchups that found no slot are added to unscheduled.
+
+        Raises:
+        - KeyError: If the resource is neither a field of the venue data nor a team.
+        """
+        window = Interval(start=start, end=end, day=day, week=week, season=season)
+        if isinstance(resource, tuple):
+            if resource not in self.catalogue.venue_resources:
+                raise KeyError(f"Unknown field {resource}")
+            index = self.field_interval_map[resource]
+            affected = [position for position, (game_resource, interval) in enumerate(self.bookings)
+                        if game_resource == resource and interval.overlaps(window)]
+        else:
+            # team_interval_map only holds the teams probed so far; the team data holds them all
+            if resource not in set(self.team_df["name"]):
+                raise KeyError(f"Unknown team {resource}")
+            index = self.team_interval_map[resource]
+            affected = [position for position, (game, (_, interval)) in enumerate(zip(self.games, self.bookings))
+                        if resource in (game["team1Name"], game["team2Name"]) and interval.overlaps(window)]
+
+        displaced = [self._unbook(position) for position in reversed(affected)][::-1]
+        index.insert(window)
+        self.blocks.append((resource, window))
+        replaced = self.place_matchups([(game["team1Name"], game["team2Name"], game["league"]) for game in displaced])
+        return displaced, replaced
+
+    def add_team(self, team):
+        """
+        Add a team to its league and schedule its matchups against the league's other teams.
+
+        Parameters:
+        - team (dict): A team.csv row; needs at least name and leagueId, and the d{day}Start/d{day}End
+            availability columns when team availability is enforced.
+
+        Returns:
+        - list: The games placed for the new team. Matchups without a slot are added to unscheduled.
+
+        Raises:
+        - ValueError: If the team already exists, its league is unknown or its availability is missing.
+        """
+        missing = [column for column in (f"d{day}{bound}" for day in range(1, 8) for bound in ("Start", "End"))
+                   if team.get(column) is None]
+        if self.availability is not None and missing:
+            raise ValueError(f"Team {team['name']} has no availability for {', '.join(missing)}")
+        if team["name"] in set(self.team_df["name"]):
+            raise ValueError(f"Team {team['name']} already exists")
+        leagues = self.league_df[self.league_df["leagueId"] == team["leagueId"]]
+        if leagues.empty:
+            raise ValueError(f"Unknown league {team['leagueId']}")
+        league_name = leagues["leagueName"].iloc[0]
+
+        opponents = self.team_df[self.team_df["leagueId"] == team["leagueId"]]["name"].unique()
+        self.team_df = pd.concat([self.team_df, pd.DataFrame([team])], ignore_index=True)
+        if self.availability is not None:
+            self.availability = TeamAvailability(self.team_df)
+        return self.place_matchups([(opponent, team["name"], league_name) for opponent in opponents])
+
+    def remove_team(self, name):
+        """
+        Withdraw a team: remove it and all of its games and pending matchups.
+
+        Parameters:
+        - name (str): The team name.
+
+        Returns:
+        - list: The removed games.
+
+        Raises:
+        - KeyError: If the team does not exist.
+        """
+        if name not in set(self.team_df["name"]):
+            raise KeyError(f"Unknown team {name}")
+        affected = [position for position, game in enumerate(self.games) if name in (game["team1Name"], game["team2Name"])]
+        removed = [self._unbook(position) for position in reversed(affected)][::-1]
+        self.unscheduled = [matchup for matchup in self.unscheduled if name not in matchup[:2]]
+        self.team_interval_map.pop(name, None)
+        self.blocks = [(resource, window) for resource, window in self.blocks if resource != name]
+        self.team_df = self.team_df[self.team_df["name"] != name].reset_index(drop=True)
+        if self.availability is not None:
+            self.availability = TeamAvailability(self.team_df)
+        return removed
+
+    def retry_unscheduled(self):
+        """
+        Try again to place every unscheduled matchup (e.g. after games were removed).
+
+        Returns:
+        - list: The games that could now be placed.
+        """
+        pending, self.unscheduled = self.unscheduled, []
+        return self.place_matchups(pending)
+
+    def save_schedule(self):
+        """Write the schedule to the case's schedule.csv and schedule.json, like Scheduler.run."""
+        Scheduler.save_schedule(self.games, f"./data/{self.case}/schedule.csv", f"./data/{self.case}/schedule.json")
+
+    def _book(self, game, resource):
+        """Book a game on its field and teams, as try_schedule_game does (used when loading a state)."""
+        interval = Interval(start=game["start"], end=game["end"], day=game["day"], week=game["week"], season=game["season"])
+        self.field_interval_map[resource].insert(interval)
+        for team in (game["team1Name"], game["team2Name"]):
+            self.team_interval_map[team].insert(interval)
+            key = (team, game["season"], game["week"], game["day"])
+            self.team_daily_count[key] = self.team_daily_count.get(key, 0) + 1
+        self.games.append(game)
+        self.bookings.append((resource, interval))
+
+    @staticmethod
+    def state_path(case):
+        """Return the default path the state of a case is persisted to."""
+        return f"./data/{case}/state.json"
+
+    def to_dict(self):
+        """
+        Return the state as JSON-serializable data: the input tables, the games with their fields,
+        the unscheduled matchups and the blocked windows. The occupancy indexes are rebuilt from them.
+        """
+        def window(interval):
+            return {"season": interval.season, "week": interval.week, "day": interval.day,
+                    "start": interval.start, "end": interval.end}
+
+        return {
+            "case": self.case,
+            "engine": self.engine,
+            "team_availability": self.team_availability,
+            "tables": {name: frame_to_dict(frame) for name, frame in
+                       (("team", self.team_df), ("venue", self.venue_df), ("league", self.league_df))},
+            "games": self.games,
+            "fields": [[int(part) for part in resource] for resource, _ in self.bookings],
+            "unscheduled": [list(matchup) for matchup in self.unscheduled],
+            "blocks": [{"resource": list(resource) if isinstance(resource, tuple) else resource, **window(interval)}
+                       for resource, interval in self.blocks],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a state from the data returned by to_dict.
+
+        Returns:
+        - The ScheduleState.
+        """
+        tables = {name: frame_from_dict(table) for name, table in data["tables"].items()}
+        state = cls(data["case"], tables["team"], tables["venue"], tables["league"], data["engine"], data["team_availability"])
+        for game, resource in zip(data["games"], data["fields"]):
+            state._book(game, tuple(resource))
+        state.unscheduled = [tuple(matchup) for matchup in data["unscheduled"]]
+        for block in data["blocks"]:
+            resource = tuple(block["resource"]) if isinstance(block["resource"], list) else block["resource"]
+            interval = Interval(start=block["start"], end=block["end"], day=block["day"], week=block["week"], season=block["season"])
+            index = state.field_interval_map[resource] if isinstance(resource, tuple) else state.team_interval_map[resource]
+            index.insert(interval)
+            state.blocks.append((resource, interval))
+        return state
+
+    def save(self, path=None):
+        """
+        Persist the state as JSON (see to_dict), replacing the previous file in one step.
+
+        Parameters:
+        - path (str): Destination file (default: state_path(case)).
+        """
+        with atomic_path(str(path or self.state_path(self.case))) as temporary:
+            with open(temporary, "w") as state_file:
+                json.dump(self.to_dict(), state_file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a state persisted with save.
+
+        Parameters:
+        - path (str): The JSON file.
+
+        Returns:
+        - The ScheduleState.
+
+        Raises:
+        - FileNotFoundError: If the file does not exist.
+        """
+        with open(path) as state_file:
+            return cls.from_dict(json.load(state_file))
+
+
+def frame_to_dict(frame):
+    """Return a DataFrame as JSON-serializable columns, rows and dtypes."""
+    return {"columns": list(frame.columns), "dtypes": {column: str(dtype) for column, dtype in frame.dtypes.items()},
+            "data": frame.to_dict(orient="split")["data"]}
+
+
+def frame_from_dict(data):
+    """Rebuild a DataFrame from frame_to_dict, with its original dtypes."""
+    return pd.DataFrame(data["data"], columns=data["columns"]).astype(data["dtypes"])
@@ -1,59 +1,235 @@
+import argparse
+import cProfile
+import json
+import pstats
+import time
+import numpy as np
 import pandas as pd
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from itertools import combinations
-from core.py.interval_tree import IntervalTree, Interval
+from core.py.assignment import UNMATCHED, hopcroft_karp
+from core.py.availability import TeamAvailability
+from core.py.columnar import atomic_path, columnar_path, read_schedule, save_columnar
+from core.py.interval_tree import BalancedIntervalTree, CalendarIntervalIndex, Interval
+from core.py.loader import load_case
+from core.py.local_search import LocalSearchSolver
+from core.py.occupancy import SlotBitmap
+from core.py.profiler import Profiler, phase
+from core.py.round_robin import round_robin_rounds
+from core.py.slot_catalogue import SlotCatalogue
 
 class Scheduler:
+    # Bump when a change alters the schedules produced for the same inputs (invalidates cached results)
+    VERSION = "2.1"
+
     GAME_DURATION = 2  # Each game lasts 2 hours
 
+    # Case 3 is specified with uniform availability and a fixed 120 games, but its team windows
+    # (17-21) never intersect its venue hours (9-16), so its team windows are not enforced.
+    AVAILABILITY_EXEMPT_CASES = ("case3",)
+
+    # Occupancy engines that can track field and team schedules
+    ENGINES = {
+        "tree": CalendarIntervalIndex,
+        "bitmap": SlotBitmap,
+        "avl": BalancedIntervalTree,
+    }
+
+    # Ways of pairing the teams of a league into matchups
+    PAIRINGS = ("round_robin", "combinations")
+
+    # Ways of assigning matchups to slots (see schedule_league)
+    STRATEGIES = ("greedy", "matching", "local_search")
+
     @staticmethod
-    def run(case: str = "case1") -> int:
+    def run(case: str = "case1", engine: str = "tree", team_availability: bool = True, workers: int = 1,
+            pairing: str = "round_robin", strategy: str = "greedy", time_budget: float = 5.0,
+            warm_start: bool = False, progress=None, profiler=None, output_dir: str = None) -> int:
         """
         Main entry point for scheduling a given case.
 
         This method:
-        1. Loads input data (teams, venue, league) for the specified case.
+        1. Loads input data (teams, venue, league) for the specified case, setting invalid rows
+           aside in ./data/{case}/quarantine.csv (see core.py.loader).
         2. Determines game limits based on the case and league settings.
         3. Attempts to schedule all required matchups, enforcing:
            - No overlapping games on the same field at the same time.
            - Each team plays at most once per day.
            - Games fit within venue availability and selected time slots.
+           - Games fit within both teams' availability windows (team.csv d{day}Start/d{day}End).
         4. Saves the final schedule to CSV and JSON files.
 
         Parameters:
             case (str): The case identifier (e.g., "case1", "case2", "case3", ...).
+            engine (str): The occupancy engine, a key of Scheduler.ENGINES:
+                "tree" (calendar interval indexes), "bitmap" (half-hour slot bitsets) or "avl"
+                (one self-balancing interval tree per field and team).
+            team_availability (bool): Only schedule games inside both teams' availability windows.
+            workers (int): Number of processes; above 1, leagues are scheduled in parallel
+                and merged (see schedule_leagues_parallel).
+            pairing (str): "round_robin" (balanced circle-method rounds, each round mapped to a week)
+                or "combinations" (lexicographic team pairs).
+            strategy (str): "greedy" (first-fit, pair by pair), "matching" (maximum bipartite
+                matching of every round's matchups to the free slots of a week) or "local_search"
+                (greedy, then improved by simulated annealing, see schedule_local_search).
+            time_budget (float): Seconds a "local_search" run may take in total: the search gets what
+                is left of it once the inputs are loaded and the greedy pass is done.
+            warm_start (bool): Start from the case's previous schedule.csv: keep every game that is
+                still valid for the current inputs and only schedule the other matchups (see warm_start_games).
+            progress (callable): Optional callback receiving a dict for every progress event: "started",
+                "league_done" (after each league), "local_search_done" and "finished". Every event
+                carries the number of games placed and of matchups left unscheduled so far.
+            profiler (Profiler): Optional core.py.profiler.Profiler, filled with the time of every phase
+                of the run (load, catalogue, pairing, warm_start, scan, local_search, save), hot-path
+                counters and occupancy index depths.
+            output_dir (str): Directory the schedule and quarantine files are written to
+                (default: ./data/{case}). warm_start still starts from ./data/{case}/schedule.csv.
 
         Returns:
             int: 0 if successful, -1 if there was an error loading files.
         """
-        # Construct file paths
-        input_teams = f"./data/{case}/team.csv"
-        input_venues = f"./data/{case}/venue.csv"
-        input_leagues = f"./data/{case}/league.csv"
-        output_schedule_csv = f"./data/{case}/schedule.csv"
-        output_schedule_json = f"./data/{case}/schedule.json"
+        if engine not in Scheduler.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {sorted(Scheduler.ENGINES)}")
+        index_class = Scheduler.ENGINES[engine]
+        if pairing not in Scheduler.PAIRINGS:
+            raise ValueError(f"Unknown pairing '{pairing}', expected one of {list(Scheduler.PAIRINGS)}")
+        if strategy not in Scheduler.STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', expected one of {list(Scheduler.STRATEGIES)}")
 
-        # Load input data (teams, venues, leagues)
-        try:
-            team_df = pd.read_csv(input_teams)
-            venue_df = pd.read_csv(input_venues)
-            league_df = pd.read_csv(input_leagues)
-        except FileNotFoundError as e:
-            print(f"Error loading files for {case}: {e}")
-            return -1
+        run_started = time.perf_counter()
+
+        # Construct file paths
+        output_dir = output_dir or f"./data/{case}"
+        output_quarantine = f"{output_dir}/quarantine.csv"
+        output_schedule_csv = f"{output_dir}/schedule.csv"
+        output_schedule_json = f"{output_dir}/schedule.json"
+
+        # Load input data (teams, venues, leagues) as typed tables; invalid rows are set aside
+        with phase(profiler, "load"):
+            try:
+                inputs = load_case(case)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"Error loading files for {case}: {e}")
+                return -1
+            team_df, venue_df, league_df = inputs.team_df, inputs.venue_df, inputs.league_df
+            inputs.report.save(output_quarantine)
+            if len(inputs.report):
+                print(f"Quarantined {len(inputs.report)} invalid input values for {case}, see {output_quarantine}")
+
+        with phase(profiler, "catalogue"):
+            # Compile every candidate (week, day, start, venue, field) slot once for the whole run.
+            catalogue = SlotCatalogue(venue_df, Scheduler.GAME_DURATION)
+
+            # Team availability windows, used to prune every pair's slots before any overlap check
+            # (not enforced for the cases of AVAILABILITY_EXEMPT_CASES).
+            availability = TeamAvailability(team_df) if team_availability and case not in Scheduler.AVAILABILITY_EXEMPT_CASES else None
 
         # 'games' will store all scheduled matches
         games = []
-        # Interval trees to prevent field-time overlaps
-        field_interval_map = {}
-        # Interval trees to ensure teams don't have overlapping games
+        # Occupancy indexes to prevent field-time overlaps, one per physical (venueId, field)
+        # so every venue's fields are scheduled independently (created on first use of a field)
+        field_interval_map = defaultdict(index_class)
+        # Occupancy indexes to ensure teams don't have overlapping games
         team_interval_map = {}
         # Track how many times a team has played in a single day
         team_daily_count = {}
 
-        # Initialize interval trees for all teams
+        # Initialize occupancy indexes for all teams
         all_teams = team_df["name"].unique()
         for team in all_teams:
-            team_interval_map[team] = IntervalTree()
+            team_interval_map[team] = index_class()
+
+        # The matchups to schedule, league by league
+        with phase(profiler, "pairing"):
+            league_matchups = Scheduler.league_matchups(case, team_df, league_df, pairing)
+
+        unscheduled_count = 0
+
+        def report(event, **details):
+            if progress is not None:
+                progress({"event": event, "case": case, "games": len(games), "unscheduled": unscheduled_count, **details})
+
+        report("started", total_leagues=len(league_matchups),
+               matchups=sum(len(matchups) for _, matchups in league_matchups))
+
+        kept_placements = []
+        if warm_start:
+            with phase(profiler, "warm_start"):
+                kept_placements, league_matchups = Scheduler.warm_start_games(
+                    f"./data/{case}/schedule.csv", league_matchups, catalogue,
+                    field_interval_map, team_interval_map, team_daily_count, games, availability
+                )
+
+        # Local search starts from the greedy schedule
+        league_strategy = "greedy" if strategy == "local_search" else strategy
+
+        with phase(profiler, "scan"):
+            if workers > 1 and len(league_matchups) > 1:
+                placements = Scheduler.schedule_leagues_parallel(
+                    league_matchups, workers, venue_df, team_df, engine, availability is not None, league_strategy,
+                    catalogue, field_interval_map, team_interval_map, team_daily_count, games, availability, profiler
+                )
+                unscheduled_count = sum(slot is None for _, _, _, slot in placements)
+                report("league_done", league=None, leagues_done=len(league_matchups), total_leagues=len(league_matchups))
+            else:
+                placements = []
+                for leagues_done, (league_name, matchups) in enumerate(league_matchups, 1):
+                    # Attempt to schedule each matchup
+                    league_placements = Scheduler.schedule_league(
+                        league_name, matchups, league_strategy, catalogue,
+                        field_interval_map, team_interval_map, team_daily_count, games, availability, profiler=profiler
+                    )
+                    placements.extend((team1, team2, league_name, slot) for team1, team2, slot in league_placements)
+                    unscheduled_count += sum(slot is None for _, _, slot in league_placements)
+                    report("league_done", league=league_name, leagues_done=leagues_done, total_leagues=len(league_matchups))
+        placements = kept_placements + placements
+
+        if strategy == "local_search":
+            with phase(profiler, "local_search"):
+                # The budget covers the whole run, so the search only gets what the greedy pass left
+                search_budget = max(time_budget - (time.perf_counter() - run_started), 0.0)
+                placements = Scheduler.schedule_local_search(
+                    placements, search_budget, catalogue, field_interval_map, team_interval_map,
+                    team_daily_count, games, availability
+                )
+            unscheduled_count = sum(slot is None for _, _, _, slot in placements)
+            report("local_search_done")
+
+        if profiler is not None:
+            profiler.record_occupancy(field_interval_map, team_interval_map)
+
+        for team1, team2, league_name, slot in placements:
+            # If a game couldn't be scheduled, note it (not necessarily an error)
+            if slot is None:
+                print(f"Could not schedule game between {team1} and {team2} for {league_name}")
+
+        # After all leagues processed, save the final schedule
+        with phase(profiler, "save"):
+            Scheduler.save_schedule(games, output_schedule_csv, output_schedule_json)
+        print(f"Schedule for {case} successfully saved to {output_schedule_csv} and {output_schedule_json}.")
+        report("finished")
+        return 0
+
+    @staticmethod
+    def league_matchups(case, team_df, league_df, pairing="round_robin"):
+        """
+        Builds the list of matchups to schedule for every league of a case.
+
+        With round-robin pairing the matchups come round by round, so truncating them to the
+        league's game limit keeps the number of games per team balanced.
+
+        Parameters:
+            case (str): The case being scheduled (cases 1-4 have fixed game limits).
+            team_df (DataFrame): Team data.
+            league_df (DataFrame): League data.
+            pairing (str): "round_robin" or "combinations" (see Scheduler.run).
+
+        Returns:
+            list: (league_name, [(team1, team2, round_number), ...]) for every league, in team.csv
+                order. round_number is None for "combinations" pairing.
+        """
+        league_matchups = []
 
         # Check if numberOfGames column exists in leagues
         has_number_of_games = 'numberOfGames' in league_df.columns
@@ -63,7 +239,12 @@ class Scheduler:
         for league_id in league_ids:
             teams_in_league = team_df[team_df["leagueId"] == league_id]
             # Generate all unique team pairs (matchups)
-            team_combinations = list(combinations(teams_in_league["name"], 2))
+            if pairing == "round_robin":
+                rounds = round_robin_rounds(teams_in_league["name"])
+                team_combinations = [(team1, team2, round_number)
+                                     for round_number, matchups in enumerate(rounds) for team1, team2 in matchups]
+            else:
+                team_combinations = [(team1, team2, None) for team1, team2 in combinations(teams_in_league["name"], 2)]
             league_name = league_df[league_df["leagueId"] == league_id]["leagueName"].iloc[0]
 
             # Determine game_limit based on the case
@@ -95,192 +276,506 @@ class Scheduler:
                     game_limit = len(team_combinations)
 
             # Trim the team combinations to the determined game_limit
-            team_combinations = team_combinations[:game_limit]
+            league_matchups.append((league_name, team_combinations[:game_limit]))
 
-            # Attempt to schedule each matchup
-            for team1, team2 in team_combinations:
-                scheduled = Scheduler.schedule_team_pair(
-                    team1, team2, league_name, venue_df,
-                    field_interval_map, team_interval_map, team_daily_count, games, case
-                )
-                if not scheduled:
-                    # If a game couldn't be scheduled, note it (not necessarily an error)
-                    print(f"Could not schedule game between {team1} and {team2} for {league_name}")
+        return league_matchups
 
-        # After all leagues processed, save the final schedule
-        Scheduler.save_schedule(games, output_schedule_csv, output_schedule_json)
-        print(f"Schedule for {case} successfully saved to {output_schedule_csv} and {output_schedule_json}.")
-        return 0
+    @staticmethod
+    def warm_start_games(schedule_csv, league_matchups, catalogue, field_interval_map, team_interval_map,
+                         team_daily_count, games, availability=None):
+        """
+        Re-books the still-valid games of a previous schedule and returns the matchups left to schedule.
+
+        A previous game is kept only if, against the current inputs:
+        - its league still has a matchup between its two teams that no other kept game covers,
+        - its slot is still in the slot catalogue (venue field, venue day window and season),
+        - it fits both teams' availability windows (when given),
+        - it does not overlap a game kept before it, nor break the once-per-day rule.
+        Kept games are booked in the order of the previous file through try_schedule_game.
+
+        Parameters:
+            schedule_csv (str): Path of the previous schedule (a missing or empty file keeps nothing).
+            league_matchups (list): (league_name, matchups) for every league (see league_matchups).
+            catalogue, field_interval_map, team_interval_map, team_daily_count, games, availability:
+                The scheduling state the kept games are booked into.
+
+        Returns:
+            tuple: (kept, remaining): (team1, team2, league_name, slot) of every kept game, and
+                league_matchups without the matchups the kept games cover.
+        """
+        try:
+            previous_df = read_schedule(schedule_csv)
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            previous_df = pd.DataFrame()
+        required = ["team1Name", "team2Name", "week", "day", "start", "end", "season", "league", "location"]
+        if previous_df.empty or not set(required) <= set(previous_df.columns):
+            return [], league_matchups
+
+        # Open matchups by (league, unordered team pair), with their position in the league's list
+        open_matchups = defaultdict(list)
+        for league_name, matchups in league_matchups:
+            for position, (team1, team2, _) in enumerate(matchups):
+                open_matchups[(league_name, frozenset((team1, team2)))].append(position)
+
+        # Venue rows by the location and season written in the schedule
+        venue_rows = {}
+        for venue, (name, season, (_, field)) in enumerate(zip(catalogue.venue_names, catalogue.venue_seasons,
+                                                                catalogue.venue_resources)):
+            venue_rows.setdefault((f"{name} Field #{field}", season), (venue, field))
+
+        kept = []
+        covered = set()
+        for team1, team2, week, day, start, end, season, league_name, location in previous_df[required].itertuples(index=False):
+            positions = open_matchups.get((league_name, frozenset((team1, team2))))
+            venue_field = venue_rows.get((location, season))
+            if not positions or venue_field is None:
+                continue
+            slot = (week, day, start, end, *venue_field)
+            try:
+                row = catalogue.row(slot)
+            except KeyError:
+                continue
+            slot = catalogue.slot(row)
+            if availability is not None and not availability.feasible_mask(team1, team2, catalogue)[row]:
+                continue
+            if not Scheduler.try_schedule_game(team1, team2, league_name, slot, catalogue,
+                                               field_interval_map, team_interval_map, team_daily_count, games):
+                continue
+            covered.add((league_name, positions.pop(0)))
+            kept.append((team1, team2, league_name, slot))
+
+        remaining = [(league_name, [matchup for position, matchup in enumerate(matchups)
+                                    if (league_name, position) not in covered])
+                     for league_name, matchups in league_matchups]
+        print(f"Warm start: kept {len(kept)} of {len(previous_df)} games from {schedule_csv}")
+        return kept, remaining
 
     @staticmethod
-    def schedule_team_pair(team1, team2, league_name, venue_df, field_interval_map, team_interval_map, team_daily_count, games, case):
+    def schedule_leagues_parallel(league_matchups, workers, venue_df, team_df, engine, honour_availability, strategy,
+                                  catalogue, field_interval_map, team_interval_map, team_daily_count, games, availability,
+                                  profiler=None):
         """
-        Attempts to schedule a single matchup (team1 vs team2).
+        Schedules every league in its own worker process, then merges the results.
 
-        Iterates over all weeks (1–52) and days (1–7), and tries each venue.
-        If 'try_schedule_game' finds a suitable slot, it returns True.
+        Leagues only share venues, so venue capacity is partitioned: venue field rows are dealt
+        round-robin to the leagues, and each worker schedules its league on its own share only,
+        which keeps the workers from claiming the same slots. The merge stage then replays the
+        leagues in order against the shared occupancy indexes, and every matchup a worker could not
+        place in its share (or that collides on merge) is repaired by scheduling it again, one by
+        one, against the full merged capacity. The merged schedule therefore satisfies the same
+        overlap constraints as a sequential run.
 
         Parameters:
-            team1, team2 (str): Names of the teams playing.
-            league_name (str): The league's name.
-            venue_df (DataFrame): Venue data.
-            field_interval_map (dict): Field -> IntervalTree for fields.
-            team_interval_map (dict): Team -> IntervalTree for team schedules.
-            team_daily_count (dict): Tracks how many games each team plays per day.
-            games (list): Global list of scheduled games.
-            case (str): The case being scheduled.
+            league_matchups (list): (league_name, matchups) for every league (see league_matchups).
+            workers (int): Number of worker processes.
+            venue_df, team_df (DataFrame): Input data, used to set up each worker.
+            engine (str): Occupancy engine name.
+            honour_availability (bool): Whether the workers honour team availability windows.
+            strategy (str): Strategy the workers schedule their league with.
+            catalogue, field_interval_map, team_interval_map, team_daily_count, games, availability:
+                The shared scheduling state the leagues are merged into.
+            profiler (Profiler): Optional profiler counting the merge and repair probes.
 
         Returns:
-            bool: True if the game was scheduled, False otherwise.
+            list: (team1, team2, league_name, slot) for every matchup, slot being None if it could not be scheduled.
         """
-        for week in range(1, 53):
-            for day in range(1, 8):
-                # Check each venue to find a slot
-                for _, venue_row in venue_df.iterrows():
-                    if not Scheduler.is_within_season(week, venue_row):
-                        continue
-
-                    if Scheduler.try_schedule_game(team1, team2, league_name, week, day, venue_row,
-                                                   field_interval_map, team_interval_map, team_daily_count, case, games):
-                        return True
-        return False
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_league_worker,
+                                 initargs=(venue_df, team_df, engine, honour_availability)) as executor:
+            futures = [executor.submit(_schedule_league_worker, league_name, matchups, strategy,
+                                       position, len(league_matchups))
+                       for position, (league_name, matchups) in enumerate(league_matchups)]
+
+            placements = []
+            repairs = []
+            for (league_name, _), future in zip(league_matchups, futures):
+                for team1, team2, slot in future.result():
+                    if slot is None or not Scheduler.try_schedule_game(
+                            team1, team2, league_name, slot, catalogue,
+                            field_interval_map, team_interval_map, team_daily_count, games, profiler):
+                        repairs.append((team1, team2, league_name))
+                    else:
+                        placements.append((team1, team2, league_name, slot))
+
+        # Repair: place the games that did not fit in their league's share of the venues
+        for team1, team2, league_name in repairs:
+            slot = Scheduler.schedule_team_pair(team1, team2, league_name, catalogue, field_interval_map,
+                                                team_interval_map, team_daily_count, games, availability,
+                                                profiler=profiler)
+            placements.append((team1, team2, league_name, slot))
+        return placements
 
     @staticmethod
-    def is_within_season(week, venue_row):
+    def schedule_local_search(placements, time_budget, catalogue, field_interval_map, team_interval_map,
+                              team_daily_count, games, availability=None):
         """
-        Checks if the given week falls within the venue's available season.
+        Improves a schedule with a time-bounded local search over all leagues at once.
+
+        The current placements are the starting point of a LocalSearchSolver, which looks for a
+        conflict-free assignment with fewer unscheduled games by moving games between slots. The
+        scheduling state is then rebuilt from the best assignment found, so the result goes
+        through the same try_schedule_game checks as any other strategy.
+
+        Parameters:
+            placements (list): (team1, team2, league_name, slot) for every matchup, slot being None if unscheduled.
+            time_budget (float): Seconds the search may run for.
+            catalogue, field_interval_map, team_interval_map, team_daily_count, games, availability:
+                The scheduling state holding the placements; it is rebuilt in place.
+
+        Returns:
+            list: (team1, team2, league_name, slot) for every matchup, slot being None if it could not be scheduled.
         """
-        return venue_row["seasonStart"] <= week <= venue_row["seasonEnd"]
+        matchups = [(team1, team2, league_name, catalogue.row(slot) if slot is not None else None)
+                    for team1, team2, league_name, slot in placements]
+        assignment = LocalSearchSolver(matchups, catalogue, availability).solve(time_budget)
+
+        # Rebuild the scheduling state from the best assignment
+        games.clear()
+        field_interval_map.clear()
+        team_daily_count.clear()
+        index_class = field_interval_map.default_factory
+        for team in team_interval_map:
+            team_interval_map[team] = index_class()
+
+        improved = []
+        for (team1, team2, league_name, _), row in zip(matchups, assignment):
+            slot = catalogue.slot(row) if row is not None else None
+            if slot is not None and not Scheduler.try_schedule_game(
+                    team1, team2, league_name, slot, catalogue,
+                    field_interval_map, team_interval_map, team_daily_count, games):
+                slot = None
+            improved.append((team1, team2, league_name, slot))
+        return improved
 
     @staticmethod
-    def try_schedule_game(team1, team2, league_name, week, day, venue_row,
-                          field_interval_map, team_interval_map, team_daily_count, case, games):
+    def schedule_league(league_name, matchups, strategy, catalogue, field_interval_map, team_interval_map,
+                        team_daily_count, games, availability=None, share=None, profiler=None):
         """
-        Attempts to schedule a single game (team1 vs team2) on a particular day and week at a specific venue.
-
-        Steps:
-        - Determine number of fields (if case3, only 1 field).
-        - Iterate through possible 2-hour slots in the venue's daily availability.
-        - For each slot, check:
-          * If either team already played that day (once-per-day rule)
-          * Field availability (no overlaps)
-          * Team availability (no overlaps)
-        - If all checks pass, schedule the game, update daily counts and interval trees, and return True.
-        - If no slot found, return False.
+        Schedules the matchups of one league with the given strategy.
 
         Parameters:
-            team1, team2 (str): Team names.
-            league_name (str): Name of the league.
-            week, day (int): The week and day indices.
-            venue_row (Series): One row of venue data including field count and day availability.
-            field_interval_map, team_interval_map: Data structures to check overlaps.
-            team_daily_count: Dictionary to enforce once-per-day constraint.
-            case (str): Current case id.
-            games (list): Global games list.
+            league_name (str): The league's name.
+            matchups (list): (team1, team2, round_number) of every matchup (see league_matchups).
+            strategy (str): "greedy" or "matching" (see Scheduler.run).
+            catalogue, field_interval_map, team_interval_map, team_daily_count, games, availability, share, profiler:
+                See schedule_team_pair.
 
         Returns:
-            bool: True if scheduled successfully, False otherwise.
+            list: (team1, team2, slot) for every matchup, slot being None if it could not be scheduled.
         """
+        if strategy == "matching":
+            return Scheduler.schedule_rounds_matching(
+                league_name, matchups, catalogue, field_interval_map, team_interval_map,
+                team_daily_count, games, availability, share, profiler
+            )
+
+        placements = []
+        for team1, team2, round_number in matchups:
+            slot = Scheduler.schedule_team_pair(
+                team1, team2, league_name, catalogue,
+                field_interval_map, team_interval_map, team_daily_count, games, availability, share, round_number,
+                profiler
+            )
+            placements.append((team1, team2, slot))
+        return placements
 
-        # Case 3 only has 1 field, otherwise use the venue's field count
-        fields_available = int(venue_row["field"]) if case != "case3" else 1
-
-        venue_start = venue_row[f"d{day}Start"]
-        venue_end = venue_row[f"d{day}End"]
-
-        # Iterate over possible slots (each GAME_DURATION hours long)
-        current_start = venue_start
-        while current_start + Scheduler.GAME_DURATION <= venue_end:
-            game_start = current_start
-            game_end = game_start + Scheduler.GAME_DURATION
-            interval = Interval(start=game_start, end=game_end, day=day, week=week)
-
-            # Check daily limit for both teams (once-per-day)
-            season = venue_row["seasonYear"]
-            t1_key = (team1, season, week, day)
-            t2_key = (team2, season, week, day)
-            if team_daily_count.get(t1_key, 0) >= 1 or team_daily_count.get(t2_key, 0) >= 1:
-                # One or both teams have played already today, skip this slot
-                current_start += Scheduler.GAME_DURATION
-                continue
+    @staticmethod
+    def schedule_rounds_matching(league_name, matchups, catalogue, field_interval_map, team_interval_map,
+                                 team_daily_count, games, availability=None, share=None, profiler=None):
+        """
+        Assigns every round of a league to slots in one shot with a maximum bipartite matching.
 
-            scheduled = False
-            # Try each field
-            for field_id in range(1, fields_available + 1):
-                if field_id not in field_interval_map:
-                    field_interval_map[field_id] = IntervalTree()
+        The matchups of a round are the left vertices, and the free slots of one week are the right
+        vertices. A matchup is linked to every free slot that fits both teams' availability on a
+        day neither team plays yet. Hopcroft-Karp then places as many matchups of the round as the
+        week allows, where first-fit could block a matchup by taking its only slot. Unplaced matchups
+        move on to the next week, starting from the week the round maps to and wrapping around.
+        Matchups without a round (combinations pairing) are matched one at a time.
 
-                field_tree = field_interval_map[field_id]
+        Parameters:
+            See schedule_league.
 
-                # Check if field is free
-                if field_tree.overlap(interval):
-                    # Field is taken at this time, try next field
+        Returns:
+            list: (team1, team2, slot) for every matchup, slot being None if it could not be scheduled.
+        """
+        # Group the matchups by round, keeping their order
+        rounds = {}
+        for position, (team1, team2, round_number) in enumerate(matchups):
+            rounds.setdefault(round_number if round_number is not None else ("single", position), []).append(position)
+
+        slots = [None] * len(matchups)
+        week_count = len(catalogue.week_rows)
+        for round_key, pending in rounds.items():
+            first_week = round_key % week_count if isinstance(round_key, int) and week_count else 0
+            feasible = {}
+            for position in pending:
+                team1, team2, _ = matchups[position]
+                mask = availability.feasible_mask(team1, team2, catalogue) if availability is not None \
+                    else np.ones(len(catalogue), dtype=bool)
+                feasible[position] = mask if share is None else mask & share
+
+            for offset in range(week_count):
+                if not pending:
+                    break
+                week = catalogue.week_slice((first_week + offset) % week_count)
+
+                # Right vertices: slots of the week that suit at least one pending matchup and whose field is free
+                candidates = np.zeros(week.stop - week.start, dtype=bool)
+                for position in pending:
+                    candidates |= feasible[position][week]
+                free_rows = []
+                for row in (np.flatnonzero(candidates) + week.start).tolist():
+                    slot_week, day, start, end, venue, _ = catalogue.slot(row)
+                    season = catalogue.venue_seasons[venue]
+                    interval = Interval(start=start, end=end, day=day, week=slot_week, season=season)
+                    if profiler is not None:
+                        profiler.count("field_probes")
+                    if not field_interval_map[catalogue.venue_resources[venue]].any_overlap(interval):
+                        free_rows.append(row)
+                if not free_rows:
                     continue
+                free_rows = np.array(free_rows)
+
+                # Edges: free slots that fit the pair, on days neither team has played yet
+                adjacency = []
+                for position in pending:
+                    team1, team2, _ = matchups[position]
+                    edges = []
+                    for right in np.flatnonzero(feasible[position][free_rows]).tolist():
+                        row = free_rows[right]
+                        season = catalogue.venue_seasons[catalogue.venues[row]]
+                        day_keys = ((team, season, int(catalogue.weeks[row]), int(catalogue.days[row])) for team in (team1, team2))
+                        if all(team_daily_count.get(key, 0) == 0 for key in day_keys):
+                            edges.append(right)
+                    adjacency.append(edges)
+
+                matching = hopcroft_karp(adjacency, len(free_rows))
+
+                still_pending = []
+                for position, right in zip(pending, matching):
+                    team1, team2, _ = matchups[position]
+                    slot = catalogue.slot(int(free_rows[right])) if right != UNMATCHED else None
+                    if slot is not None and Scheduler.try_schedule_game(
+                            team1, team2, league_name, slot, catalogue,
+                            field_interval_map, team_interval_map, team_daily_count, games, profiler):
+                        slots[position] = slot
+                    else:
+                        still_pending.append(position)
+                pending = still_pending
 
-                # Check if teams are free
-                if team_interval_map[team1].overlap(interval) or team_interval_map[team2].overlap(interval):
-                    # One or both teams already playing at this time
-                    continue
+        return [(team1, team2, slot) for (team1, team2, _), slot in zip(matchups, slots)]
+
+    @staticmethod
+    def schedule_team_pair(team1, team2, league_name, catalogue, field_interval_map, team_interval_map, team_daily_count, games,
+                           availability=None, share=None, round_number=None, profiler=None):
+        """
+        Attempts to schedule a single matchup (team1 vs team2).
+
+        Walks the slot catalogue in order (week, day, venue field, start time) and takes the
+        first slot where 'try_schedule_game' succeeds. When team availability is given, slots
+        outside either team's windows are pruned up front and never probed. When the matchup
+        belongs to a round, the walk starts at the week the round maps to and wraps around.
+
+        Parameters:
+            team1, team2 (str): Names of the teams playing.
+            league_name (str): The league's name.
+            catalogue (SlotCatalogue): Every candidate slot of the run.
+            field_interval_map (defaultdict): (venueId, field) -> occupancy index for fields.
+            team_interval_map (dict): Team -> occupancy index for team schedules.
+            team_daily_count (dict): Tracks how many games each team plays per day.
+            games (list): Global list of scheduled games.
+            availability (TeamAvailability): Optional team availability windows to honour.
+            share (ndarray): Optional boolean mask of the catalogue slots the pair may use.
+            round_number (int): Optional round of the matchup (see SlotCatalogue.round_start_row).
+            profiler (Profiler): Optional profiler recording every slot tried (see try_schedule_game).
 
-                # All checks passed, schedule the game
-                field_tree.insert(interval)
-                team_interval_map[team1].insert(interval)
-                team_interval_map[team2].insert(interval)
-
-                # Increment daily count for these teams
-                team_daily_count[t1_key] = team_daily_count.get(t1_key, 0) + 1
-                team_daily_count[t2_key] = team_daily_count.get(t2_key, 0) + 1
-
-                # Add game to the global list
-                games.append({
-                    "team1Name": team1,
-                    "team2Name": team2,
-                    "week": week,
-                    "day": day,
-                    "start": game_start,
-                    "end": game_end,
-                    "season": venue_row["seasonYear"],
-                    "league": league_name,
-                    "location": f"{venue_row['name']} Field #{field_id}",
-                })
-                scheduled = True
-                break
-
-            if scheduled:
-                return True
-
-            current_start += Scheduler.GAME_DURATION
-        return False
+        Returns:
+            tuple: The catalogue slot the game was scheduled in, or None if no slot was found.
+        """
+        rows = availability.feasible_rows(team1, team2, catalogue) if availability is not None else None
+        if share is not None:
+            rows = np.flatnonzero(share) if rows is None else rows[share[rows]]
+        if round_number is not None:
+            if rows is None:
+                rows = np.arange(len(catalogue))
+            split = np.searchsorted(rows, catalogue.round_start_row(round_number))
+            rows = np.concatenate((rows[split:], rows[:split]))
+        for slot in catalogue.slots(rows):
+            if Scheduler.try_schedule_game(team1, team2, league_name, slot, catalogue,
+                                           field_interval_map, team_interval_map, team_daily_count, games, profiler):
+                return slot
+        return None
+
+    @staticmethod
+    def try_schedule_game(team1, team2, league_name, slot, catalogue,
+                          field_interval_map, team_interval_map, team_daily_count, games, profiler=None):
+        """
+        Attempts to schedule a single game (team1 vs team2) in one slot of the catalogue.
+
+        Checks:
+        - If either team already played that day (once-per-day rule)
+        - Field availability (no overlaps)
+        - Team availability (no overlaps)
+        If all checks pass, schedule the game, update daily counts and occupancy indexes, and return True.
+
+        Parameters:
+            team1, team2 (str): Team names.
+            league_name (str): Name of the league.
+            slot (tuple): A (week, day, start, end, venue, field) entry of the catalogue.
+            catalogue (SlotCatalogue): The catalogue the slot comes from (for venue names and seasons).
+            field_interval_map, team_interval_map: Occupancy indexes to check overlaps
+                (field_interval_map creates an index for a field on first access).
+            team_daily_count: Dictionary to enforce once-per-day constraint.
+            games (list): Global games list.
+            profiler (Profiler): Optional profiler recording the outcome of the attempt.
+
+        Returns:
+            bool: True if scheduled successfully, False otherwise.
+        """
+        week, day, game_start, game_end, venue, field_id = slot
+        season = catalogue.venue_seasons[venue]
+
+        # Check daily limit for both teams (once-per-day)
+        t1_key = (team1, season, week, day)
+        t2_key = (team2, season, week, day)
+        if team_daily_count.get(t1_key, 0) >= 1 or team_daily_count.get(t2_key, 0) >= 1:
+            # One or both teams have played already today
+            if profiler is not None:
+                profiler.attempt("daily_limit")
+            return False
+
+        interval = Interval(start=game_start, end=game_end, day=day, week=week, season=season)
+
+        # Check if field is free
+        field_tree = field_interval_map[catalogue.venue_resources[venue]]
+        if field_tree.any_overlap(interval):
+            if profiler is not None:
+                profiler.attempt("field_busy")
+            return False
+
+        # Check if teams are free
+        if team_interval_map[team1].any_overlap(interval) or team_interval_map[team2].any_overlap(interval):
+            if profiler is not None:
+                profiler.attempt("team_busy")
+            return False
+
+        # All checks passed, schedule the game
+        field_tree.insert(interval)
+        team_interval_map[team1].insert(interval)
+        team_interval_map[team2].insert(interval)
+
+        # Increment daily count for these teams
+        team_daily_count[t1_key] = team_daily_count.get(t1_key, 0) + 1
+        team_daily_count[t2_key] = team_daily_count.get(t2_key, 0) + 1
+
+        if profiler is not None:
+            profiler.attempt("scheduled")
+
+        # Add game to the global list
+        games.append({
+            "team1Name": team1,
+            "team2Name": team2,
+            "week": week,
+            "day": day,
+            "start": game_start,
+            "end": game_end,
+            "season": season,
+            "league": league_name,
+            "location": f"{catalogue.venue_names[venue]} Field #{field_id}",
+        })
+        return True
 
     @staticmethod
     def save_schedule(games, csv_path, json_path):
         """
-        Saves the final scheduled games to CSV and JSON.
+        Saves the final scheduled games to CSV and JSON, plus a columnar binary copy next to the CSV
+        (Parquet with pyarrow, otherwise .npz, see core.py.columnar) for fast loading.
 
         - If no games were scheduled, writes empty files.
         - Sorts games by season, week, day, start time before saving.
+        - Every file is written to a temporary file and moved into place (see columnar.atomic_path),
+          so concurrent readers never see a partly written schedule.
         """
         if not games:
             print("No games were scheduled.")
-            pd.DataFrame([]).to_csv(csv_path, index=False)
-            pd.DataFrame([]).to_json(json_path, orient="records", indent=2)
-            return
-
-        schedule_df = pd.DataFrame(games)
-        # Sort by season, week, day, start for chronological order
-        schedule_df = schedule_df.sort_values(by=["season", "week", "day", "start"])
-        schedule_df.to_csv(csv_path, index=False)
-        schedule_df.to_json(json_path, orient="records", indent=2)
+            schedule_df = pd.DataFrame([])
+        else:
+            schedule_df = pd.DataFrame(games)
+            # Sort by season, week, day, start for chronological order
+            schedule_df = schedule_df.sort_values(by=["season", "week", "day", "start"])
+        with atomic_path(csv_path) as temporary:
+            schedule_df.to_csv(temporary, index=False)
+        with atomic_path(json_path) as temporary:
+            schedule_df.to_json(temporary, orient="records", indent=2)
+        # Written last, so it is never older than the CSV it mirrors (see columnar.read_schedule)
+        save_columnar(schedule_df, columnar_path(csv_path))
+
+
+# Per-process state of the parallel league workers, set up once by _init_league_worker
+_worker_context = {}
+
+
+def _init_league_worker(venue_df, team_df, engine, honour_availability):
+    """
+    Builds the slot catalogue and availability matrix once in a league worker process.
+    """
+    _worker_context["catalogue"] = SlotCatalogue(venue_df, Scheduler.GAME_DURATION)
+    _worker_context["availability"] = TeamAvailability(team_df) if honour_availability else None
+    _worker_context["index_class"] = Scheduler.ENGINES[engine]
+
+
+def _schedule_league_worker(league_name, matchups, strategy, position, league_count):
+    """
+    Schedules one league on its share of the venue fields in a worker process.
+
+    The league at 'position' owns the venue rows whose index is position modulo league_count.
+
+    Returns:
+        list: (team1, team2, slot) for every matchup, slot being None if it could not be scheduled.
+    """
+    catalogue = _worker_context["catalogue"]
+    share = catalogue.venues % league_count == position
+    index_class = _worker_context["index_class"]
+    field_interval_map = defaultdict(index_class)
+    team_interval_map = defaultdict(index_class)
+    team_daily_count = {}
+    games = []
+
+    return Scheduler.schedule_league(
+        league_name, matchups, strategy, catalogue, field_interval_map, team_interval_map,
+        team_daily_count, games, _worker_context["availability"], share
+    )
 
 
 if __name__ == "__main__":
-    # Run all cases to produce schedules
-    Scheduler.run("case1")
-    Scheduler.run("case2")
-    Scheduler.run("case3")
-    Scheduler.run("case4")
-    Scheduler.run("case5")
-    Scheduler.run("case6")
-    Scheduler.run("case7")
-    Scheduler.run("case8")
-    Scheduler.run("generated")
+    parser = argparse.ArgumentParser(description="Schedule games for one or more cases.")
+    parser.add_argument("cases", nargs="*", help="Cases to schedule (default: every case)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes used to schedule leagues in parallel")
+    parser.add_argument("--engine", choices=sorted(Scheduler.ENGINES), default="tree", help="Occupancy engine")
+    parser.add_argument("--pairing", choices=Scheduler.PAIRINGS, default="round_robin", help="Matchup generator")
+    parser.add_argument("--strategy", choices=Scheduler.STRATEGIES, default="greedy", help="Slot assignment strategy")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="Keep the still-valid games of the previous schedule.csv and only schedule the rest")
+    parser.add_argument("--time-budget", type=float, default=5.0,
+                        help="Seconds a local_search run may take, greedy pass included")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print the phase timings and hot-path counters of every run, and the functions cProfile spent the most time in")
+    parser.add_argument("--pstats", metavar="PATH",
+                        help="With --profile, also dump the cProfile statistics to PATH ('{case}' is replaced by the case)")
+    args = parser.parse_args()
+
+    # Run all cases to produce schedules unless specific cases are given
+    cases = args.cases or ["case1", "case2", "case3", "case4", "case5", "case6", "case7", "case8", "generated"]
+    for case in cases:
+        options = dict(engine=args.engine, workers=args.workers, pairing=args.pairing, strategy=args.strategy,
+                       time_budget=args.time_budget, warm_start=args.warm_start)
+        if not args.profile:
+            Scheduler.run(case, **options)
+            continue
+
+        profiler = Profiler()
+        with cProfile.Profile() as c_profile:
+            Scheduler.run(case, profiler=profiler, **options)
+        print(json.dumps({"case": case, **profiler.report()}, indent=2))
+        pstats.Stats(c_profile).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(20)
+        if args.pstats:
+            c_profile.dump_stats(args.pstats.replace("{case}", case))
@@ -0,0 +1,177 @@
+import numpy as np
+from core.py.occupancy import SLOTS_PER_DAY, day_window_bits
+
+
+def grouped_arange(counts):
+    """
+    Concatenate arange(count) for every count, e.g. [2, 3] -> [0, 1, 0, 1, 2].
+
+    Parameters:
+    - counts: A 1-D integer array of group sizes.
+
+    Returns:
+    - A 1-D integer array with the position of every element inside its group.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.arange(counts.sum(), dtype=np.int64) - offsets
+
+
+class SlotCatalogue:
+    """
+    Every candidate game slot of a run, compiled once from the venue data.
+
+    Every row of venue.csv describes one field of a venue. The catalogue is a set of flat,
+    parallel arrays with one entry per (week, day, start, end, venue, field) slot. Weeks outside
+    a venue's season are filtered out, and the entries are sorted in the order the Scheduler
+    searches them: week, day, venue row and start time.
+
+    Attributes:
+    - weeks, days, starts, ends, venues, fields: The slot arrays (venues holds the venue row index).
+    - slot_bits: The half-hour slots of its day that each game slot covers, as a bitmask.
+    - key_days, key_bits, slot_keys: Every distinct (day, slot_bits) pair, and the index of each
+      slot's pair, so a day mask can be tested once per distinct pair instead of once per slot.
+    - week_values, week_rows: The distinct weeks of the catalogue and the first row of each.
+    - venue_names, venue_seasons: Name and season year of every venue row, indexed by venue.
+    - venue_resources: The (venueId, field) key of every venue row, identifying the physical field.
+    """
+    def __init__(self, venue_df, game_duration):
+        """
+        Compile the slot catalogue from the venue data.
+
+        Parameters:
+        - venue_df (DataFrame): Venue data with d{day}Start/d{day}End, field and season columns.
+        - game_duration: Length of a game in hours; slots are laid back to back from the day start.
+        """
+        # Slot times are derived from the day start times: keep them as ints when those are all whole
+        # hours, so the saved schedule is formatted like the venue data (whatever dtype they were loaded as).
+        all_day_starts = venue_df[[f"d{day}Start" for day in range(1, 8)]].to_numpy(dtype=np.float64)
+        time_dtype = np.int64 if np.all(all_day_starts % 1 == 0) else np.float64
+
+        venue_fields = venue_df["field"].to_numpy().astype(np.int64)
+        first_weeks = np.maximum(venue_df["seasonStart"].to_numpy().astype(np.int64), 1)
+        last_weeks = np.minimum(venue_df["seasonEnd"].to_numpy().astype(np.int64), 52)
+        week_counts = np.maximum(last_weeks - first_weeks + 1, 0)
+
+        # One entry per (venue, day, slot of the day).
+        day_parts = []
+        for day in range(1, 8):
+            day_starts = venue_df[f"d{day}Start"].to_numpy().astype(time_dtype)
+            day_ends = venue_df[f"d{day}End"].to_numpy()
+            slot_counts = np.maximum(np.floor((day_ends - day_starts) / game_duration), 0).astype(np.int64)
+            venues = np.repeat(np.arange(len(venue_df)), slot_counts)
+            starts = day_starts[venues] + grouped_arange(slot_counts) * game_duration
+            day_parts.append((np.full(len(venues), day), venues, starts))
+        days = np.concatenate([part[0] for part in day_parts])
+        venues = np.concatenate([part[1] for part in day_parts])
+        starts = np.concatenate([part[2] for part in day_parts]).astype(time_dtype)
+
+        # Expand every slot to each week of the venue season.
+        slot_rows = np.repeat(np.arange(len(venues)), week_counts[venues])
+        weeks = grouped_arange(week_counts[venues]) + first_weeks[venues[slot_rows]]
+        days, venues, starts = days[slot_rows], venues[slot_rows], starts[slot_rows]
+        fields = venue_fields[venues]
+
+        order = np.lexsort((starts, venues, days, weeks))
+        self.weeks = weeks[order]
+        self.days = days[order]
+        self.starts = starts[order]
+        self.ends = self.starts + game_duration
+        self.venues = venues[order]
+        self.fields = fields[order]
+        self.slot_bits = day_window_bits(self.starts, self.ends, inwards=False)
+
+        day_shift = np.uint64(SLOTS_PER_DAY)
+        keys, self.slot_keys = np.unique((self.days.astype(np.uint64) << day_shift) | self.slot_bits,
+                                         return_inverse=True)
+        self.key_days = (keys >> day_shift).astype(np.int64)
+        self.key_bits = keys & np.uint64((1 << SLOTS_PER_DAY) - 1)
+        self.week_values, self.week_rows = np.unique(self.weeks, return_index=True)
+
+        self.venue_names = venue_df["name"].tolist()
+        self.venue_seasons = venue_df["seasonYear"].tolist()
+        self.venue_resources = list(zip(venue_df["venueId"].tolist(), venue_df["field"].tolist()))
+
+        # Plain Python copies of the columns, converted once so iterating never touches NumPy scalars.
+        self._columns = (self.weeks.tolist(), self.days.tolist(), self.starts.tolist(), self.ends.tolist(),
+                         self.venues.tolist(), self.fields.tolist())
+        # Slot -> row lookup, built on first use of row()
+        self._rows = None
+
+    def __len__(self):
+        """Return the number of slots in the catalogue."""
+        return len(self.weeks)
+
+    def round_start_row(self, round_number):
+        """
+        Return the first row of the week a round of matchups maps to.
+
+        Round r maps to the r-th week that has slots, wrapping around the season when there
+        are more rounds than weeks.
+
+        Parameters:
+        - round_number (int): The round, starting at 0.
+
+        Returns:
+        - A catalogue row (0 if the catalogue is empty).
+        """
+        if not len(self.week_rows):
+            return 0
+        return int(self.week_rows[round_number % len(self.week_rows)])
+
+    def week_slice(self, position):
+        """
+        Return the catalogue rows of the position-th week that has slots.
+
+        Parameters:
+        - position (int): Index into week_values.
+
+        Returns:
+        - A slice of catalogue rows.
+        """
+        end = self.week_rows[position + 1] if position + 1 < len(self.week_rows) else len(self)
+        return slice(int(self.week_rows[position]), int(end))
+
+    def slot(self, row):
+        """
+        Return one catalogue entry.
+
+        Parameters:
+        - row (int): The catalogue row.
+
+        Returns:
+        - A (week, day, start, end, venue, field) tuple of plain Python values.
+        """
+        return tuple(column[row] for column in self._columns)
+
+    def row(self, slot):
+        """
+        Return the catalogue row of a slot (the inverse of slot).
+
+        Parameters:
+        - slot (tuple): A (week, day, start, end, venue, field) entry of the catalogue.
+
+        Returns:
+        - The catalogue row.
+
+        Raises:
+        - KeyError: If the slot is not in the catalogue.
+        """
+        if self._rows is None:
+            self._rows = {entry: row for row, entry in enumerate(self.slots())}
+        return self._rows[tuple(slot)]
+
+    def slots(self, rows=None):
+        """
+        Iterate over the catalogue in search order.
+
+        Parameters:
+        - rows: Optional increasing array of catalogue rows to restrict the iteration to.
+
+        Returns:
+        - An iterator of (week, day, start, end, venue, field) tuples of plain Python values.
+        """
+        if rows is None:
+            return zip(*self._columns)
+        weeks, days, starts, ends, venues, fields = self._columns
+        return ((weeks[row], days[row], starts[row], ends[row], venues[row], fields[row]) for row in rows.tolist())
@@ -0,0 +1,228 @@
+import numpy as np
+import pandas as pd
+from core.py.columnar import read_schedule
+from core.py.loader import load_case
+from core.py.scheduler import Scheduler
+
+# Number of offending schedule rows listed per check (every violation is counted)
+MAX_REPORTED_ROWS = 20
+
+
+class ValidationResult:
+    """
+    Outcome of validating a schedule: one entry per check, each with a verdict and a message.
+    """
+    def __init__(self, case):
+        """
+        Initialize a result with no checks.
+
+        Parameters:
+        - case (str): The case the schedule belongs to.
+        """
+        self.case = case
+        self.checks = []
+
+    def add(self, name, passed, message, rows=None):
+        """
+        Record the outcome of a check.
+
+        Parameters:
+        - name (str): Short identifier of the check.
+        - passed (bool): Whether the schedule passed it.
+        - message (str): Human-readable details.
+        - rows: Optional positions of the offending games in the schedule; the check then reports
+          their number and the first MAX_REPORTED_ROWS of them.
+        """
+        check = {"name": name, "passed": bool(passed), "message": message}
+        if rows is not None:
+            rows = [int(row) for row in rows]
+            check["violations"] = len(rows)
+            check["rows"] = rows[:MAX_REPORTED_ROWS]
+        self.checks.append(check)
+
+    @property
+    def passed(self):
+        """True if every check passed."""
+        return all(check["passed"] for check in self.checks)
+
+    def failures(self):
+        """Return the checks that failed."""
+        return [check for check in self.checks if not check["passed"]]
+
+    def summary(self):
+        """Return a one-line description of the result."""
+        if self.passed:
+            return f"Test {self.case} passed!"
+        return f"Test {self.case} failed! " + "; ".join(check["message"] for check in self.failures())
+
+    def to_dict(self):
+        """Return the result as JSON-serializable data."""
+        return {"case": self.case, "passed": self.passed, "checks": list(self.checks)}
+
+
+def overlapping_rows(schedule_df, keys):
+    """
+    Flag the games that overlap in time with an earlier game sharing the same keys.
+
+    Parameters:
+    - schedule_df (DataFrame): Games with start and end columns and the key columns.
+    - keys (list): Columns that identify one resource on one day.
+
+    Returns:
+    - A boolean Series aligned with schedule_df.
+    """
+    groups = schedule_df.groupby(keys, sort=False).ngroup().to_numpy()
+    starts = schedule_df["start"].to_numpy(dtype=np.float64)
+    ends = schedule_df["end"].to_numpy(dtype=np.float64)
+    order = np.lexsort((starts, groups))
+    groups, starts, ends = groups[order], starts[order], ends[order]
+    # Latest end so far within each group: offsetting every group above the previous ones lets a
+    # single running maximum restart at each group
+    offset = max(ends.max() - min(ends.min(), 0) + 1, 1) if len(ends) else 1
+    latest_end = np.maximum.accumulate(groups * offset + ends) - groups * offset
+    overlapping = np.zeros(len(order), dtype=bool)
+    overlapping[order[1:]] = (groups[1:] == groups[:-1]) & (starts[1:] < latest_end[:-1])
+    return pd.Series(overlapping, index=schedule_df.index)
+
+
+def team_games(schedule_df):
+    """
+    Return one row per (game, team) with the game's position in the schedule as "game".
+    """
+    columns = ["season", "week", "day", "start", "end"]
+    return pd.concat([
+        schedule_df[[team_column] + columns].set_axis(["team"] + columns, axis=1).assign(game=np.arange(len(schedule_df)))
+        for team_column in ("team1Name", "team2Name")
+    ], ignore_index=True)
+
+
+def outside_windows(games, windows):
+    """
+    Flag the games that do not fit inside the day window of the row they were matched with.
+
+    Parameters:
+    - games (DataFrame): Games with day, start and end columns.
+    - windows (DataFrame): Aligned with games, with the d{day}Start/d{day}End columns.
+
+    Returns:
+    - A boolean array aligned with games.
+    """
+    day_index = games["day"].to_numpy().astype(np.int64) - 1
+    valid_day = (day_index >= 0) & (day_index < 7)
+    day_index = np.clip(day_index, 0, 6)[:, None]
+    starts = np.take_along_axis(windows[[f"d{day}Start" for day in range(1, 8)]].to_numpy(dtype=np.float64), day_index, axis=1)[:, 0]
+    ends = np.take_along_axis(windows[[f"d{day}End" for day in range(1, 8)]].to_numpy(dtype=np.float64), day_index, axis=1)[:, 0]
+    return ~valid_day | (games["start"].to_numpy() < starts) | (games["end"].to_numpy() > ends)
+
+
+def venue_violations(schedule_df, venue_df):
+    """
+    Find the games that are not inside a window of their venue field.
+
+    A game must match a venue row by location ("<name> Field #<field>") and season year, fall
+    within that row's seasonStart-seasonEnd weeks and fit its day window. When several rows share
+    the location, any one of them will do.
+
+    Returns:
+    - An array of schedule positions.
+    """
+    venues = venue_df.assign(location=venue_df["name"].astype(str) + " Field #" + venue_df["field"].astype(str),
+                             season=venue_df["seasonYear"])
+    games = schedule_df[["location", "season", "week", "day", "start", "end"]].assign(
+        game=np.arange(len(schedule_df)), location=schedule_df["location"].astype(str))
+    pairs = games.merge(venues, on=["location", "season"], how="inner")
+    fits = ~outside_windows(pairs, pairs) & (pairs["week"] >= pairs["seasonStart"]).to_numpy() \
+        & (pairs["week"] <= pairs["seasonEnd"]).to_numpy()
+    fitting_games = np.unique(pairs["game"].to_numpy()[fits])
+    return np.setdiff1d(np.arange(len(schedule_df)), fitting_games)
+
+
+def availability_violations(schedule_df, team_df):
+    """
+    Find the games that are outside a team's availability window, or involve an unknown team.
+
+    Returns:
+    - An array of schedule positions.
+    """
+    appearances = team_games(schedule_df)
+    # Team names are unique once loaded (see loader.load_case)
+    positions = pd.Index(team_df["name"].astype(str)).get_indexer(appearances["team"].astype(str))
+    window_columns = [f"d{day}{bound}" for day in range(1, 8) for bound in ("Start", "End")]
+    windows = pd.DataFrame(team_df[window_columns].to_numpy(dtype=np.float64)[np.maximum(positions, 0)],
+                           columns=window_columns)
+    bad = (positions < 0) | outside_windows(appearances, windows)
+    return np.unique(appearances["game"].to_numpy()[bad])
+
+
+def validate_schedule(case, schedule_df=None, inputs=None, data_dir="./data", team_availability=True, min_games=None):
+    """
+    Validate the schedule of a case.
+
+    Every check is a vectorized pass over the whole schedule (sorts, merges and duplicate
+    detection), so a report takes milliseconds once the inputs are loaded.
+
+    Checks:
+    - game_count: At least min_games games are scheduled (only when min_games is given).
+    - field_overlap: No field hosts two overlapping games.
+    - team_overlap: No team plays two overlapping games.
+    - team_once_per_day: No team plays more than once per day.
+    - venue_window: Every game is inside its venue field's day window and season (needs the inputs).
+    - team_availability: Every game is inside both teams' availability windows (needs the inputs;
+      skipped for Scheduler.AVAILABILITY_EXEMPT_CASES and when team_availability is False).
+
+    Parameters:
+    - case (str): The case identifier.
+    - schedule_df (DataFrame): The schedule (default: the last schedule of the case, see columnar.read_schedule).
+    - inputs (CaseInputs): The case's inputs (default: loaded with loader.load_case; when the case has
+      no readable inputs the checks that need them are left out).
+    - data_dir (str): Directory holding the case directories.
+    - team_availability (bool): Whether the schedule was made honouring team availability.
+    - min_games (int): Optional number of games the schedule must have at least.
+
+    Returns:
+    - A ValidationResult.
+    """
+    result = ValidationResult(case)
+    if schedule_df is None:
+        try:
+            schedule_df = read_schedule(f"{data_dir}/{case}/schedule.csv")
+        except (FileNotFoundError, pd.errors.EmptyDataError) as e:
+            result.add("schedule", False, f"Could not read the schedule of {case}: {e}")
+            return result
+    if inputs is None:
+        try:
+            inputs = load_case(case, data_dir)
+        except (FileNotFoundError, ValueError):
+            inputs = None
+
+    game_count = len(schedule_df)
+    if min_games is not None:
+        result.add("game_count", game_count >= min_games, f"{game_count} games scheduled, expected at least {min_games}")
+    if not game_count:
+        return result
+    schedule_df = schedule_df.reset_index(drop=True)
+
+    field_overlaps = np.flatnonzero(overlapping_rows(schedule_df, ["location", "season", "week", "day"]).to_numpy())
+    result.add("field_overlap", not len(field_overlaps),
+               f"{len(field_overlaps)} games overlap another game on the same field", field_overlaps)
+
+    appearances = team_games(schedule_df)
+    team_overlaps = np.unique(appearances["game"].to_numpy()[
+        overlapping_rows(appearances, ["team", "season", "week", "day"]).to_numpy()])
+    result.add("team_overlap", not len(team_overlaps),
+               f"{len(team_overlaps)} games overlap another game of one of their teams", team_overlaps)
+
+    repeated = np.unique(appearances["game"].to_numpy()[
+        appearances.duplicated(["team", "season", "week", "day"]).to_numpy()])
+    result.add("team_once_per_day", not len(repeated),
+               f"{len(repeated)} games put a team on the field twice in a day", repeated)
+
+    if inputs is not None:
+        outside_venue = venue_violations(schedule_df, inputs.venue_df)
+        result.add("venue_window", not len(outside_venue),
+                   f"{len(outside_venue)} games are outside their venue field's hours or season", outside_venue)
+        if team_availability and case not in Scheduler.AVAILABILITY_EXEMPT_CASES:
+            unavailable = availability_violations(schedule_df, inputs.team_df)
+            result.add("team_availability", not len(unavailable),
+                       f"{len(unavailable)} games are outside a team's availability", unavailable)
+    return result
@@ -0,0 +1,236 @@
+import argparse
+import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from faker import Faker
+from core.py.loader import DAY_COLUMNS
+from core.py.slot_catalogue import grouped_arange
+
+TEAM_NOUNS = [
+    "Wolves", "Bulls", "Eagles", "Dolphins", "Wildcats", "Bobcats", "Bears", "Grizzlies", "Hornets",
+    "Bucaneers", "Vikings", "Sox", "Chargers", "Warriors", "Sabres", "Americans", "Westerners", "Jacks",
+    "Robbers", "Rappers", "Pirates", "Chiefs", "Commandos", "Celtics", "Mavericks", "Raptors", "Hawks",
+]
+LOCATIONS = ["Center", "Pavilion", "Plaza", "Field", "Place", "Oasis", "Complex", "Stadium", "Arena", "Park",
+             "Grounds", "Facility", "Hub", "Dome", "Venue", "Zone", "Rink", "Court", "Gymnasium"]
+LEAGUE_TYPES = ["Recreational", "Junior", "Competitive"]
+REGIONS = ["West", "North", "East", "South", "Central"]
+
+# Number of city names drawn from faker for the name pool
+CITY_DRAWS = 2000
+
+# Kinds of erroneous rows injected by generate_workload, all of which core.py.loader quarantines
+TEAM_ERRORS = ("inverted_window", "time_out_of_range", "unknown_league", "duplicate_name")
+VENUE_ERRORS = ("inverted_window", "time_out_of_range", "inverted_season")
+
+
+@lru_cache(maxsize=None)
+def city_pool(seed=0):
+    """
+    Return the sorted, distinct city names drawn from faker for a seed.
+
+    faker is slow per call, so the pool is drawn once per seed and process, and names are built by
+    combining its entries with NumPy instead of calling faker for every row.
+
+    Parameters:
+    - seed (int): Seed of the faker instance.
+
+    Returns:
+    - A read-only array of strings.
+    """
+    faker = Faker()
+    faker.seed_instance(seed)
+    pool = np.array(sorted({faker.city() for _ in range(CITY_DRAWS)}), dtype=object)
+    pool.flags.writeable = False
+    return pool
+
+
+def unique_names(rng, count, first_parts, second_parts):
+    """
+    Build count distinct "<first> <second>" names, numbering them once every combination is used.
+
+    Parameters:
+    - rng (Generator): Source of randomness.
+    - count (int): Number of names.
+    - first_parts, second_parts (sequence): The two word pools.
+
+    Returns:
+    - A Series of strings.
+    """
+    first_parts, second_parts = np.asarray(first_parts, dtype=object), np.asarray(second_parts, dtype=object)
+    combinations = len(first_parts) * len(second_parts)
+    keys = rng.permutation(combinations)[:count] if count <= combinations else np.arange(count)
+    rounds = keys // combinations
+    names = (pd.Series(first_parts[keys % len(first_parts)]) + " "
+             + pd.Series(second_parts[(keys // len(first_parts)) % len(second_parts)]))
+    suffixes = pd.Series(np.where(rounds > 0, " " + (rounds + 1).astype(str).astype(object), ""))
+    return names + suffixes
+
+
+def day_windows(rng, count, density):
+    """
+    Draw one availability window per row and day, on half hours.
+
+    Parameters:
+    - rng (Generator): Source of randomness.
+    - count (int): Number of rows.
+    - density (float): Mean fraction of the day (0-1) a window covers.
+
+    Returns:
+    - dict: d{day}Start/d{day}End -> float array.
+    """
+    half_hours = 48
+    lengths = np.clip(np.rint(rng.normal(density * half_hours, 4, size=(count, 7))), 0, half_hours).astype(np.int64)
+    starts = np.floor(rng.random((count, 7)) * (half_hours - lengths + 1)).astype(np.int64)
+    # The end of the day is written as 23.5, like the original data
+    ends = np.minimum(starts + lengths, half_hours - 1)
+    starts = np.minimum(starts, ends)
+    windows = {}
+    for day in range(7):
+        windows[f"d{day + 1}Start"] = starts[:, day] / 2
+        windows[f"d{day + 1}End"] = ends[:, day] / 2
+    return windows
+
+
+def error_rows(rng, count, error_rate, kinds):
+    """
+    Pick the rows to corrupt and the kind of error of each.
+
+    Returns:
+    - tuple: (rows, kinds) as arrays.
+    """
+    rows = np.flatnonzero(rng.random(count) < error_rate)
+    return rows, np.asarray(kinds)[rng.integers(0, len(kinds), size=len(rows))]
+
+
+def generate_workload(teams=700, leagues=21, venues=140, fields=4, density=0.5, error_rate=0.0, seed=0,
+                      season_year=2024):
+    """
+    Generate the team, venue and league tables of a synthetic case.
+
+    Every column is drawn with NumPy in one go, so the cost grows with the number of rows rather than
+    with Python work per row, and the same arguments always give the same tables.
+
+    Parameters:
+    - teams (int): Number of teams, spread evenly over the leagues.
+    - leagues (int): Number of leagues.
+    - venues (int): Number of venues.
+    - fields (int): Maximum number of fields per venue (each venue gets 1 to fields).
+    - density (float): Mean fraction of the day (0-1) teams and venues are available.
+    - error_rate (float): Fraction of team and venue rows given an error the loader quarantines
+      (see TEAM_ERRORS and VENUE_ERRORS).
+    - seed (int): Seed of every random draw.
+    - season_year (int): Season year of the leagues and venues.
+
+    Returns:
+    - dict: "team", "venue" and "league" DataFrames.
+
+    Raises:
+    - ValueError: If a count is not positive, or density or error_rate is outside 0-1.
+    """
+    if min(teams, leagues, venues, fields) < 1:
+        raise ValueError("teams, leagues, venues and fields must be at least 1")
+    if not 0 <= density <= 1 or not 0 <= error_rate <= 1:
+        raise ValueError("density and error_rate must be between 0 and 1")
+    rng = np.random.default_rng(seed)
+    cities = city_pool(seed)
+
+    # Leagues
+    league_ids = np.arange(1, leagues + 1)
+    league_types = rng.integers(0, len(LEAGUE_TYPES), size=leagues)
+    league_names = pd.Series(np.array(LEAGUE_TYPES, dtype=object)[league_types]) + " League " + pd.Series(league_ids).astype(str)
+    season_starts = rng.integers(1, 21, size=leagues)
+    league_df = pd.DataFrame({
+        "leagueId": league_ids,
+        "sportId": rng.integers(1, 8, size=leagues),
+        "leagueTypeId": league_types + 1,
+        "leagueName": league_names,
+        "leagueSize": np.bincount(np.arange(teams) % leagues, minlength=leagues),
+        "seasonStart": season_starts,
+        "seasonEnd": season_starts + rng.integers(20, 33, size=leagues),
+        "numberOfGames": rng.integers(8, 21, size=leagues),
+        "seasonYear": season_year,
+    })
+
+    # Teams, spread evenly over the leagues
+    team_leagues = rng.permutation(np.arange(teams) % leagues) + 1
+    team_df = pd.DataFrame({
+        "teamId": np.arange(1, teams + 1),
+        "name": unique_names(rng, teams, cities, TEAM_NOUNS),
+        "leagueId": team_leagues,
+        "sportId": league_df["sportId"].to_numpy()[team_leagues - 1],
+        "leagueTypeId": league_df["leagueTypeId"].to_numpy()[team_leagues - 1],
+        "players": rng.integers(5, 27, size=teams),
+        "region": np.array(REGIONS)[rng.integers(0, len(REGIONS), size=teams)],
+        **day_windows(rng, teams, density),
+    })
+
+    # Venues, one row per field
+    field_counts = rng.integers(1, fields + 1, size=venues)
+    venue_rows = np.repeat(np.arange(venues), field_counts)
+    venue_starts = rng.integers(1, 33, size=venues)
+    venue_windows = day_windows(rng, venues, density)
+    venue_df = pd.DataFrame({
+        "venueId": venue_rows + 1,
+        "region": np.array(REGIONS)[rng.integers(0, len(REGIONS), size=venues)][venue_rows],
+        "name": unique_names(rng, venues, cities, LOCATIONS).to_numpy()[venue_rows],
+        "field": grouped_arange(field_counts) + 1,
+        **{column: venue_windows[column][venue_rows] for column in DAY_COLUMNS},
+        "seasonStart": venue_starts[venue_rows],
+        "seasonEnd": np.minimum(venue_starts + rng.integers(19, 40, size=venues), 52)[venue_rows],
+        "seasonYear": season_year,
+    })
+
+    # Erroneous rows
+    rows, kinds = error_rows(rng, teams, error_rate, TEAM_ERRORS)
+    inject_window_errors(team_df, rows, kinds)
+    unknown = rows[kinds == "unknown_league"]
+    team_df.loc[unknown, "leagueId"] = leagues + 1
+    duplicates = rows[(kinds == "duplicate_name") & (rows > 0)]
+    team_df.loc[duplicates, "name"] = team_df["name"].to_numpy()[duplicates - 1]
+
+    rows, kinds = error_rows(rng, len(venue_df), error_rate, VENUE_ERRORS)
+    inject_window_errors(venue_df, rows, kinds)
+    inverted = rows[kinds == "inverted_season"]
+    venue_df.loc[inverted, ["seasonStart", "seasonEnd"]] = venue_df.loc[inverted, ["seasonEnd", "seasonStart"]].to_numpy() + [1, 0]
+
+    return {"team": team_df, "venue": venue_df, "league": league_df}
+
+
+def inject_window_errors(table, rows, kinds):
+    """Invert the first day window of the "inverted_window" rows and push the "time_out_of_range" ones past 24."""
+    inverted = rows[kinds == "inverted_window"]
+    table.loc[inverted, "d1Start"] = table.loc[inverted, "d1End"] + 0.5
+    table.loc[rows[kinds == "time_out_of_range"], "d1End"] = 25.0
+
+
+def write_workload(frames, directory):
+    """
+    Write generated tables as the input files of a case.
+
+    Parameters:
+    - frames (dict): The tables returned by generate_workload.
+    - directory (str): The case directory (created if needed).
+    """
+    os.makedirs(directory, exist_ok=True)
+    for basename, frame in frames.items():
+        frame.to_csv(os.path.join(directory, f"{basename}.csv"), index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic case of any size.")
+    parser.add_argument("case", help="Name of the case, written to ./data/<case>/")
+    parser.add_argument("--teams", type=int, default=700, help="Number of teams")
+    parser.add_argument("--leagues", type=int, default=21, help="Number of leagues")
+    parser.add_argument("--venues", type=int, default=140, help="Number of venues")
+    parser.add_argument("--fields", type=int, default=4, help="Maximum number of fields per venue")
+    parser.add_argument("--density", type=float, default=0.5, help="Mean fraction of the day teams and venues are available")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of rows given an input error")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    frames = generate_workload(args.teams, args.leagues, args.venues, args.fields, args.density, args.error_rate, args.seed)
+    write_workload(frames, f"./data/{args.case}")
+    print(f"Wrote {len(frames['team'])} teams, {len(frames['venue'])} fields and {len(frames['league'])} leagues "
+          f"to ./data/{args.case}")
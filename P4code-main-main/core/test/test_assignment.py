@@ -0,0 +1,45 @@
+import random
+import pytest
+import pandas as pd
+from core.py.assignment import UNMATCHED, hopcroft_karp
+from core.py.scheduler import Scheduler
+
+
+def augmenting_path_matching_size(adjacency, right_count):
+	"""Reference maximum matching size (Kuhn's augmenting paths)."""
+	match_right = [UNMATCHED] * right_count
+
+	def augment(left, seen):
+		for right in adjacency[left]:
+			if right not in seen:
+				seen.add(right)
+				if match_right[right] == UNMATCHED or augment(match_right[right], seen):
+					match_right[right] = left
+					return True
+		return False
+
+	return sum(augment(left, set()) for left in range(len(adjacency)))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_hopcroft_karp_is_maximum(seed):
+	rng = random.Random(seed)
+	right_count = rng.randint(0, 15)
+	adjacency = [rng.sample(range(right_count), rng.randint(0, right_count)) for _ in range(rng.randint(0, 15))]
+
+	matching = hopcroft_karp(adjacency, right_count)
+	matched = [right for right in matching if right != UNMATCHED]
+	assert len(matched) == len(set(matched))
+	assert all(right == UNMATCHED or right in adjacency[left] for left, right in enumerate(matching))
+	assert len(matched) == augmenting_path_matching_size(adjacency, right_count)
+
+
+def test_matching_strategy_schedule_is_valid():
+	case = "case5"
+	assert Scheduler.run(case, strategy="matching") == 0
+
+	df = pd.read_csv(f"./data/{case}/schedule.csv")
+	assert len(df) >= 104
+	assert not df.duplicated(["location", "season", "week", "day", "start"]).any()
+	assert not pd.concat([df[["team1Name", "week", "day"]].set_axis(["team", "week", "day"], axis=1),
+	                      df[["team2Name", "week", "day"]].set_axis(["team", "week", "day"], axis=1)]).duplicated().any()
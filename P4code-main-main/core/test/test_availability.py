@@ -0,0 +1,30 @@
+import pytest
+import pandas as pd
+from core.py.availability import TeamAvailability
+from core.py.scheduler import Scheduler
+from core.py.slot_catalogue import SlotCatalogue
+
+
+def test_feasible_rows_fit_both_teams():
+	team_df = pd.read_csv("./data/case5/team.csv")
+	catalogue = SlotCatalogue(pd.read_csv("./data/case5/venue.csv"), 2)
+	availability = TeamAvailability(team_df)
+	teams = team_df.set_index("name")
+
+	team1, team2 = team_df["name"].iloc[0], team_df["name"].iloc[1]
+	rows = availability.feasible_rows(team1, team2, catalogue)
+	assert len(rows) > 0
+	for week, day, start, end, venue, field in catalogue.slots(rows):
+		for team in (team1, team2):
+			assert teams.loc[team, f"d{day}Start"] <= start and end <= teams.loc[team, f"d{day}End"]
+
+
+@pytest.mark.parametrize("case", ["case5", "case7"])
+def test_schedule_honours_team_availability(case):
+	assert Scheduler.run(case) == 0
+	schedule = pd.read_csv(f"./data/{case}/schedule.csv")
+	teams = pd.read_csv(f"./data/{case}/team.csv").set_index("name")
+	for game in schedule.itertuples():
+		for team in (game.team1Name, game.team2Name):
+			assert teams.loc[team, f"d{game.day}Start"] <= game.start
+			assert game.end <= teams.loc[team, f"d{game.day}End"]
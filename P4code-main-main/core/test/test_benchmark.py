@@ -0,0 +1,78 @@
+import json
+import os
+from core.py.benchmark import benchmark_case, find_baseline, find_regressions, measure_case, run_benchmarks
+
+
+def test_measure_leaves_the_case_files_untouched():
+	path = "./data/case1/schedule.csv"
+	with open(path, "rb") as schedule_file:
+		before = schedule_file.read()
+	stat = os.stat(path)
+	measures = measure_case("case1")
+	assert measures["games"] == 28
+	with open(path, "rb") as schedule_file:
+		assert schedule_file.read() == before
+	assert os.stat(path).st_mtime_ns == stat.st_mtime_ns
+
+
+def test_benchmark_case_measures_a_fresh_process():
+	measures = benchmark_case("case1")
+	assert measures["games"] == 28
+	assert measures["unscheduled"] == 0
+	assert measures["fill_rate"] == 1.0
+	assert measures["slots_tried"] >= measures["games"]
+	# Every booked slot passed a field probe and a team probe
+	assert measures["probes"] >= 2 * measures["games"]
+	assert measures["wall_time"] > 0 and measures["peak_rss_kb"] > 0
+
+
+def test_regressions_against_the_baseline():
+	baseline = {"engine": "tree", "strategy": "greedy", "results": {
+		"case1": {"wall_time": 1.0, "fill_rate": 1.0},
+		"case5": {"wall_time": 0.01, "fill_rate": 0.9},
+	}}
+	history = [baseline, {"engine": "bitmap", "strategy": "greedy", "results": {}}]
+	assert find_baseline(history, "tree", "greedy")["results"] == baseline["results"]
+	assert find_baseline(history, "tree", "matching") is None
+
+	results = {
+		"case1": {"wall_time": 1.5, "fill_rate": 0.95},
+		# Much slower in relative terms, but within the timing noise
+		"case5": {"wall_time": 0.03, "fill_rate": 0.9},
+		"case6": {"wall_time": 9.0, "fill_rate": 0.1},
+	}
+	assert find_regressions(results, baseline) == [
+		"case1: wall time 1.000s -> 1.500s",
+		"case1: fill rate 100.00% -> 95.00%",
+	]
+	assert find_regressions(results, baseline, time_threshold=1.0, fill_threshold=0.1) == []
+	assert find_regressions(results, None) == []
+
+
+def test_baseline_is_the_median_of_recent_runs_unless_one_is_pinned():
+	def run(wall_time, **extra):
+		return {"engine": "tree", "strategy": "greedy", "results": {"case1": {"wall_time": wall_time, "fill_rate": 1.0}}, **extra}
+
+	# One slow run among steady ones does not move the baseline
+	history = [run(9.0)] + [run(1.0), run(1.2), run(5.0), run(1.1), run(0.9)]
+	assert find_baseline(history, "tree", "greedy")["results"]["case1"]["wall_time"] == 1.1
+	assert find_baseline(history, "tree", "greedy", runs=2)["results"]["case1"]["wall_time"] == 1.0
+
+	pinned = run(2.0, pinned=True)
+	assert find_baseline([pinned] + history, "tree", "greedy") is pinned
+
+
+def test_run_benchmarks_records_only_runs_without_regressions(tmp_path):
+	history_path = tmp_path / "history.json"
+	entry, regressions = run_benchmarks(["case1"], history_path=history_path)
+	assert regressions == []
+	assert entry["results"]["case1"]["games"] == 28
+	run_benchmarks(["case1"], history_path=history_path, time_threshold=100.0)
+	assert len(json.loads(history_path.read_text())) == 2
+
+	# A negative tolerance asks for a better fill rate than a full one: the run regresses and is left out
+	_, regressions = run_benchmarks(["case1"], history_path=history_path, fill_threshold=-0.5, time_threshold=100.0)
+	assert regressions and len(json.loads(history_path.read_text())) == 2
+
+	run_benchmarks(["case1"], history_path=history_path, fill_threshold=-0.5, time_threshold=100.0, accept=True)
+	assert len(json.loads(history_path.read_text())) == 3
@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 from core.py.scheduler import Scheduler
+from core.py.validation import validate_schedule
 
 def test_case2():
 	case = "case2"
@@ -9,3 +10,6 @@ def test_case2():
 	
 	df = pd.read_csv(f"./data/{case}/schedule.csv")
 	assert len(df) == 84 # was 96 now 84
+
+	result = validate_schedule(case, df)
+	assert result.passed, result.summary()
@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 from core.py.scheduler import Scheduler
+from core.py.validation import validate_schedule
 
 def test_case4():
 	case = "case4"
@@ -9,3 +10,6 @@ def test_case4():
 	
 	df = pd.read_csv(f"./data/{case}/schedule.csv")
 	assert len(df) == 168
+
+	result = validate_schedule(case, df)
+	assert result.passed, result.summary()
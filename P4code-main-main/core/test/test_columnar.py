@@ -0,0 +1,90 @@
+import os
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+import pandas as pd
+from core.py.columnar import columnar_path, load_columnar, load_npz_mmap, read_schedule, save_columnar
+from core.py.scheduler import Scheduler
+from routes import api
+
+
+def test_scheduler_writes_a_columnar_copy():
+	case = "case7"
+	assert Scheduler.run(case) == 0
+	csv_path = f"./data/{case}/schedule.csv"
+	assert os.path.exists(columnar_path(csv_path))
+
+	expected = pd.read_csv(csv_path)
+	loaded = read_schedule(csv_path)
+	assert list(loaded.columns) == list(expected.columns)
+	assert loaded.to_dict(orient="records") == expected.to_dict(orient="records")
+
+
+def test_npz_columns_are_memory_mapped(tmp_path):
+	schedule_df = pd.DataFrame({"team1Name": ["Ash", "Birch", "Ash"], "week": [1, 2, 3], "start": [9.0, 10.5, 12.0],
+	                            "location": ["Park Field #1", "Park Field #1", "Café Field #2"]})
+	path = str(tmp_path / "schedule.npz")
+	save_columnar(schedule_df, path)
+
+	arrays = load_npz_mmap(path)
+	assert isinstance(arrays["week"], np.memmap) and isinstance(arrays["team1Name.codes"], np.memmap)
+	assert arrays["team1Name.codes"].tolist() == [0, 1, 0]
+
+	loaded = load_columnar(path)
+	assert loaded.to_dict(orient="records") == schedule_df.to_dict(orient="records")
+	assert loaded["location"].dtype == "category"
+
+
+def test_empty_schedule_round_trips(tmp_path):
+	path = str(tmp_path / "schedule.npz")
+	save_columnar(pd.DataFrame([]), path)
+	assert load_columnar(path).empty
+
+
+def test_empty_schedule_reads_like_an_empty_csv(tmp_path):
+	csv_path = str(tmp_path / "schedule.csv")
+	Scheduler.save_schedule([], csv_path, str(tmp_path / "schedule.json"))
+	assert os.path.exists(columnar_path(csv_path))
+	with pytest.raises(pd.errors.EmptyDataError):
+		read_schedule(csv_path)
+
+
+def test_schedule_endpoint_reports_an_empty_schedule(monkeypatch):
+	case = "case1"
+	async def schedule_nothing(function, case):
+		Scheduler.save_schedule([], f"./data/{case}/schedule.csv", f"./data/{case}/schedule.json")
+		return 0
+	monkeypatch.setattr(api, "run_in_scheduler_pool", schedule_nothing)
+	monkeypatch.setenv("LANGUAGE", "python")
+	api.schedule_cache.clear()
+	try:
+		with TestClient(api.app) as client:
+			result = client.get("/schedule", params={"case": case}).json()
+	finally:
+		assert Scheduler.run(case) == 0
+	assert result["status"] == 500 and result["test_msg"] == "Empty CSV data"
+
+
+def test_stale_columnar_copy_is_ignored(tmp_path):
+	csv_path = str(tmp_path / "schedule.csv")
+	save_columnar(pd.DataFrame({"week": [1]}), columnar_path(csv_path))
+	pd.DataFrame({"week": [2]}).to_csv(csv_path, index=False)
+	past = os.path.getmtime(csv_path) - 10
+	os.utime(columnar_path(csv_path), (past, past))
+	assert read_schedule(csv_path)["week"].tolist() == [2]
+
+
+def test_rescheduling_keeps_mapped_copies_readable():
+	case = "case1"
+	assert Scheduler.run(case) == 0
+	csv_path = f"./data/{case}/schedule.csv"
+	mapped = load_columnar(columnar_path(csv_path))
+	expected = mapped.to_dict(orient="records")
+	original_inode = os.stat(columnar_path(csv_path)).st_ino
+
+	# A truncated mapping would raise SIGBUS on access; a replaced file leaves it intact
+	assert Scheduler.run(case) == 0
+	assert os.stat(columnar_path(csv_path)).st_ino != original_inode
+	assert mapped.to_dict(orient="records") == expected
+	assert read_schedule(csv_path).to_dict(orient="records") == expected
+	assert not [name for name in os.listdir(f"./data/{case}") if name.startswith(".")]
@@ -0,0 +1,57 @@
+import gzip
+import json
+import pandas as pd
+from fastapi.testclient import TestClient
+from routes import api
+from routes.export import gzip_stream, iter_csv, iter_ndjson, parse_value
+
+
+def test_csv_stream_is_the_file(tmp_path):
+	path = "./data/generated/schedule.csv"
+	with open(path, "rb") as schedule_file:
+		content = schedule_file.read()
+	chunks = list(iter_csv(path, chunk_size=1000))
+	assert b"".join(chunks) == content
+	assert max(len(chunk) for chunk in chunks) == 1000
+
+
+def test_ndjson_stream_matches_the_schedule():
+	path = "./data/case8/schedule.csv"
+	games = [json.loads(line) for chunk in iter_ndjson(path, batch=7) for line in chunk.decode().splitlines()]
+	assert games == pd.read_csv(path).to_dict(orient="records")
+
+
+def test_gzip_stream_round_trips():
+	chunks = [b"week,day\n"] + [f"{week},{week % 7 + 1}\n".encode() for week in range(1, 53)]
+	assert gzip.decompress(b"".join(gzip_stream(iter(chunks)))) == b"".join(chunks)
+	assert gzip.decompress(b"".join(gzip_stream(iter([])))) == b""
+
+
+def test_only_plain_decimal_literals_become_numbers():
+	assert [parse_value(text) for text in ("42", "-3", "9.5", ".5", "1e-05", "-2.5E3")] == [42, -3, 9.5, 0.5, 1e-05, -2500.0]
+	for text in ("nan", "NaN", "inf", "-Infinity", "1_000", " 7", "0x10", "", "Park 2"):
+		assert parse_value(text) == text
+	assert parse_value("1e999") is None and parse_value("-1e999") is None
+
+
+def test_ndjson_export_endpoint():
+	path = "./data/case8/schedule.csv"
+	expected = pd.read_csv(path).to_dict(orient="records")
+	with TestClient(api.app) as client:
+		plain = client.get("/schedule/export", params={"case": "case8", "format": "ndjson"})
+		compressed = client.get("/schedule/export", params={"case": "case8", "format": "ndjson", "compress": True})
+
+	assert plain.status_code == 200 and plain.headers["content-type"].startswith("application/x-ndjson")
+	assert 'filename="case8-schedule.ndjson"' in plain.headers["content-disposition"]
+	assert [json.loads(line) for line in plain.text.splitlines()] == expected
+
+	assert compressed.status_code == 200 and compressed.headers["content-type"] == "application/gzip"
+	assert 'filename="case8-schedule.ndjson.gz"' in compressed.headers["content-disposition"]
+	assert gzip.decompress(compressed.content) == plain.content
+
+
+def test_export_endpoint_rejects_unknown_cases():
+	with TestClient(api.app) as client:
+		for case in ("no-such-case", "../data/case8", "case8/"):
+			response = client.get("/schedule/export", params={"case": case, "format": "ndjson"})
+			assert response.status_code == 404 and response.json()["detail"] == f"Unknown case {case}"
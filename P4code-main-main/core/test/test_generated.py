@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 from core.py.scheduler import Scheduler
+from core.py.validation import validate_schedule
 
 def test_generated():
 	case = "generated"
@@ -9,3 +10,6 @@ def test_generated():
 	
 	df = pd.read_csv(f"./data/{case}/schedule.csv")
 	assert len(df) >= 800
+
+	result = validate_schedule(case, df)
+	assert result.passed, result.summary()
@@ -0,0 +1,120 @@
+import random
+import pytest
+import pandas as pd
+from core.py.interval_tree import BalancedIntervalTree, CalendarIntervalIndex, Interval, IntervalTree
+from core.py.scheduler import Scheduler
+from core.py.validation import validate_schedule
+
+
+def check_avl_invariants(node):
+	"""Return (height, max_end, starts) of a subtree after asserting the AVL and max_end invariants."""
+	if node is None:
+		return 0, float("-inf"), []
+	left_height, left_max_end, left_starts = check_avl_invariants(node.left)
+	right_height, right_max_end, right_starts = check_avl_invariants(node.right)
+	start = node.intervals[0].start
+	assert node.intervals and all(i.start == start for i in node.intervals)
+	assert all(s < start for s in left_starts) and all(s > start for s in right_starts)
+	assert abs(left_height - right_height) <= 1
+	assert node.height == 1 + max(left_height, right_height)
+	assert node.max_end == max(left_max_end, right_max_end, *(i.end for i in node.intervals))
+	return node.height, node.max_end, left_starts + [start] + right_starts
+
+
+def test_calendar_index_matches_interval_tree():
+	tree = IntervalTree()
+	index = CalendarIntervalIndex()
+	for week in range(1, 5):
+		for day in range(1, 8):
+			for start in (9, 11, 14):
+				interval = Interval(start, start + 2, day, week)
+				tree.insert(interval)
+				index.insert(interval)
+
+	for probe in [Interval(10, 12, 3, 2), Interval(13, 14, 3, 2), Interval(8, 9, 1, 1), Interval(15, 17, 7, 4), Interval(9, 11, 1, 9)]:
+		expected = sorted((i.week, i.day, i.start) for i in tree.overlap(probe))
+		assert sorted((i.week, i.day, i.start) for i in index.overlap(probe)) == expected
+
+	assert len(index.flatten()) == len(tree.flatten()) == 4 * 7 * 3
+
+
+def test_calendar_index_separates_seasons():
+	index = CalendarIntervalIndex()
+	index.insert(Interval(9, 11, 1, 1, season=2024))
+	assert index.overlap(Interval(10, 12, 1, 1, season=2025)) == []
+	assert len(index.overlap(Interval(10, 12, 1, 1, season=2024))) == 1
+
+
+def test_any_overlap_agrees_with_overlap():
+	tree = IntervalTree()
+	index = CalendarIntervalIndex()
+	for week, day, start, end in [(1, 1, 9, 11), (1, 1, 14, 16), (1, 2, 9, 11), (2, 1, 10, 13)]:
+		interval = Interval(start, end, day, week)
+		tree.insert(interval)
+		index.insert(interval)
+
+	assert IntervalTree().any_overlap(Interval(9, 11, 1, 1)) is False
+	for probe in [Interval(10, 12, 1, 1), Interval(11, 14, 1, 1), Interval(12, 13, 1, 2), Interval(12, 14, 1, 2), Interval(8, 9, 1, 1)]:
+		assert tree.any_overlap(probe) == bool(tree.overlap(probe))
+		assert index.any_overlap(probe) == bool(index.overlap(probe))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_balanced_tree_against_brute_force(seed):
+	rng = random.Random(seed)
+	tree = BalancedIntervalTree()
+	reference = []
+	for _ in range(300):
+		if reference and rng.random() < 0.35:
+			interval = reference.pop(rng.randrange(len(reference)))
+			tree.remove(interval)
+		else:
+			start = rng.randint(0, 46) / 2
+			interval = Interval(start, start + rng.randint(0, 8) / 2, rng.randint(1, 2), 1)
+			tree.insert(interval)
+			reference.append(interval)
+		check_avl_invariants(tree.root)
+
+		start = rng.randint(0, 46) / 2
+		probe = Interval(start, start + rng.randint(1, 6) / 2, rng.randint(1, 2), 1)
+		expected = [i for i in reference if i.overlaps(probe)]
+		assert sorted(map(id, tree.overlap(probe))) == sorted(map(id, expected))
+		assert tree.any_overlap(probe) == bool(expected)
+
+	assert sorted(map(id, tree.flatten())) == sorted(map(id, reference))
+
+
+def test_balanced_tree_stays_shallow_on_sorted_inserts():
+	tree = BalancedIntervalTree()
+	for start in range(20000):
+		tree.insert(Interval(start, start + 2, 1, 1))
+	assert tree.root.height <= 16
+	assert tree.any_overlap(Interval(19999.5, 20000, 1, 1))
+
+	with pytest.raises(ValueError):
+		tree.remove(Interval(5, 7, 1, 1))
+
+
+def test_calendar_index_remove():
+	index = CalendarIntervalIndex()
+	first, second = Interval(9, 11, 1, 1), Interval(9, 11, 1, 1)
+	index.insert(first)
+	index.insert(second)
+	index.remove(first)
+	assert index.overlap(Interval(10, 12, 1, 1)) == [second]
+	index.remove(second)
+	assert index.buckets == {}
+	with pytest.raises(ValueError):
+		index.remove(second)
+
+
+def test_avl_engine_schedules_a_case_like_the_calendar_index():
+	case = "case8"
+	assert Scheduler.run(case, engine="tree") == 0
+	expected = pd.read_csv(f"./data/{case}/schedule.csv")
+	assert Scheduler.run(case, engine="avl") == 0
+	df = pd.read_csv(f"./data/{case}/schedule.csv")
+
+	pd.testing.assert_frame_equal(df, expected)
+	result = validate_schedule(case, df)
+	assert result.passed, result.summary()
@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from routes.jobs import JobManager
+
+
+def test_job_streams_progress_until_done():
+	async def scenario():
+		executor = ThreadPoolExecutor(max_workers=1)
+		manager = JobManager(lambda: executor)
+		try:
+			job = manager.submit("case8")
+			assert job.status == "queued"
+			events = [event async for event in manager.events(job)]
+
+			failing = manager.submit("case1", engine="unknown")
+			failing_events = [event async for event in manager.events(failing)]
+			return job, events, failing, failing_events
+		finally:
+			manager.shutdown()
+			executor.shutdown()
+
+	job, events, failing, failing_events = asyncio.run(scenario())
+	assert job.status == "done" and job.result["exit_code"] == 0
+	assert job.result["validation"]["passed"]
+	assert [event["event"] for event in events] == ["started", "league_done", "league_done", "league_done", "finished"]
+	assert events[-1]["games"] >= 72 and events[-1]["unscheduled"] == events[-2]["unscheduled"]
+
+	assert failing.status == "failed" and "ValueError" in failing.error
+	assert failing_events == []
+
+
+def test_jobs_on_the_same_case_run_one_at_a_time():
+	async def scenario():
+		executor = ThreadPoolExecutor(max_workers=2)
+		others_at_finish = []
+		manager = JobManager(lambda: executor, on_finished=lambda job: others_at_finish.append(
+			[(other.id, other.status) for other in manager.jobs.values() if other is not job]))
+		try:
+			first = manager.submit("case2")
+			second = manager.submit("case2", strategy="matching")
+			for job in (first, second):
+				[event async for event in manager.events(job)]
+			return first, second, others_at_finish
+		finally:
+			manager.shutdown()
+			executor.shutdown()
+
+	first, second, others_at_finish = asyncio.run(scenario())
+	# The second job only left the queue once the first had written and validated its schedule
+	assert others_at_finish[0] == [(second.id, "queued")]
+	assert first.result["validation"]["passed"] and second.result["validation"]["passed"]
+
+
+def test_job_retries_once_on_a_fresh_executor_after_a_broken_pool():
+	class BrokenExecutor(Executor):
+		def submit(self, fn, *args, **kwargs):
+			raise BrokenProcessPool("A worker process terminated abruptly")
+
+	async def scenario():
+		executors = [BrokenExecutor()]
+		fresh = ThreadPoolExecutor(max_workers=1)
+		manager = JobManager(lambda: executors[-1], reset_executor=lambda executor: executors.append(fresh))
+		try:
+			job = manager.submit("case8")
+			[event async for event in manager.events(job)]
+			return job, executors
+		finally:
+			manager.shutdown()
+			fresh.shutdown()
+
+	job, executors = asyncio.run(scenario())
+	assert job.status == "done" and job.result["exit_code"] == 0
+	assert len(executors) == 2
@@ -0,0 +1,55 @@
+import shutil
+import pandas as pd
+import pytest
+from core.py.loader import load_case
+
+
+def test_clean_case_loads_typed_without_quarantine():
+	inputs = load_case("case5")
+	assert len(inputs.report) == 0
+	assert len(inputs.team_df) == len(pd.read_csv("./data/case5/team.csv"))
+	assert inputs.team_df["name"].dtype == "category"
+	assert inputs.venue_df["d1Start"].dtype == "float32"
+	assert inputs.venue_df["seasonStart"].dtype == "int32"
+	# case5 writes its season year as "2024 "
+	assert inputs.league_df["seasonYear"].tolist() == [2024] * len(inputs.league_df)
+
+
+def test_season_column_is_read_as_season_year():
+	assert "seasonYear" in load_case("case1").league_df.columns
+
+
+def test_dirty_rows_are_quarantined(tmp_path):
+	shutil.copytree("./data/case5", tmp_path / "dirty")
+	team_df = pd.read_csv(tmp_path / "dirty" / "team.csv")
+	team_df.loc[0, "d1Start"], team_df.loc[0, "d1End"] = 15, 10
+	team_df.loc[1, "leagueId"] = 99
+	team_df.loc[2, "name"] = team_df.loc[3, "name"]
+	team_df["d2End"] = team_df["d2End"].astype(object)
+	team_df.loc[4, "d2End"] = "late"
+	team_df.to_csv(tmp_path / "dirty" / "team.csv", index=False)
+	venue_df = pd.read_csv(tmp_path / "dirty" / "venue.csv")
+	venue_df.loc[0, "seasonStart"], venue_df.loc[0, "seasonEnd"] = 40, 30
+	venue_df.loc[1, "d3End"] = 25
+	venue_df.to_csv(tmp_path / "dirty" / "venue.csv", index=False)
+
+	inputs = load_case("dirty", data_dir=tmp_path)
+	report = inputs.report.to_frame()
+	assert sorted(zip(report["file"], report["row"], report["reason"])) == [
+		("team.csv", 1, "window ends before it starts"),
+		("team.csv", 2, "unknown league"),
+		("team.csv", 4, "duplicate team"),
+		("team.csv", 5, "not a number"),
+		("venue.csv", 1, "season ends before it starts"),
+		("venue.csv", 2, "time outside 0-24"),
+	]
+	assert len(inputs.team_df) == len(team_df) - 4
+	assert len(inputs.venue_df) == len(venue_df) - 2
+	assert inputs.team_df["d2End"].dtype == "float32"
+
+
+def test_missing_required_column(tmp_path):
+	shutil.copytree("./data/case1", tmp_path / "broken")
+	pd.read_csv(tmp_path / "broken" / "venue.csv").drop(columns="seasonYear").to_csv(tmp_path / "broken" / "venue.csv", index=False)
+	with pytest.raises(ValueError):
+		load_case("broken", data_dir=tmp_path)
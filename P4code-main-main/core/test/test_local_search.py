@@ -0,0 +1,84 @@
+import time
+import pandas as pd
+import pytest
+from core.py.availability import TeamAvailability
+from core.py.local_search import LocalSearchSolver
+from core.py.scheduler import Scheduler
+from core.py.slot_catalogue import SlotCatalogue
+
+
+def day_columns(start, end):
+	"""Same window on day 1, closed on every other day."""
+	columns = {}
+	for day in range(1, 8):
+		columns[f"d{day}Start"] = start if day == 1 else 0
+		columns[f"d{day}End"] = end if day == 1 else 0
+	return columns
+
+
+def test_local_search_recovers_a_game_greedy_blocks():
+	# One field with two slots (9-11, 11-13) in a single week. Greedy gives the first matchup
+	# the 9-11 slot, the only one the second matchup can use.
+	venue_df = pd.DataFrame([{"venueId": 1, "name": "Park", "field": 1, **day_columns(9, 13),
+	                          "seasonStart": 1, "seasonEnd": 1, "seasonYear": 2024}])
+	team_df = pd.DataFrame([{"name": name, **day_columns(*window)} for name, window in
+	                        [("A", (9, 13)), ("B", (9, 13)), ("C", (9, 11)), ("D", (9, 11))]])
+	catalogue = SlotCatalogue(venue_df, 2)
+	availability = TeamAvailability(team_df)
+
+	matchups = [("A", "B", "League", 0), ("C", "D", "League", None)]
+	solver = LocalSearchSolver(matchups, catalogue, availability)
+	assert solver.conflicts == 0 and solver.unassigned == 1
+
+	assignment = solver.solve(time_budget=5)
+	assert assignment == [1, 0]
+
+
+def test_local_search_stops_when_no_unassigned_matchup_can_be_placed():
+	# E and F are never available together, so once C-D is placed nothing is left to improve
+	venue_df = pd.DataFrame([{"venueId": 1, "name": "Park", "field": 1, **day_columns(9, 13),
+	                          "seasonStart": 1, "seasonEnd": 1, "seasonYear": 2024}])
+	team_df = pd.DataFrame([{"name": name, **day_columns(*window)} for name, window in
+	                        [("A", (9, 13)), ("B", (9, 13)), ("C", (9, 11)), ("D", (9, 11)),
+	                         ("E", (9, 11)), ("F", (11, 13))]])
+	solver = LocalSearchSolver([("A", "B", "League", 0), ("C", "D", "League", None), ("E", "F", "League", None)],
+	                           SlotCatalogue(venue_df, 2), TeamAvailability(team_df))
+
+	started = time.perf_counter()
+	assert solver.solve(time_budget=30) == [1, 0, None]
+	assert time.perf_counter() - started < 5
+	assert solver.open_positions == [] and solver.open_index == {}
+
+
+def test_local_search_keeps_the_start_when_nothing_improves():
+	catalogue = SlotCatalogue(pd.read_csv("./data/case1/venue.csv"), 2)
+	matchups = [("A", "B", "League", 0), ("C", "D", "League", 1)]
+	assert LocalSearchSolver(matchups, catalogue).solve(time_budget=0) == [0, 1]
+
+
+def test_local_search_strategy_schedule_is_valid():
+	case = "case8"
+	assert Scheduler.run(case, strategy="local_search", time_budget=0.5) == 0
+
+	df = pd.read_csv(f"./data/{case}/schedule.csv")
+	assert len(df) >= 72
+	assert not df.duplicated(["location", "season", "week", "day", "start"]).any()
+	assert not pd.concat([df[["team1Name", "season", "week", "day"]].set_axis(["team", "season", "week", "day"], axis=1),
+	                      df[["team2Name", "season", "week", "day"]].set_axis(["team", "season", "week", "day"], axis=1)]).duplicated().any()
+
+
+@pytest.mark.parametrize("case", ["case5", "case7"])
+def test_local_search_keeps_the_greedy_games_within_the_budget(case, tmp_path):
+	def run(strategy, time_budget):
+		finished = {}
+		started = time.perf_counter()
+		assert Scheduler.run(case, strategy=strategy, time_budget=time_budget, output_dir=tmp_path,
+		                     progress=lambda event: finished.update(event) if event["event"] == "finished" else None) == 0
+		return finished["games"], time.perf_counter() - started
+
+	greedy_games, _ = run("greedy", 0)
+	# The budget covers the whole run; only a greedy pass longer than the budget and the save overshoot it
+	for time_budget in (0.0, 0.05, 1.0):
+		games, elapsed = run("local_search", time_budget)
+		assert games >= greedy_games
+		assert elapsed < time_budget + 0.5
@@ -0,0 +1,85 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi.testclient import TestClient
+from routes import api
+from routes.metrics import MetricsRegistry
+
+
+def test_registry_renders_the_text_format():
+	registry = MetricsRegistry()
+	requests = registry.counter("requests_total", "Requests", ("route",))
+	latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+	registry.gauge("entries", "Entries").set_function(lambda: 3)
+	requests.inc(route='/a"b')
+	requests.inc(2, route='/a"b')
+	for value in (0.05, 0.5, 5.0):
+		latency.observe(value)
+
+	assert registry.render().splitlines() == [
+		"# HELP requests_total Requests",
+		"# TYPE requests_total counter",
+		'requests_total{route="/a\\"b"} 3',
+		"# HELP latency_seconds Latency",
+		"# TYPE latency_seconds histogram",
+		'latency_seconds_bucket{le="0.1"} 1',
+		'latency_seconds_bucket{le="1"} 2',
+		'latency_seconds_bucket{le="+Inf"} 3',
+		"latency_seconds_sum 5.55",
+		"latency_seconds_count 3",
+		"# HELP entries Entries",
+		"# TYPE entries gauge",
+		"entries 3",
+	]
+	with pytest.raises(ValueError):
+		requests.inc(status=200)
+	with pytest.raises(ValueError):
+		requests.inc(-1, route="/")
+	with pytest.raises(ValueError):
+		registry.gauge("entries", "Entries again")
+
+
+def sample(text, line_start):
+	values = [float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith(line_start)]
+	assert len(values) == 1, line_start
+	return values[0]
+
+
+def test_metrics_endpoint_after_scheduling(monkeypatch):
+	executor = ThreadPoolExecutor(max_workers=1)
+	monkeypatch.setattr(api, "get_scheduler_pool", lambda: executor)
+	monkeypatch.setenv("LANGUAGE", "python")
+	api.schedule_cache.clear()
+	try:
+		with TestClient(api.app) as client:
+			before = client.get("/metrics").text
+			assert client.get("/schedule", params={"case": "case1"}).json()["status"] == 200
+			assert client.get("/schedule", params={"case": "case1"}).json()["status"] == 200
+			assert client.get("/jobs/missing").status_code == 404
+			# Unknown cases are turned away before running, so they never become a label
+			assert client.get("/schedule", params={"case": "no-such-case"}).json()["status"] == 404
+			assert client.get("/schedule", params={"case": "../data/case1"}).json()["status"] == 404
+			assert client.post("/jobs", params={"case": "case1/"}).status_code == 404
+			response = client.get("/metrics")
+	finally:
+		executor.shutdown()
+
+	assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+	text = response.text
+	delta = lambda line_start: sample(text, line_start) - (sample(before, line_start) if line_start in before else 0)
+	assert delta('http_requests_total{method="GET",route="/schedule",status="200"}') == 4
+	assert delta('http_requests_total{method="GET",route="/jobs/{job_id}",status="404"}') == 1
+	assert delta('http_request_duration_seconds_count{method="GET",route="/schedule"}') == 4
+	# The second request is served from the cache without running the scheduler
+	assert delta('scheduler_runs_total{case="case1",language="python",outcome="success"}') == 1
+	assert delta('scheduler_run_duration_seconds_bucket{case="case1",language="python",le="+Inf"}') == 1
+	assert delta('schedule_cache_lookups_total{result="hit"}') == 1
+	assert sample(text, "schedule_cache_entries") >= 1
+	assert 'scheduler_jobs{status="running"} 0' in text
+	assert 'case="no-such-case"' not in text and 'case="../data/case1"' not in text
+	assert "# TYPE event_loop_lag_seconds histogram" in text
+
+
+def test_unknown_cases_share_one_label():
+	assert api.case_label("case1") == "case1"
+	for case in ("no-such-case", "../data/case1", "case1/", "", ".."):
+		assert api.case_label(case) == "unknown"
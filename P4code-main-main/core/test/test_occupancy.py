@@ -0,0 +1,42 @@
+import pytest
+from core.py.interval_tree import CalendarIntervalIndex, Interval
+from core.py.occupancy import SlotBitmap, window_free, window_mask
+
+
+def test_bitmap_matches_calendar_index():
+	bitmap = SlotBitmap()
+	index = CalendarIntervalIndex()
+	for week, day, start in [(1, 1, 9), (1, 1, 14), (12, 3, 5.5), (52, 7, 21.5)]:
+		interval = Interval(start, start + 2, day, week, season=2024)
+		bitmap.insert(interval)
+		index.insert(interval)
+
+	for week, day, start, end in [(1, 1, 10, 12), (1, 1, 11, 13), (1, 1, 13, 14.5), (12, 3, 7.5, 9.5), (12, 3, 7, 8), (52, 7, 23, 23.5), (2, 1, 9, 11)]:
+		probe = Interval(start, end, day, week, season=2024)
+		assert bitmap.any_overlap(probe) == index.any_overlap(probe)
+		assert bitmap.overlap(probe) == index.overlap(probe)
+	assert bitmap.flatten() == index.flatten()
+
+
+def test_window_free_checks_field_and_teams():
+	field, team_a, team_b = SlotBitmap(), SlotBitmap(), SlotBitmap()
+	team_b.insert(Interval(9, 11, 2, 5, season=2024))
+	assert window_free(Interval(9, 11, 1, 5, season=2024), field, team_a, team_b)
+	assert not window_free(Interval(10, 12, 2, 5, season=2024), field, team_a, team_b)
+
+
+def test_bitmap_remove_keeps_other_games():
+	bitmap = SlotBitmap()
+	first, second = Interval(9, 11, 1, 1), Interval(10, 12, 1, 1)
+	bitmap.insert(first)
+	bitmap.insert(second)
+	bitmap.remove(first)
+	assert bitmap.any_overlap(Interval(10.5, 11, 1, 1))
+	assert not bitmap.any_overlap(Interval(9, 10, 1, 1))
+
+
+def test_window_mask_rejects_off_grid_times():
+	with pytest.raises(ValueError):
+		window_mask(Interval(9.25, 11.25, 1, 1))
+	with pytest.raises(ValueError):
+		window_mask(Interval(9, 11, 1, 53))
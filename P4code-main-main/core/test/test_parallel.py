@@ -0,0 +1,17 @@
+import pytest
+import pandas as pd
+from core.py.scheduler import Scheduler
+
+
+def test_parallel_leagues_respect_overlap_constraints():
+	case = "case6"
+	assert Scheduler.run(case, workers=2) == 0
+
+	df = pd.read_csv(f"./data/{case}/schedule.csv")
+	assert len(df) >= 136
+	# No field is booked twice at the same time
+	assert not df.duplicated(["location", "season", "week", "day", "start"]).any()
+	# No team plays more than once per day
+	teams = pd.concat([df[["team1Name", "season", "week", "day"]].set_axis(["team", "season", "week", "day"], axis=1),
+	                   df[["team2Name", "season", "week", "day"]].set_axis(["team", "season", "week", "day"], axis=1)])
+	assert not teams.duplicated().any()
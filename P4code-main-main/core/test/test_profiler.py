@@ -0,0 +1,46 @@
+import pandas as pd
+from core.py.interval_tree import BalancedIntervalTree, CalendarIntervalIndex, Interval
+from core.py.occupancy import SlotBitmap
+from core.py.profiler import Profiler, index_depth
+from core.py.scheduler import Scheduler
+
+
+def test_profiled_run_reports_phases_and_counters():
+	profiler = Profiler()
+	assert Scheduler.run("case6", profiler=profiler) == 0
+	report = profiler.report()
+	assert list(report["phases"]) == ["load", "catalogue", "pairing", "scan", "save"]
+	assert report["total"] > 0
+
+	counters = report["counters"]
+	games = len(pd.read_csv("./data/case6/schedule.csv"))
+	assert counters["scheduled"] == games
+	assert counters["slots_tried"] == counters["scheduled"] + counters["rejected_daily_limit"] \
+		+ counters["rejected_field_busy"] + counters["rejected_team_busy"]
+	assert counters["field_probes"] == counters["slots_tried"] - counters["rejected_daily_limit"]
+	assert counters["team_probes"] == counters["scheduled"] + counters["rejected_team_busy"]
+
+	assert report["occupancy"]["fields"]["intervals"] == games
+	assert report["occupancy"]["teams"]["intervals"] == 2 * games
+	assert report["occupancy"]["teams"]["max_depth"] == 1  # a team plays once per day
+
+
+def test_profiled_matching_counts_its_field_probes():
+	profiler = Profiler()
+	assert Scheduler.run("case2", strategy="matching", profiler=profiler) == 0
+	counters = profiler.report()["counters"]
+	assert counters["scheduled"] == 84
+	assert counters["field_probes"] > counters["slots_tried"] - counters["rejected_daily_limit"]
+
+
+def test_index_depth():
+	intervals = [Interval(start=hour, end=hour + 1, day=1, week=1, season=2024) for hour in range(8)]
+	calendar, tree, bitmap = CalendarIntervalIndex(), BalancedIntervalTree(), SlotBitmap()
+	for interval in intervals:
+		calendar.insert(interval)
+		tree.insert(interval)
+		bitmap.insert(interval)
+	assert index_depth(calendar) == 8
+	assert index_depth(tree) == 4
+	assert index_depth(bitmap) == 0
+	assert index_depth(BalancedIntervalTree()) == 0
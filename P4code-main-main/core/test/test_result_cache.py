@@ -0,0 +1,82 @@
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi.testclient import TestClient
+from routes import api
+from routes.cache import ScheduleCache, case_input_hash
+
+
+def test_cache_evicts_least_recently_used():
+	cache = ScheduleCache(max_entries=2)
+	cache.put("a", {"data": 1})
+	cache.put("b", {"data": 2})
+	assert cache.get("a") == {"data": 1}
+	cache.put("c", {"data": 3})
+	assert cache.get("b") is None
+	assert cache.get("a") == {"data": 1} and cache.get("c") == {"data": 3}
+	assert len(cache) == 2
+	assert (cache.hits, cache.misses) == (3, 1)
+	cache.discard("a")
+	cache.discard("missing")
+	assert list(cache.entries) == ["c"]
+	with pytest.raises(ValueError):
+		ScheduleCache(max_entries=0)
+
+
+def test_case_hash_follows_inputs_and_salt(tmp_path):
+	shutil.copytree("./data/case1", tmp_path / "case1")
+	key = case_input_hash("case1", "2.0", "python", data_dir=tmp_path)
+	assert key == case_input_hash("case1", "2.0", "python", data_dir=tmp_path)
+	assert key != case_input_hash("case1", "2.1", "python", data_dir=tmp_path)
+
+	# The previous schedule is an output: changing it keeps the key
+	(tmp_path / "case1" / "schedule.csv").write_text("")
+	assert key == case_input_hash("case1", "2.0", "python", data_dir=tmp_path)
+
+	with open(tmp_path / "case1" / "team.csv", "a") as team_file:
+		team_file.write("\n")
+	assert key != case_input_hash("case1", "2.0", "python", data_dir=tmp_path)
+
+	with pytest.raises(FileNotFoundError):
+		case_input_hash("missing", data_dir=tmp_path)
+
+
+def test_state_writes_drop_the_cached_schedule(monkeypatch):
+	executor = ThreadPoolExecutor(max_workers=1)
+	monkeypatch.setattr(api, "get_scheduler_pool", lambda: executor)
+	monkeypatch.setenv("LANGUAGE", "python")
+	api.schedule_cache.clear()
+	try:
+		with TestClient(api.app) as client:
+			assert client.get("/schedule", params={"case": "case1"}).json()["status"] == 200
+			key = api.schedule_cache_key("case1", "python")
+			assert key in api.schedule_cache.entries
+
+			assert client.post("/state", params={"case": "case1"}).json()["status"] == 200
+			assert key not in api.schedule_cache.entries
+	finally:
+		executor.shutdown()
+		api.schedule_states.pop("case1", None)
+
+
+def test_finished_jobs_drop_the_cached_schedule(monkeypatch):
+	executor = ThreadPoolExecutor(max_workers=1)
+	monkeypatch.setattr(api, "get_scheduler_pool", lambda: executor)
+	monkeypatch.setattr(api.job_manager, "get_executor", lambda: executor)
+	monkeypatch.setenv("LANGUAGE", "python")
+	api.schedule_cache.clear()
+	try:
+		with TestClient(api.app) as client:
+			assert client.get("/schedule", params={"case": "case1"}).json()["status"] == 200
+			key = api.schedule_cache_key("case1", "python")
+			assert key in api.schedule_cache.entries
+
+			job = client.post("/jobs", params={"case": "case1", "strategy": "matching"}).json()["data"]
+			while job["status"] in ("queued", "running"):
+				time.sleep(0.05)
+				job = client.get(f"/jobs/{job['id']}").json()["data"]
+			assert job["status"] == "done"
+			assert key not in api.schedule_cache.entries
+	finally:
+		executor.shutdown()
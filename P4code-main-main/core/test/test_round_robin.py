@@ -0,0 +1,39 @@
+import pytest
+from itertools import combinations
+from core.py.round_robin import round_robin_rounds
+
+
+@pytest.mark.parametrize("team_count", [2, 3, 8, 15, 16])
+def test_rounds_cover_every_pair_once(team_count):
+	teams = [f"Team {i}" for i in range(1, team_count + 1)]
+	rounds = round_robin_rounds(teams)
+
+	assert len(rounds) == team_count - 1 + team_count % 2
+	played = [frozenset(matchup) for matchups in rounds for matchup in matchups]
+	assert sorted(played, key=sorted) == sorted((frozenset(pair) for pair in combinations(teams, 2)), key=sorted)
+	for matchups in rounds:
+		teams_in_round = [team for matchup in matchups for team in matchup]
+		assert len(teams_in_round) == len(set(teams_in_round))
+		assert len(matchups) == team_count // 2
+
+
+@pytest.mark.parametrize("team_count", [4, 6, 10, 5, 7, 11])
+def test_each_team_plays_at_most_once_per_round(team_count):
+	teams = [f"Team {i}" for i in range(1, team_count + 1)]
+	rounds = round_robin_rounds(teams)
+
+	sitting_out = []
+	for matchups in rounds:
+		appearances = {team: 0 for team in teams}
+		for team1, team2 in matchups:
+			appearances[team1] += 1
+			appearances[team2] += 1
+		assert max(appearances.values()) == 1
+		sitting_out += [team for team, count in appearances.items() if count == 0]
+
+	if team_count % 2 == 0:
+		# Every team plays in every round
+		assert sitting_out == []
+	else:
+		# One bye per round, and every team gets exactly one
+		assert sorted(sitting_out) == sorted(teams)
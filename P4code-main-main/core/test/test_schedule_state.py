@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import pandas as pd
+from fastapi.testclient import TestClient
+from routes import api
+from core.py.interval_tree import Interval
+from core.py.schedule_state import ScheduleState
+
+
+def assert_consistent(state):
+	"""The games must not double-book a field or a team day, and must match the occupancy indexes."""
+	df = pd.DataFrame(state.games)
+	assert not df.duplicated(["location", "season", "week", "day", "start"]).any()
+	team_days = pd.concat([df[["team1Name", "season", "week", "day"]].set_axis(["team", "season", "week", "day"], axis=1),
+	                       df[["team2Name", "season", "week", "day"]].set_axis(["team", "season", "week", "day"], axis=1)])
+	assert not team_days.duplicated().any()
+	assert sum(state.team_daily_count.values()) == len(team_days)
+	assert len(state.bookings) == len(state.games)
+
+
+@pytest.fixture(params=["tree", "avl"])
+def state(request):
+	return ScheduleState.from_case("case5", engine=request.param)
+
+
+def test_from_case_matches_the_scheduler(state):
+	assert len(state.games) >= 104
+	assert_consistent(state)
+
+
+def test_remove_game_frees_its_slot(state):
+	game = state.games[0]
+	removed = state.remove_game(game["team2Name"], game["team1Name"], game["season"], game["week"], game["day"])
+	assert removed is game
+	assert game not in state.games
+	assert_consistent(state)
+	with pytest.raises(KeyError):
+		state.remove_game(game["team1Name"], game["team2Name"], game["season"], game["week"], game["day"])
+
+
+def test_block_field_window_replaces_displaced_games(state):
+	game = state.games[0]
+	resource, _ = state.bookings[0]
+	count = len(state.games) + len(state.unscheduled)
+
+	displaced, replaced = state.block_window(resource, game["season"], game["week"], game["day"], game["start"], game["end"])
+	assert displaced == [game]
+	assert len(state.games) + len(state.unscheduled) == count
+	for other in state.games:
+		assert not (other["location"] == game["location"] and other["season"] == game["season"]
+		            and other["week"] == game["week"] and other["day"] == game["day"] and other["start"] == game["start"])
+	assert_consistent(state)
+
+
+def test_block_window_of_a_team_without_games(state):
+	idle = ScheduleState(state.case, state.team_df, state.venue_df, state.league_df, state.engine)
+	team = state.team_df["name"].iloc[0]
+	assert team not in idle.team_interval_map
+
+	displaced, replaced = idle.block_window(team, 2024, 1, 1, 9, 21)
+	assert displaced == [] and replaced == []
+	assert idle.team_interval_map[team].any_overlap(Interval(start=10, end=12, day=1, week=1, season=2024))
+	with pytest.raises(KeyError):
+		idle.block_window("No Such Team", 2024, 1, 1, 9, 21)
+
+
+def test_add_and_remove_team(state):
+	league_teams = state.team_df[state.team_df["leagueId"] == 1]
+	team = league_teams.iloc[0].to_dict()
+	team.update(name="Late Entrants", teamId=999)
+
+	placed = state.add_team(team)
+	assert placed and all("Late Entrants" in (game["team1Name"], game["team2Name"]) for game in placed)
+	assert_consistent(state)
+	with pytest.raises(ValueError):
+		state.add_team(team)
+
+	removed = state.remove_team("Late Entrants")
+	assert len(removed) == len(placed)
+	assert all("Late Entrants" not in (game["team1Name"], game["team2Name"]) for game in state.games)
+	assert_consistent(state)
+
+
+def test_state_round_trips_through_json(state, tmp_path):
+	team = state.team_df["name"].iloc[0]
+	state.block_window(team, 2024, 1, 1, 9, 21)
+	path = tmp_path / "state.json"
+	state.save(path)
+	loaded = ScheduleState.load(path)
+
+	assert loaded.games == state.games and loaded.unscheduled == state.unscheduled
+	assert loaded.team_daily_count == state.team_daily_count
+	assert [resource for resource, _ in loaded.bookings] == [resource for resource, _ in state.bookings]
+	pd.testing.assert_frame_equal(loaded.team_df, state.team_df)
+	pd.testing.assert_frame_equal(loaded.venue_df, state.venue_df)
+	# The blocked window survives, so no game can be placed in it
+	assert loaded.team_interval_map[team].any_overlap(Interval(start=10, end=12, day=1, week=1, season=2024))
+
+	# Both states keep evolving the same way
+	game = loaded.games[0]
+	for changed in (state, loaded):
+		changed.remove_game(game["team1Name"], game["team2Name"], game["season"], game["week"], game["day"])
+	assert loaded.retry_unscheduled() == state.retry_unscheduled()
+	assert_consistent(loaded)
+
+
+def test_state_endpoints_reject_unknown_cases(tmp_path):
+	# A state file outside ./data must never be loaded
+	(tmp_path / "state.json").write_text("{}")
+	outside = f"../../{tmp_path}"
+	with TestClient(api.app) as client:
+		assert client.post("/state", params={"case": outside}).status_code == 404
+		assert client.post("/state/remove-team", params={"case": outside, "team": "A"}).status_code == 404
+		assert client.post("/state/remove-team", params={"case": "no-such-case", "team": "A"}).status_code == 404
+	assert outside not in api.schedule_states
+
+
+def test_state_endpoints_build_on_the_scheduler_pool(monkeypatch):
+	executor = ThreadPoolExecutor(max_workers=1)
+	submitted = []
+	def get_pool():
+		submitted.append(True)
+		return executor
+	monkeypatch.setattr(api, "get_scheduler_pool", get_pool)
+	try:
+		with TestClient(api.app) as client:
+			built = client.post("/state", params={"case": "case5"}).json()
+			team = api.schedule_states["case5"].team_df["name"].iloc[0]
+			blocked = client.post("/state/block-team", params={"case": "case5", "team": team, "season": 2024,
+			                                                   "week": 1, "day": 1, "start": 0, "end": 23.5}).json()
+			removed = client.post("/state/remove-team", params={"case": "case5", "team": team}).json()
+			assert client.post("/state/remove-team", params={"case": "case5", "team": team}).status_code == 404
+	finally:
+		executor.shutdown()
+		api.schedule_states.pop("case5", None)
+
+	assert submitted
+	assert built["status"] == blocked["status"] == removed["status"] == 200
+	assert removed["data"]["games"] < built["data"]["games"]
+	assert_consistent(ScheduleState.load(ScheduleState.state_path("case5")))
@@ -0,0 +1,55 @@
+import pandas as pd
+from fastapi.testclient import TestClient
+from routes import api
+from core.py.scheduler import Scheduler
+from routes.store import ScheduleStore, venue_name
+
+
+def test_store_queries_match_pandas_filters():
+	case = "case6"
+	assert Scheduler.run(case) == 0
+	df = pd.read_csv(f"./data/{case}/schedule.csv")
+	store = ScheduleStore.from_csv(f"./data/{case}/schedule.csv")
+	assert len(store) == len(df)
+
+	team = df["team1Name"].iloc[0]
+	league = df["league"].iloc[-1]
+	venue = venue_name(df["location"].iloc[0])
+	filters = [
+		({"team": team}, (df["team1Name"] == team) | (df["team2Name"] == team)),
+		({"league": league, "day": 3}, (df["league"] == league) & (df["day"] == 3)),
+		({"venue": venue, "week_from": 30, "week_to": 40},
+		 (df["location"].map(venue_name) == venue) & df["week"].between(30, 40)),
+		({"team": "Nobody"}, df["week"] < 0),
+	]
+	for query, mask in filters:
+		games, _, total = store.query(limit=len(df) + 1, **query)
+		assert total == mask.sum()
+		expected = df[mask].sort_values(["season", "week", "day", "start"], kind="stable")
+		assert [(game["team1Name"], game["week"], game["day"]) for game in games] == \
+			list(expected[["team1Name", "week", "day"]].itertuples(index=False, name=None))
+
+
+def test_store_cursor_pagination_covers_every_game_once():
+	games = [{"team1Name": f"T{i % 4}", "team2Name": f"T{i % 4 + 4}", "week": i // 3 + 1, "day": i % 3 + 1,
+	          "start": 9, "end": 11, "season": 2024, "league": "L", "location": "Park Field #1"} for i in range(25)]
+	store = ScheduleStore(games)
+
+	pages, cursor = [], None
+	while True:
+		page, cursor, total = store.query(team="T1", limit=2, cursor=cursor)
+		pages.append(page)
+		if cursor is None:
+			break
+	seen = [game for page in pages for game in page]
+	assert total == len(seen) == sum(game["team1Name"] == "T1" for game in games)
+	assert all(len(page) == 2 for page in pages[:-1])
+	assert seen == sorted(seen, key=lambda game: (game["week"], game["day"]))
+
+
+def test_games_endpoint_rejects_unknown_cases():
+	with TestClient(api.app) as client:
+		for case in ("no-such-case", "../data/case8", "case8/"):
+			response = client.get("/schedule/games", params={"case": case})
+			assert response.status_code == 404 and response.json()["detail"] == f"Unknown case {case}"
+		assert client.get("/schedule/games", params={"case": "case8", "limit": 5}).json()["status"] == 200
@@ -0,0 +1,31 @@
+import pytest
+import pandas as pd
+from core.py.slot_catalogue import SlotCatalogue
+
+
+@pytest.mark.parametrize("case", ["case1", "case5", "case6"])
+def test_catalogue_matches_venue_scan(case):
+	venue_df = pd.read_csv(f"./data/{case}/venue.csv")
+
+	# Reference: the week/day/venue/slot/field scan the scheduler used to do over the DataFrame.
+	expected = []
+	for week in range(1, 53):
+		for day in range(1, 8):
+			for venue, venue_row in venue_df.iterrows():
+				if not venue_row["seasonStart"] <= week <= venue_row["seasonEnd"]:
+					continue
+				start = venue_row[f"d{day}Start"]
+				while start + 2 <= venue_row[f"d{day}End"]:
+					expected.append((week, day, start, start + 2, venue, venue_row["field"]))
+					start += 2
+
+	catalogue = SlotCatalogue(venue_df, 2)
+	assert list(catalogue.slots()) == expected
+	assert len(catalogue) == len(expected)
+
+
+def test_catalogue_resources_are_per_venue_field():
+	venue_df = pd.read_csv("./data/generated/venue.csv")
+	catalogue = SlotCatalogue(venue_df, 2)
+	assert len(set(catalogue.venue_resources)) == len(venue_df)
+	assert catalogue.venue_resources[0] == (venue_df["venueId"].iloc[0], venue_df["field"].iloc[0])
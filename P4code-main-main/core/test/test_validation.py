@@ -0,0 +1,71 @@
+import pandas as pd
+from core.py.scheduler import Scheduler
+from core.py.loader import load_case
+from core.py.validation import validate_schedule
+
+
+def test_scheduler_output_passes_validation():
+	case = "case6"
+	assert Scheduler.run(case) == 0
+	result = validate_schedule(case, min_games=136)
+	assert result.passed, result.summary()
+	assert [check["name"] for check in result.checks] == ["game_count", "field_overlap", "team_overlap", "team_once_per_day",
+	                                                      "venue_window", "team_availability"]
+	assert all(check["violations"] == 0 for check in result.checks[1:])
+
+
+def test_validation_reports_every_failure():
+	schedule_df = pd.DataFrame([
+		{"team1Name": "A", "team2Name": "B", "week": 1, "day": 1, "start": 9, "end": 11, "season": 2024, "location": "Park Field #1"},
+		{"team1Name": "C", "team2Name": "A", "week": 1, "day": 1, "start": 10, "end": 12, "season": 2024, "location": "Park Field #1"},
+		{"team1Name": "D", "team2Name": "E", "week": 1, "day": 1, "start": 12, "end": 14, "season": 2024, "location": "Park Field #1"},
+	])
+	result = validate_schedule("case1", schedule_df, min_games=28)
+	assert not result.passed
+	# Neither the teams nor the venue are in case1's inputs
+	assert {check["name"] for check in result.failures()} == {"game_count", "field_overlap", "team_overlap", "team_once_per_day",
+	                                                          "venue_window", "team_availability"}
+	assert "1 games overlap" in result.summary()
+
+	assert validate_schedule("custom", schedule_df.drop(index=1)).passed
+
+
+def test_validation_locates_input_violations():
+	inputs = load_case("case5")
+	team, venue = inputs.team_df.iloc[0], inputs.venue_df.iloc[0]
+	opponent = inputs.team_df["name"].iloc[1]
+	location = f"{venue['name']} Field #{venue['field']}"
+	day = next(day for day in range(1, 8) if venue[f"d{day}End"] - venue[f"d{day}Start"] >= 2)
+	start = float(venue[f"d{day}Start"])
+	game = {"team1Name": team["name"], "team2Name": opponent, "week": int(venue["seasonStart"]), "day": day,
+	        "start": start, "end": start + 2, "season": int(venue["seasonYear"]), "league": "x", "location": location}
+	schedule_df = pd.DataFrame([
+		game,
+		{**game, "week": int(venue["seasonEnd"]) + 1},
+		{**game, "week": game["week"] + 1, "start": float(venue[f"d{day}End"]) - 1, "end": float(venue[f"d{day}End"]) + 1},
+		{**game, "week": game["week"] + 2, "team2Name": "Nobody"},
+	])
+	result = validate_schedule("custom", schedule_df, inputs=inputs, team_availability=False)
+	checks = {check["name"]: check for check in result.checks}
+	assert checks["venue_window"]["rows"] == [1, 2]
+	assert "team_availability" not in checks
+
+	result = validate_schedule("custom", schedule_df, inputs=inputs)
+	checks = {check["name"]: check for check in result.to_dict()["checks"]}
+	assert 3 in checks["team_availability"]["rows"]
+	assert checks["team_overlap"]["violations"] == 0
+
+
+def test_overlaps_are_reported_by_row():
+	schedule_df = pd.DataFrame([
+		{"team1Name": "A", "team2Name": "B", "week": 1, "day": 1, "start": 9, "end": 13, "season": 2024, "location": "Park Field #1"},
+		{"team1Name": "C", "team2Name": "D", "week": 1, "day": 1, "start": 10, "end": 11, "season": 2024, "location": "Park Field #1"},
+		{"team1Name": "E", "team2Name": "F", "week": 1, "day": 1, "start": 12, "end": 14, "season": 2024, "location": "Park Field #1"},
+		{"team1Name": "G", "team2Name": "H", "week": 1, "day": 1, "start": 14, "end": 16, "season": 2024, "location": "Park Field #1"},
+		{"team1Name": "A", "team2Name": "C", "week": 1, "day": 1, "start": 12, "end": 14, "season": 2024, "location": "Park Field #2"},
+	])
+	checks = {check["name"]: check for check in validate_schedule("custom", schedule_df).checks}
+	# Game 2 overlaps game 0, which ends after game 1 does
+	assert checks["field_overlap"]["rows"] == [1, 2]
+	assert checks["team_overlap"]["rows"] == [4]
+	assert checks["team_once_per_day"]["rows"] == [4]
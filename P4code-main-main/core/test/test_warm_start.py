@@ -0,0 +1,50 @@
+import pandas as pd
+from collections import defaultdict
+from core.py.availability import TeamAvailability
+from core.py.scheduler import Scheduler
+from core.py.slot_catalogue import SlotCatalogue
+
+
+def test_warm_start_keeps_an_unchanged_schedule():
+	case = "case5"
+	assert Scheduler.run(case) == 0
+	cold = pd.read_csv(f"./data/{case}/schedule.csv")
+	assert Scheduler.run(case, warm_start=True) == 0
+	warm = pd.read_csv(f"./data/{case}/schedule.csv")
+	pd.testing.assert_frame_equal(cold, warm)
+
+
+def test_warm_start_drops_invalid_games(tmp_path):
+	case = "case5"
+	assert Scheduler.run(case) == 0
+	previous = pd.read_csv(f"./data/{case}/schedule.csv")
+
+	# Game 0 moves to a field that does not exist, game 1 is booked twice,
+	# game 2 moves to a week outside the season calendar
+	tampered = previous.copy()
+	tampered.loc[0, "location"] = "Nowhere Field #1"
+	tampered = pd.concat([tampered, tampered.iloc[[1]]], ignore_index=True)
+	tampered.loc[2, "week"] = 53
+	path = tmp_path / "schedule.csv"
+	tampered.to_csv(path, index=False)
+
+	team_df = pd.read_csv(f"./data/{case}/team.csv")
+	league_df = pd.read_csv(f"./data/{case}/league.csv")
+	catalogue = SlotCatalogue(pd.read_csv(f"./data/{case}/venue.csv"), Scheduler.GAME_DURATION)
+	league_matchups = Scheduler.league_matchups(case, team_df, league_df)
+	team_interval_map = {team: Scheduler.ENGINES["tree"]() for team in team_df["name"]}
+	games = []
+
+	kept, remaining = Scheduler.warm_start_games(
+		path, league_matchups, catalogue, defaultdict(Scheduler.ENGINES["tree"]), team_interval_map, {}, games,
+		TeamAvailability(team_df)
+	)
+	assert len(kept) == len(games) == len(previous) - 2
+	matchup_count = sum(len(matchups) for _, matchups in league_matchups)
+	assert sum(len(matchups) for _, matchups in remaining) == matchup_count - len(kept)
+
+
+def test_warm_start_without_previous_schedule(tmp_path):
+	kept, remaining = Scheduler.warm_start_games(tmp_path / "missing.csv", [("League", [("A", "B", 0)])],
+	                                             None, None, None, None, [])
+	assert kept == [] and remaining == [("League", [("A", "B", 0)])]
@@ -0,0 +1,47 @@
+import pytest
+from core.py.loader import load_case
+from core.py.workload import TEAM_NOUNS, city_pool, generate_workload, write_workload
+
+
+def test_workload_is_deterministic_and_sized():
+	frames = generate_workload(teams=300, leagues=7, venues=40, fields=3, seed=4)
+	again = generate_workload(teams=300, leagues=7, venues=40, fields=3, seed=4)
+	for name in ("team", "venue", "league"):
+		assert frames[name].equals(again[name])
+	assert not frames["team"].equals(generate_workload(teams=300, leagues=7, venues=40, fields=3, seed=5)["team"])
+
+	team_df, venue_df, league_df = frames["team"], frames["venue"], frames["league"]
+	assert len(team_df) == 300 and len(league_df) == 7
+	assert team_df["leagueId"].value_counts().tolist() == league_df["leagueSize"].sort_values(ascending=False).tolist()
+	assert venue_df["venueId"].nunique() == 40
+	assert venue_df.groupby("venueId")["field"].max().between(1, 3).all()
+	assert not venue_df.duplicated(["venueId", "field"]).any()
+	for day in range(1, 8):
+		assert (team_df[f"d{day}Start"] <= team_df[f"d{day}End"]).all()
+		assert (team_df[f"d{day}End"] <= 23.5).all() and (team_df[f"d{day}Start"] * 2 % 1 == 0).all()
+
+
+def test_team_names_stay_unique_beyond_the_name_pool():
+	teams = len(city_pool(0)) * len(TEAM_NOUNS) + 10
+	names = generate_workload(teams=teams, leagues=50, venues=10)["team"]["name"]
+	assert names.is_unique
+	assert names.str.endswith(" 2").sum() == 10
+
+
+def test_injected_errors_are_quarantined(tmp_path):
+	frames = generate_workload(teams=400, leagues=8, venues=60, error_rate=0.1, seed=2)
+	write_workload(frames, tmp_path / "stress")
+	inputs = load_case("stress", data_dir=tmp_path)
+	assert len(inputs.report) > 0
+	assert 0 < len(frames["team"]) - len(inputs.team_df) < 80
+	assert len(inputs.venue_df) < len(frames["venue"])
+
+	write_workload(generate_workload(teams=400, leagues=8, venues=60, seed=2), tmp_path / "clean")
+	assert len(load_case("clean", data_dir=tmp_path).report) == 0
+
+
+def test_invalid_arguments():
+	with pytest.raises(ValueError):
+		generate_workload(teams=0)
+	with pytest.raises(ValueError):
+		generate_workload(density=1.5)
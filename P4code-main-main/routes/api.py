@@ -1,3 +1,4 @@
+import asyncio
 import csv
 import os
 import re
@@ -5,17 +6,27 @@ import json
 import urllib.parse
 import importlib
 import pandas as pd
-import subprocess
+import time
 
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from urllib.parse import urlencode
 from pathlib import Path
-from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect, Form
+from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect, Form, Body
 from starlette.requests import Request
-from starlette.responses import HTMLResponse, JSONResponse, RedirectResponse
+from starlette.responses import HTMLResponse, JSONResponse, PlainTextResponse, RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from jinja2 import Environment, FileSystemLoader
 from fastapi.staticfiles import StaticFiles
 from core.py.scheduler import Scheduler
+from core.py.schedule_state import ScheduleState
+from core.py.validation import validate_schedule
+from core.py import columnar
+from routes.cache import INPUT_FILES, ScheduleCache, case_input_hash
+from routes.export import gzip_stream, iter_csv, iter_ndjson
+from routes.jobs import CaseLocks, JobManager
+from routes.metrics import CONTENT_TYPE, RUN_BUCKETS, EventLoopMonitor, MetricsRegistry
+from routes.store import ScheduleStoreCache
 
 app = FastAPI()
 environment = "local"
@@ -25,6 +36,128 @@ authenticated = False
 templates = Jinja2Templates(directory="public/template")
 app.mount("/asset", StaticFiles(directory="public/asset"), name="asset")
 
+# /schedule results by content hash of the case inputs, scheduler version and language
+schedule_cache = ScheduleCache(max_entries=int(os.getenv("SCHEDULE_CACHE_SIZE", "32")))
+
+# Implementations of the scheduler /schedule can run, picked with the LANGUAGE environment variable
+SCHEDULER_LANGUAGES = ("python", "java", "cpp")
+
+def schedule_cache_key(case, language):
+    """Return the /schedule cache key of a case's current inputs, or None if an input file is missing."""
+    try:
+        return case_input_hash(case, Scheduler.VERSION, language)
+    except FileNotFoundError:
+        return None
+
+def discard_cached_schedules(case):
+    """Drop the cached /schedule results of a case, once a /state change or a job rewrote its schedule files."""
+    for language in SCHEDULER_LANGUAGES:
+        schedule_cache.discard(schedule_cache_key(case, language))
+
+# Worker processes running the Python scheduler, started on first use and kept warm
+scheduler_pool = None
+
+def warm_scheduler_worker():
+    """Import the scheduler and its dependencies (pandas, numpy) once per worker process."""
+    importlib.import_module("core.py.scheduler")
+
+def get_scheduler_pool():
+    global scheduler_pool
+    if scheduler_pool is None:
+        scheduler_pool = ProcessPoolExecutor(max_workers=int(os.getenv("SCHEDULER_WORKERS", "2")),
+                                             initializer=warm_scheduler_worker)
+    return scheduler_pool
+
+def reset_scheduler_pool(pool):
+    """Drop a broken pool, so the next get_scheduler_pool call starts a fresh one."""
+    global scheduler_pool
+    if scheduler_pool is pool:
+        scheduler_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+async def run_in_scheduler_pool(function, *args):
+    """Run a function on the scheduler pool; if a worker crash broke the pool, rebuild it and retry once."""
+    loop = asyncio.get_running_loop()
+    pool = get_scheduler_pool()
+    try:
+        return await loop.run_in_executor(pool, function, *args)
+    except BrokenProcessPool:
+        reset_scheduler_pool(pool)
+        return await loop.run_in_executor(get_scheduler_pool(), function, *args)
+
+# Indexed schedules for /schedule/games, reloaded when a schedule.csv changes
+schedule_stores = ScheduleStoreCache()
+
+# Operational metrics, scraped from /metrics
+metrics = MetricsRegistry()
+http_requests = metrics.counter("http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+http_request_duration = metrics.histogram("http_request_duration_seconds", "Time to handle an HTTP request (up to the response headers)",
+                                          ("method", "route"))
+scheduler_runs = metrics.counter("scheduler_runs_total", "Scheduler runs of /schedule", ("case", "language", "outcome"))
+scheduler_run_duration = metrics.histogram("scheduler_run_duration_seconds", "Run time of the scheduler for /schedule",
+                                           ("case", "language"), RUN_BUCKETS)
+scheduler_job_duration = metrics.histogram("scheduler_job_duration_seconds", "Time from submitting a job to its completion",
+                                           ("case", "status"), RUN_BUCKETS)
+metrics.counter("schedule_cache_lookups_total", "Lookups of the /schedule result cache", ("result",)).set_function(
+    lambda: {("hit",): schedule_cache.hits, ("miss",): schedule_cache.misses})
+metrics.gauge("schedule_cache_entries", "Results held by the /schedule result cache").set_function(
+    lambda: len(schedule_cache.entries))
+metrics.gauge("scheduler_jobs", "Scheduling jobs remembered, by status", ("status",)).set_function(
+    lambda: {(status,): sum(job.status == status for job in job_manager.jobs.values())
+             for status in ("queued", "running", "done", "failed")})
+event_loop_monitor = EventLoopMonitor(metrics.histogram("event_loop_lag_seconds", "How late the event loop wakes up a sleeping task"))
+
+def is_known_case(case):
+    """Check that a case names a directory of ./data holding every input file of a case."""
+    return (case not in ("", ".", "..") and os.path.basename(case) == case
+            and all(os.path.isfile(f"./data/{case}/{name}") for name in INPUT_FILES))
+
+def case_label(case):
+    """Return the metric label of a case; unknown names share one label so they cannot add series."""
+    return case if is_known_case(case) else "unknown"
+
+def record_scheduler_job(job):
+    scheduler_job_duration.observe(job.finished_at - job.created, case=case_label(job.case), status=job.status)
+
+def finish_scheduler_job(job):
+    """Record a finished job, and drop the cached /schedule results of the schedule files it replaced."""
+    record_scheduler_job(job)
+    discard_cached_schedules(job.case)
+
+# Held while a case's schedule files are written: /schedule, jobs and /state never write the same case at once
+case_locks = CaseLocks()
+
+# Background scheduling jobs, run on the scheduler pool (see /jobs)
+job_manager = JobManager(get_scheduler_pool, on_finished=finish_scheduler_job, case_locks=case_locks,
+                         reset_executor=reset_scheduler_pool)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    event_loop_monitor.start()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, so /jobs/{job_id} is one series
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        http_request_duration.observe(time.perf_counter() - started, method=request.method, route=path)
+        http_requests.inc(method=request.method, route=path, status=status)
+
+@app.get("/metrics")
+async def read_metrics():
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
+@app.on_event("shutdown")
+def shutdown_scheduler_pool():
+    event_loop_monitor.stop()
+    job_manager.shutdown()
+    if scheduler_pool is not None:
+        scheduler_pool.shutdown(cancel_futures=True)
+
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
@@ -61,37 +194,238 @@ async def read_schedule(request: Request):
 @app.get("/schedule", response_class=JSONResponse)
 async def schedule(request: Request, case: str = Query(...)): # case input param
     language = os.getenv("LANGUAGE")
+    if not is_known_case(case):
+        return JSONResponse({"status": 404, "msg": f"Unknown case {case}", "data": []})
+
+    # Serve the stored result when neither the inputs nor the scheduler changed
+    cache_key = schedule_cache_key(case, language)
+    cached = schedule_cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        return JSONResponse(cached)
+
+    if language not in SCHEDULER_LANGUAGES:
+        return JSONResponse({"status": 500, "msg": "Language not supported", "data": []})
+
+    # Hold the case's lock until the schedule is read back, so no job or /state write replaces it meanwhile
+    async with case_locks.get(case):
+        started = time.perf_counter()
+        if language == "python":
+            # Run in a warm worker process: no interpreter start-up, and the event loop stays free
+            exit_code = await run_in_scheduler_pool(Scheduler.run, case)
+        elif language == "java":
+            exit_code = await asyncio.to_thread(os.system, f"./bin/java/schedule {case}")
+        else:
+            exit_code = await asyncio.to_thread(os.system, f"./bin/cpp/schedule {case}")
+        scheduler_run_duration.observe(time.perf_counter() - started, case=case_label(case), language=language)
+        scheduler_runs.inc(case=case_label(case), language=language, outcome="success" if exit_code == 0 else "error")
+
+        path = f"./data/{case}/schedule.csv"
+        if not os.path.exists(path):
+            return JSONResponse({"status": 500, "msg": f"Error generating schedule for {case}", "data": [], "test_status": "failure", "test_msg": "Error running Scheduler"})
+
+        try:
+            df = columnar.read_schedule(path)
+            json_data = df.to_dict(orient="records")
+        except:
+            return JSONResponse({"status": 500, "msg": f"Error generating schedule for {case}. CSV output file empty.", "data": [], "test_status": "failure", "test_msg": "Empty CSV data"})
+
+    validation = validate_schedule(case, df)
+    test_status = "success" if validation.passed else "failure"
+    test_message = validation.summary()
+
+    if exit_code != 0:
+        return JSONResponse({"status": 500, "msg": f"Error generating schedule for {case}", "data": [], "test_status": "failure", "test_msg": "Error running Scheduler"})
     
-    if language == "python":
-        exit_code = os.system(f"./bin/py/schedule {case}")
-    elif language == "java":
-        exit_code = os.system(f"./bin/java/schedule {case}")
-    elif language == "cpp":
-        exit_code = os.system(f"./bin/cpp/schedule {case}")
-    else:
-        return JSONResponse({"status": 500, "msg": "Language not supported", "data": json_data})
+    result = {"status": 200, "msg": f"Schedule successfully retrieved for {case}", "data": json_data, "test_status": test_status, "test_msg": test_message, "validation": validation.to_dict()}
+    if cache_key:
+        schedule_cache.put(cache_key, result)
+    return JSONResponse(result)
 
+
+@app.get("/schedule/games", response_class=JSONResponse)
+async def schedule_games(case: str = Query(...), team: str = Query(None), league: str = Query(None),
+                         venue: str = Query(None), season: int = Query(None), week_from: int = Query(None),
+                         week_to: int = Query(None), day: int = Query(None, ge=1, le=7),
+                         cursor: int = Query(None), limit: int = Query(50, ge=1, le=1000)):
+    # Serves a filtered page of the last schedule of a case; pass next_cursor back as cursor for the next page
+    if not is_known_case(case):
+        raise HTTPException(status_code=404, detail=f"Unknown case {case}")
+    try:
+        store = schedule_stores.get(case)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"No schedule for {case}, run /schedule?case={case} first")
+    games, next_cursor, total = store.query(team=team, league=league, venue=venue, season=season, week_from=week_from,
+                                            week_to=week_to, day=day, cursor=cursor, limit=limit)
+    return JSONResponse({"status": 200, "msg": f"{len(games)} of {total} games for {case}", "data": games,
+                         "next_cursor": next_cursor, "total": total})
+
+
+# Streamed export formats: (row generator, media type, file extension)
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv", "csv"),
+    "ndjson": (iter_ndjson, "application/x-ndjson", "ndjson"),
+}
+
+@app.get("/schedule/export")
+async def export_schedule(case: str = Query(...), format: str = Query("csv"), compress: bool = Query(False)):
+    # Streams the whole last schedule of a case from disk, so memory stays flat whatever its size
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{format}', expected one of {list(EXPORT_FORMATS)}")
+    if not is_known_case(case):
+        raise HTTPException(status_code=404, detail=f"Unknown case {case}")
     path = f"./data/{case}/schedule.csv"
     if not os.path.exists(path):
-        return JSONResponse({"status": 500, "msg": f"Error generating schedule for {case}", "data": [], "test_status": "failure", "test_msg": "Error running Scheduler"})
+        raise HTTPException(status_code=404, detail=f"No schedule for {case}, run /schedule?case={case} first")
+
+    iter_rows, media_type, extension = EXPORT_FORMATS[format]
+    chunks = iter_rows(path)
+    filename = f"{case}-schedule.{extension}"
+    if compress:
+        chunks = gzip_stream(chunks)
+        media_type = "application/gzip"
+        filename += ".gz"
+    return StreamingResponse(chunks, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+# In-memory schedule states by case, persisted to ./data/{case}/state.json after every change
+schedule_states = {}
+
+def get_schedule_state(case):
+    """Return the schedule state of a case, loading it from disk if needed (404 if never built)."""
+    if not is_known_case(case):
+        raise HTTPException(status_code=404, detail=f"Unknown case {case}")
+    if case not in schedule_states:
+        try:
+            schedule_states[case] = ScheduleState.load(ScheduleState.state_path(case))
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail=f"No schedule state for {case}, POST /state?case={case} first")
+    return schedule_states[case]
+
+def write_schedule_state(state):
+    """Persist a schedule state and write its schedule files."""
+    state.save()
+    state.save_schedule()
+
+def apply_schedule_state_change(case, change):
+    """Apply a change to the schedule state of a case and persist it; returns (state, result of change)."""
+    state = get_schedule_state(case)
+    result = change(state)
+    write_schedule_state(state)
+    return state, result
+
+async def change_schedule_state(case, change):
+    """
+    Apply a change to the schedule state of a case in a worker thread, under the case's lock.
+
+    The cached /schedule results of the case no longer describe its schedule files, so they are dropped.
+    """
+    async with case_locks.get(case):
+        state, result = await asyncio.to_thread(apply_schedule_state_change, case, change)
+        discard_cached_schedules(case)
+    return state, result
+
+def schedule_state_response(state, msg, **data):
+    return JSONResponse({"status": 200, "msg": msg, "data": {"games": len(state.games), "unscheduled": len(state.unscheduled), **data}})
+
+@app.post("/state", response_class=JSONResponse)
+async def build_state(case: str = Query(...), engine: str = Query("tree")):
+    if not is_known_case(case):
+        raise HTTPException(status_code=404, detail=f"Unknown case {case}")
+    async with case_locks.get(case):
+        # A full scheduling pass: run it on the scheduler pool, not on the event loop
+        try:
+            state = await run_in_scheduler_pool(ScheduleState.from_case, case, engine)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=f"Error loading files for {case}: {e}")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=e.args[0])
+        schedule_states[case] = state
+        await asyncio.to_thread(write_schedule_state, state)
+        discard_cached_schedules(case)
+    return schedule_state_response(state, f"Schedule state built for {case}")
 
+@app.post("/state/remove-game", response_class=JSONResponse)
+async def state_remove_game(case: str = Query(...), team1: str = Query(...), team2: str = Query(...),
+                            season: int = Query(...), week: int = Query(...), day: int = Query(...)):
     try:
-        df = pd.read_csv(path)
-        json_data = df.to_dict(orient="records")
-    except:
-        return JSONResponse({"status": 500, "msg": f"Error generating schedule for {case}. CSV output file empty.", "data": [], "test_status": "failure", "test_msg": "Empty CSV data"})        
-    
-    test_status = "Failed"
-    test_message = f"Error running {case} test!"
-    result = subprocess.run(["./bin/test", f"{case}"], capture_output=True, text=True)
-    if result.returncode == 0:
-        test_status = "success"
-        test_message = f"Test {case} passed!"
-    else:
-        test_status = "failure"
-        test_message = f"Test {case} failed! {result.stderr}"
+        state, game = await change_schedule_state(case, lambda state: state.remove_game(team1, team2, season, week, day))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    return schedule_state_response(state, f"Game removed from {case}", removed=[game])
 
-    if exit_code != 0:
-        return JSONResponse({"status": 500, "msg": f"Error generating schedule for {case}", "data": [], "test_status": "failure", "test_msg": "Error running Scheduler"})
-    
-    return JSONResponse({"status": 200, "msg": f"Schedule successfully retrieved for {case}", "data": json_data, "test_status": test_status, "test_msg": test_message})
+@app.post("/state/block-field", response_class=JSONResponse)
+async def state_block_field(case: str = Query(...), venueId: int = Query(...), field: int = Query(...),
+                            season: int = Query(...), week: int = Query(...), day: int = Query(...),
+                            start: float = Query(...), end: float = Query(...)):
+    try:
+        state, (displaced, replaced) = await change_schedule_state(
+            case, lambda state: state.block_window((venueId, field), season, week, day, start, end))
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+    return schedule_state_response(state, f"Field {venueId}/{field} blocked in {case}", displaced=displaced, replaced=replaced)
+
+@app.post("/state/block-team", response_class=JSONResponse)
+async def state_block_team(case: str = Query(...), team: str = Query(...),
+                           season: int = Query(...), week: int = Query(...), day: int = Query(...),
+                           start: float = Query(...), end: float = Query(...)):
+    try:
+        state, (displaced, replaced) = await change_schedule_state(
+            case, lambda state: state.block_window(team, season, week, day, start, end))
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+    return schedule_state_response(state, f"Team {team} blocked in {case}", displaced=displaced, replaced=replaced)
+
+@app.post("/state/add-team", response_class=JSONResponse)
+async def state_add_team(case: str = Query(...), team: dict = Body(...)):
+    try:
+        state, placed = await change_schedule_state(case, lambda state: state.add_team(team))
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+    return schedule_state_response(state, f"Team {team['name']} added to {case}", placed=placed)
+
+@app.post("/state/remove-team", response_class=JSONResponse)
+async def state_remove_team(case: str = Query(...), team: str = Query(...)):
+    try:
+        state, removed = await change_schedule_state(case, lambda state: state.remove_team(team))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    return schedule_state_response(state, f"Team {team} removed from {case}", removed=removed)
+
+
+@app.post("/jobs", response_class=JSONResponse)
+async def create_job(case: str = Query(...), engine: str = Query("tree"), strategy: str = Query("greedy"),
+                     pairing: str = Query("round_robin"), time_budget: float = Query(5.0), warm_start: bool = Query(False)):
+    if not is_known_case(case):
+        raise HTTPException(status_code=404, detail=f"Unknown case {case}")
+    for name, value, choices in (("engine", engine, Scheduler.ENGINES), ("strategy", strategy, Scheduler.STRATEGIES),
+                                 ("pairing", pairing, Scheduler.PAIRINGS)):
+        if value not in choices:
+            raise HTTPException(status_code=400, detail=f"Unknown {name} '{value}', expected one of {list(choices)}")
+    job = job_manager.submit(case, engine=engine, strategy=strategy, pairing=pairing,
+                             time_budget=time_budget, warm_start=warm_start)
+    return JSONResponse({"status": 200, "msg": f"Job {job.id} queued for {case}", "data": job.to_dict()})
+
+@app.get("/jobs/{job_id}", response_class=JSONResponse)
+async def read_job(job_id: str):
+    job = job_manager.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return JSONResponse({"status": 200, "msg": f"Job {job.id} is {job.status}", "data": job.to_dict()})
+
+@app.websocket("/jobs/{job_id}/progress")
+async def job_progress(websocket: WebSocket, job_id: str):
+    # Streams every progress event of the job, then its final state, then closes
+    await websocket.accept()
+    job = job_manager.jobs.get(job_id)
+    if job is None:
+        await websocket.send_json({"event": "error", "msg": f"Unknown job {job_id}"})
+        await websocket.close()
+        return
+    try:
+        async for event in job_manager.events(job):
+            await websocket.send_json(event)
+        await websocket.send_json({"event": "job_" + job.status, "job": job.to_dict()})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
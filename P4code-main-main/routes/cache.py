@@ -0,0 +1,88 @@
+import hashlib
+from collections import OrderedDict
+
+# Input files that fully determine a case's schedule
+INPUT_FILES = ("team.csv", "venue.csv", "league.csv")
+
+
+def case_input_hash(case, *salt, data_dir="./data"):
+    """
+    Hash the input CSVs of a case together with extra salt (e.g. the scheduler version).
+
+    Parameters:
+    - case (str): The case identifier.
+    - salt: Extra strings that change the result when they change (scheduler version, language, ...).
+    - data_dir (str): Directory holding the case directories.
+
+    Returns:
+    - A hex SHA-256 digest.
+
+    Raises:
+    - FileNotFoundError: If an input file of the case is missing.
+    """
+    digest = hashlib.sha256()
+    for part in salt:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    for name in INPUT_FILES:
+        with open(f"{data_dir}/{case}/{name}", "rb") as input_file:
+            content = input_file.read()
+        digest.update(name.encode())
+        digest.update(len(content).to_bytes(8, "little"))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+class ScheduleCache:
+    """
+    LRU cache of /schedule results, keyed by the content hash of a case's inputs.
+
+    A result only depends on the input CSVs and the scheduler, so as long as neither changed
+    the stored schedule and test verdict can be served without running anything.
+    """
+    def __init__(self, max_entries=32):
+        """
+        Initialize an empty cache.
+
+        Parameters:
+        - max_entries (int): Number of results kept; the least recently used one is evicted first.
+        """
+        if max_entries < 1:
+            raise ValueError("The cache must hold at least one entry")
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Return the result stored under a key, or None, and mark it as recently used.
+        """
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """
+        Store a result, evicting the least recently used ones beyond max_entries.
+        """
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def discard(self, key):
+        """Drop the result stored under a key, if any."""
+        self.entries.pop(key, None)
+
+    def clear(self):
+        """Drop every stored result."""
+        self.entries.clear()
+
+    def __len__(self):
+        """Return the number of stored results."""
+        return len(self.entries)
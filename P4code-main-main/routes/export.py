@@ -0,0 +1,78 @@
+import csv
+import json
+import math
+import re
+import zlib
+
+# Bytes read from disk (or rows batched) per chunk of the response
+CHUNK_SIZE = 64 * 1024
+NDJSON_BATCH = 500
+
+# Plain decimal literals; int() and float() would also take "nan", "inf", "1_000" or padded text
+INT_LITERAL = re.compile(r"-?[0-9]+")
+FLOAT_LITERAL = re.compile(r"-?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?")
+
+
+def parse_value(text):
+    """
+    Convert a CSV cell back to the int, float or string it was written from.
+
+    Only plain decimal literals become numbers. A literal too large for a float becomes None
+    (JSON has no infinity).
+    """
+    if INT_LITERAL.fullmatch(text):
+        return int(text)
+    if FLOAT_LITERAL.fullmatch(text):
+        value = float(text)
+        return value if math.isfinite(value) else None
+    return text
+
+
+def iter_csv(path, chunk_size=CHUNK_SIZE):
+    """
+    Stream a schedule CSV as it is on disk, one chunk at a time.
+
+    Returns:
+    - An iterator of bytes chunks.
+    """
+    with open(path, "rb") as schedule_file:
+        while True:
+            chunk = schedule_file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_ndjson(path, batch=NDJSON_BATCH):
+    """
+    Stream a schedule CSV as newline-delimited JSON, one game object per line.
+
+    Rows are read one at a time and emitted in batches, so memory does not grow with the schedule.
+
+    Returns:
+    - An iterator of bytes chunks.
+    """
+    with open(path, newline="") as schedule_file:
+        lines = []
+        for row in csv.DictReader(schedule_file):
+            lines.append(json.dumps({column: parse_value(value) for column, value in row.items()}, allow_nan=False))
+            if len(lines) == batch:
+                yield ("\n".join(lines) + "\n").encode()
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+
+
+def gzip_stream(chunks, level=6):
+    """
+    Gzip a stream of bytes chunks on the fly.
+
+    Returns:
+    - An iterator of gzip-compressed bytes chunks, forming a single gzip member.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,215 @@
+import asyncio
+import multiprocessing
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from core.py.scheduler import Scheduler
+from core.py.validation import validate_schedule
+
+
+class QueueProgress:
+    """
+    Scheduler.run progress callback that forwards the events of a job to a queue shared with the API process.
+    """
+    def __init__(self, queue, job_id):
+        self.queue = queue
+        self.job_id = job_id
+
+    def __call__(self, event):
+        self.queue.put((self.job_id, event, {}))
+
+
+def run_job(job_id, case, options, queue):
+    """
+    Run a scheduling job in a worker process, then validate the schedule it produced.
+
+    Returns:
+    - dict: The exit code of Scheduler.run and, when it succeeded, the validation result.
+    """
+    exit_code = Scheduler.run(case, progress=QueueProgress(queue, job_id), **options)
+    result = {"exit_code": exit_code}
+    if exit_code == 0:
+        result["validation"] = validate_schedule(case).to_dict()
+    return result
+
+
+class CaseLocks:
+    """
+    One asyncio lock per case, held by everything that writes the ./data/{case}/schedule.* files.
+
+    Runs of the same case are serialized, so a run never reads or validates files another run
+    is writing; different cases still run in parallel.
+    """
+    def __init__(self):
+        self.locks = {}
+
+    def get(self, case):
+        """Return the lock of a case."""
+        return self.locks.setdefault(case, asyncio.Lock())
+
+
+class Job:
+    """
+    One scheduling request: its options, status and the progress events received so far.
+
+    Status goes from "queued" to "running" and ends as "done" or "failed".
+    """
+    def __init__(self, job_id, case, options):
+        self.id = job_id
+        self.case = case
+        self.options = options
+        self.status = "queued"
+        self.events = []
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished_at = None
+        # Notified on every change, so WebSocket listeners can wait for new events
+        self.changed = asyncio.Condition()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "case": self.case,
+            "options": self.options,
+            "status": self.status,
+            "progress": self.events[-1] if self.events else None,
+            "result": self.result,
+            "error": self.error,
+            "created": self.created,
+            "finished": self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    Runs scheduling jobs in the background on a process pool and relays their progress.
+
+    A job holds its case's lock (see CaseLocks) while it runs, so it validates its own schedule and
+    not the output of another job or /schedule call on the same case; until then it stays queued.
+
+    Worker processes put progress events on a multiprocessing manager queue; a pump task in the
+    event loop moves them onto their Job and wakes up whoever waits on it. Job completion goes
+    through the same queue, after the job's last event, so listeners never miss an event.
+    """
+    def __init__(self, get_executor, max_jobs=100, on_finished=None, case_locks=None, reset_executor=None):
+        """
+        Parameters:
+        - get_executor (callable): Returns the executor jobs run on.
+        - max_jobs (int): Number of jobs remembered; the oldest finished jobs are forgotten first.
+        - on_finished (callable): Optional hook called with every job once it is done or failed.
+        - case_locks (CaseLocks): Locks shared with the other writers of schedule files (default: private ones).
+        - reset_executor (callable): Optional; called with an executor that broke (a worker process
+          died), after which the job is retried once on a fresh one from get_executor.
+        """
+        self.get_executor = get_executor
+        self.max_jobs = max_jobs
+        self.on_finished = on_finished
+        self.case_locks = case_locks if case_locks is not None else CaseLocks()
+        self.reset_executor = reset_executor
+        self.jobs = OrderedDict()
+        self.manager = None
+        self.queue = None
+        self.pump = None
+
+    def _start(self):
+        """Start the event queue and its pump on first use."""
+        if self.queue is None:
+            self.manager = multiprocessing.Manager()
+            self.queue = self.manager.Queue()
+            self.pump = asyncio.create_task(self._pump_events())
+
+    async def _pump_events(self):
+        loop = asyncio.get_running_loop()
+        queue = self.queue
+        while True:
+            try:
+                item = await loop.run_in_executor(None, queue.get)
+            except (EOFError, OSError):
+                # The manager process has shut down
+                break
+            if item is None:
+                break
+            job_id, event, changes = item
+            job = self.jobs.get(job_id)
+            if job is not None:
+                await self._update(job, event, **changes)
+
+    async def _update(self, job, event=None, **changes):
+        async with job.changed:
+            if event:
+                job.events.append(event)
+                # The first event comes from the worker, once the job has left the executor queue
+                if job.status == "queued":
+                    job.status = "running"
+            for name, value in changes.items():
+                setattr(job, name, value)
+            if job.finished and job.finished_at is None:
+                job.finished_at = time.time()
+                if self.on_finished is not None:
+                    self.on_finished(job)
+            job.changed.notify_all()
+
+    def submit(self, case, **options):
+        """
+        Queue a scheduling job.
+
+        Parameters:
+        - case (str): The case to schedule.
+        - options: Keyword arguments for Scheduler.run (engine, strategy, ...).
+
+        Returns:
+        - The new Job.
+        """
+        self._start()
+        job = Job(uuid.uuid4().hex, case, options)
+        self.jobs[job.id] = job
+        finished = [job_id for job_id, other in self.jobs.items() if other.finished]
+        for job_id in finished[:max(len(self.jobs) - self.max_jobs, 0)]:
+            del self.jobs[job_id]
+        asyncio.create_task(self._run(job))
+        return job
+
+    async def _run(self, job):
+        loop = asyncio.get_running_loop()
+        try:
+            async with self.case_locks.get(job.case):
+                executor = self.get_executor()
+                try:
+                    result = await loop.run_in_executor(executor, run_job, job.id, job.case, job.options, self.queue)
+                except BrokenProcessPool:
+                    if self.reset_executor is None:
+                        raise
+                    self.reset_executor(executor)
+                    result = await loop.run_in_executor(self.get_executor(), run_job, job.id, job.case, job.options, self.queue)
+            changes = {"status": "done", "result": result}
+        except Exception as e:
+            changes = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+        await loop.run_in_executor(None, self.queue.put, (job.id, None, changes))
+
+    async def events(self, job):
+        """
+        Iterate over the events of a job, waiting for new ones until the job has finished.
+        """
+        sent = 0
+        while True:
+            async with job.changed:
+                await job.changed.wait_for(lambda: len(job.events) > sent or job.finished)
+                events, finished = job.events[sent:], job.finished
+            for event in events:
+                yield event
+            sent += len(events)
+            if finished and sent == len(job.events):
+                return
+
+    def shutdown(self):
+        """Stop the pump and the manager process."""
+        if self.queue is not None:
+            self.queue.put(None)
+            self.manager.shutdown()
+            self.queue = None
@@ -0,0 +1,132 @@
+import os
+import numpy as np
+import pandas as pd
+from core.py.columnar import read_schedule
+
+# Separator between the venue name and the field number in a game's location
+FIELD_SEPARATOR = " Field #"
+
+
+def venue_name(location):
+    """Return the venue part of a location ("Park Field #2" -> "Park")."""
+    return location.rsplit(FIELD_SEPARATOR, 1)[0]
+
+
+class ScheduleStore:
+    """
+    A schedule held in memory with inverted indexes for filtered, paginated queries.
+
+    Games are kept in chronological order (season, week, day, start); a game's position in that
+    order is its id. Every filterable attribute (team, league, venue, season, week, day) maps each
+    value to the sorted array of ids having it, so a query intersects a few small arrays instead of
+    scanning the schedule. Pagination uses the last id returned as cursor, which stays valid
+    whatever the page size.
+    """
+    def __init__(self, games):
+        """
+        Build the store.
+
+        Parameters:
+        - games (list): Games as dicts (team1Name, team2Name, week, day, start, end, season, league, location).
+        """
+        order = sorted(range(len(games)), key=lambda i: (games[i]["season"], games[i]["week"], games[i]["day"], games[i]["start"]))
+        self.games = [games[i] for i in order]
+
+        indexes = {"team": {}, "league": {}, "venue": {}, "season": {}, "week": {}, "day": {}}
+        for game_id, game in enumerate(self.games):
+            for attribute, value in (("team", game["team1Name"]), ("team", game["team2Name"]),
+                                     ("league", game["league"]), ("venue", venue_name(game["location"])),
+                                     ("season", game["season"]), ("week", game["week"]), ("day", game["day"])):
+                ids = indexes[attribute].setdefault(value, [])
+                # A team listed as both team1 and team2 of a game only counts once
+                if not ids or ids[-1] != game_id:
+                    ids.append(game_id)
+        self.indexes = {attribute: {value: np.array(ids, dtype=np.int64) for value, ids in index.items()}
+                        for attribute, index in indexes.items()}
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Load a store from a schedule CSV or its columnar copy (an empty file gives an empty store).
+        """
+        try:
+            schedule_df = read_schedule(path)
+        except pd.errors.EmptyDataError:
+            return cls([])
+        return cls(schedule_df.to_dict(orient="records"))
+
+    def __len__(self):
+        """Return the number of games."""
+        return len(self.games)
+
+    def _ids(self, attribute, value):
+        return self.indexes[attribute].get(value, np.empty(0, dtype=np.int64))
+
+    def query(self, team=None, league=None, venue=None, season=None, week_from=None, week_to=None, day=None,
+              cursor=None, limit=50):
+        """
+        Find the games matching every given filter, one page at a time.
+
+        Parameters:
+        - team, league, venue (str): Exact team, league or venue name (venue without the field number).
+        - season, day (int): Exact season year or day of the week.
+        - week_from, week_to (int): Inclusive week range; either bound may be omitted.
+        - cursor (int): The next_cursor of the previous page (None for the first page).
+        - limit (int): Maximum number of games returned.
+
+        Returns:
+        - tuple: (games, next_cursor, total): the page, the cursor of the next page (None on the
+            last page) and the number of games matching the filters.
+
+        Raises:
+        - ValueError: If limit is not positive.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+
+        selections = [self._ids(attribute, value) for attribute, value in
+                      (("team", team), ("league", league), ("venue", venue), ("season", season), ("day", day))
+                      if value is not None]
+        if week_from is not None or week_to is not None:
+            weeks = [ids for week, ids in self.indexes["week"].items()
+                     if (week_from is None or week >= week_from) and (week_to is None or week <= week_to)]
+            selections.append(np.sort(np.concatenate(weeks)) if weeks else np.empty(0, dtype=np.int64))
+
+        if selections:
+            # Intersect from the smallest selection up
+            selections.sort(key=len)
+            ids = selections[0]
+            for other in selections[1:]:
+                ids = np.intersect1d(ids, other, assume_unique=True)
+        else:
+            ids = np.arange(len(self.games))
+
+        first = 0 if cursor is None else int(np.searchsorted(ids, cursor, side="right"))
+        page = ids[first:first + limit]
+        next_cursor = int(page[-1]) if len(page) and first + limit < len(ids) else None
+        return [self.games[game_id] for game_id in page.tolist()], next_cursor, len(ids)
+
+
+class ScheduleStoreCache:
+    """
+    The ScheduleStore of every case, rebuilt when the case's schedule.csv changes on disk.
+    """
+    def __init__(self, data_dir="./data"):
+        self.data_dir = data_dir
+        self.stores = {}
+
+    def get(self, case):
+        """
+        Return the store of a case.
+
+        Raises:
+        - FileNotFoundError: If the case has no schedule.csv.
+        """
+        path = f"{self.data_dir}/{case}/schedule.csv"
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self.stores.get(case)
+        if cached is None or cached[0] != version:
+            cached = (version, ScheduleStore.from_csv(path))
+            self.stores[case] = cached
+        return cached[1]